@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.digest import FINANCE_KEYWORDS, KeywordMatcher, Paper, _quality_score  # noqa: E402
+
+
+def _naive_score(paper: Paper, topic_whitelist: set[str]) -> int:
+    text = " ".join([paper.title, paper.abstract, paper.venue, " ".join(paper.topics)]).lower()
+    title_text = paper.title.lower()
+    topic_text = " ".join(paper.topics).lower()
+    score = 0
+    for keyword in topic_whitelist:
+        if keyword in title_text:
+            score += 3
+        elif keyword in topic_text:
+            score += 2
+        elif keyword in text:
+            score += 1
+    return score
+
+
+def _keywords(count: int, rng: random.Random) -> set[str]:
+    words = set(FINANCE_KEYWORDS)
+    while len(words) < count:
+        length = rng.randint(4, 14)
+        term = "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        if rng.random() < 0.3:
+            term = f"{term} {rng.choice(sorted(FINANCE_KEYWORDS))}"
+        words.add(term)
+    return set(sorted(words)[:count]) | set(FINANCE_KEYWORDS)
+
+
+def _papers(count: int, rng: random.Random) -> list[Paper]:
+    vocab = sorted(FINANCE_KEYWORDS) + ["model", "evidence", "policy", "shock", "data", "effect", "the", "of"]
+    papers = []
+    for idx in range(count):
+        abstract = " ".join(rng.choice(vocab) for _ in range(rng.randint(80, 250)))
+        papers.append(
+            Paper(
+                title=" ".join(rng.choice(vocab) for _ in range(10)).title(),
+                authors=[],
+                venue="Journal of Synthetic Finance",
+                published_date="2026-03-05",
+                doi_url="",
+                openalex_url=f"https://openalex.org/W{idx}",
+                cited_by_count=0,
+                abstract=abstract,
+                summary_zh="",
+                topics=[rng.choice(vocab).title() for _ in range(5)],
+            )
+        )
+    return papers
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare naive keyword scans with KeywordMatcher")
+    parser.add_argument("--papers", type=int, default=200)
+    parser.add_argument("--sizes", default="26,250,1000,5000")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    papers = _papers(args.papers, rng)
+    print(f"{'keywords':>9} {'naive ms':>10} {'compile ms':>11} {'matcher ms':>11} {'speedup':>8}")
+    for size in (int(x) for x in args.sizes.split(",")):
+        keywords = _keywords(size, rng)
+
+        started = time.perf_counter()
+        expected = [_naive_score(p, keywords) for p in papers]
+        naive = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        compiled = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = [_quality_score(p, matcher) for p in papers]
+        fast = time.perf_counter() - started
+
+        if actual != expected:
+            raise SystemExit(f"score mismatch with {size} keywords")
+        print(f"{len(keywords):>9} {naive * 1000:>10.1f} {compiled * 1000:>11.1f} {fast * 1000:>11.1f} {naive / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
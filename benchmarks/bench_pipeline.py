@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import datetime as dt
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks import synthetic  # noqa: E402
+from src.digest import (  # noqa: E402
+    FINANCE_KEYWORDS,
+    OPENALEX_SELECT_FIELDS,
+    DigestConfig,
+    KeywordMatcher,
+    RelevanceRanker,
+    _dedupe_and_filter,
+    _extract_abstract,
+    _openalex_item_to_paper,
+    _parse_arxiv_page,
+    _parse_openalex_page,
+    _quality_score,
+    _render_html,
+    _render_markdown,
+    _simple_zh_summary,
+)
+
+TARGET = dt.date(2026, 3, 5)
+
+# Each stage builds its (untimed) input for a corpus size and returns a callable that processes it.
+Stage = Callable[[int], Callable[[], Any]]
+
+
+def _parsed_papers(size: int) -> list:
+    return [_openalex_item_to_paper(item) for item in synthetic.openalex_works(size)]
+
+
+def _stage_openalex_parse(size: int) -> Callable[[], Any]:
+    body = synthetic.openalex_page(synthetic.openalex_works(size), next_cursor=None, select=OPENALEX_SELECT_FIELDS)
+    return lambda: _parse_openalex_page(body)[0]
+
+
+def _stage_openalex_parse_full(size: int) -> Callable[[], Any]:
+    """Whole unprojected response through ``json.loads``: the pre-``select`` baseline."""
+    body = synthetic.openalex_page(synthetic.openalex_works(size), next_cursor=None)
+    return lambda: [_openalex_item_to_paper(item) for item in json.loads(body.decode("utf-8"))["results"]]
+
+
+def _stage_extract_abstract(size: int) -> Callable[[], Any]:
+    indexes = [item["abstract_inverted_index"] for item in synthetic.openalex_works(size)]
+    return lambda: [_extract_abstract(index) for index in indexes]
+
+
+def _stage_arxiv_parse(size: int) -> Callable[[], Any]:
+    body = synthetic.arxiv_feed(synthetic.arxiv_entries(size, TARGET))
+    return lambda: _parse_arxiv_page(body, TARGET.isoformat())[0]
+
+
+def _stage_quality_score(size: int) -> Callable[[], Any]:
+    papers = _parsed_papers(size)
+    matcher = KeywordMatcher(DigestConfig().topic_whitelist)
+    return lambda: [_quality_score(p, matcher) for p in papers]
+
+
+def _stage_dedupe_filter(size: int) -> Callable[[], Any]:
+    papers = _parsed_papers(size)
+    cfg = DigestConfig()
+    return lambda: _dedupe_and_filter(papers, cfg.topic_whitelist, cfg.topic_blacklist, cfg.min_quality_score)
+
+
+def _ranker() -> RelevanceRanker:
+    cfg = DigestConfig()
+    return RelevanceRanker(cfg.topic_whitelist | FINANCE_KEYWORDS, cfg.topic_whitelist)
+
+
+def _stage_rank_featurize(size: int) -> Callable[[], Any]:
+    """Per-candidate ranking work; ``build_digest`` does it as the filter accepts papers."""
+    papers = _parsed_papers(size)
+    ranker = _ranker()
+    return lambda: ranker.pool(papers)
+
+
+def _stage_rank(size: int) -> Callable[[], Any]:
+    """What ranking adds once the pool is complete: IDF weighting, scoring and top-k selection."""
+    pool = _ranker().pool(_parsed_papers(size))
+    return lambda: pool.top_k(DigestConfig().max_papers)
+
+
+def _stage_simple_summary(size: int) -> Callable[[], Any]:
+    papers = _parsed_papers(size)
+    return lambda: [_simple_zh_summary(p.title, p.abstract, p.topics) for p in papers]
+
+
+def _summarized_papers(size: int) -> list:
+    papers = _parsed_papers(size)
+    return [dataclasses.replace(p, summary_zh=_simple_zh_summary(p.title, p.abstract, p.topics)) for p in papers]
+
+
+def _stage_render_markdown(size: int) -> Callable[[], Any]:
+    papers = _summarized_papers(size)
+    return lambda: _render_markdown(TARGET.isoformat(), papers)
+
+
+def _stage_render_html(size: int) -> Callable[[], Any]:
+    papers = _summarized_papers(size)
+    return lambda: _render_html(TARGET.isoformat(), papers)
+
+
+STAGES: dict[str, Stage] = {
+    "openalex.parse": _stage_openalex_parse,
+    "openalex.parse_full": _stage_openalex_parse_full,
+    "extract_abstract": _stage_extract_abstract,
+    "arxiv.parse": _stage_arxiv_parse,
+    "quality_score": _stage_quality_score,
+    "dedupe_filter": _stage_dedupe_filter,
+    "rank_featurize": _stage_rank_featurize,
+    "rank": _stage_rank,
+    "simple_summary": _stage_simple_summary,
+    "render_markdown": _stage_render_markdown,
+    "render_html": _stage_render_html,
+}
+
+
+def _measure(run: Callable[[], Any], size: int, repeat: int) -> dict[str, Any]:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+
+    # Memory is measured in a separate pass: tracemalloc slows allocation-heavy code considerably.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {
+        "size": size,
+        "seconds": round(best, 6),
+        "items_per_second": round(size / best, 1) if best > 0 else 0.0,
+        "peak_kib": round((peak - before) / 1024, 1),
+    }
+
+
+def run_benchmarks(sizes: list[int], stages: list[str], repeat: int) -> dict[str, Any]:
+    results: dict[str, list[dict[str, Any]]] = {}
+    for name in stages:
+        for size in sizes:
+            row = _measure(STAGES[name](size), size, repeat)
+            results.setdefault(name, []).append(row)
+            print(
+                f"{name:>18} {size:>8} {row['seconds'] * 1000:>10.1f} ms {row['items_per_second']:>12.0f}/s"
+                f" {row['peak_kib']:>10.0f} KiB",
+                flush=True,
+            )
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Return human-readable regressions where throughput or peak memory moved beyond ``threshold``."""
+    regressions = []
+    for name, rows in current["results"].items():
+        previous = {row["size"]: row for row in baseline.get("results", {}).get(name, [])}
+        for row in rows:
+            base = previous.get(row["size"])
+            if base is None:
+                continue
+            if base["items_per_second"] and row["items_per_second"] < base["items_per_second"] * (1 - threshold):
+                regressions.append(
+                    f"{name}@{row['size']}: throughput {row['items_per_second']:.0f}/s "
+                    f"vs baseline {base['items_per_second']:.0f}/s"
+                )
+            # Ignore tiny absolute changes: allocator noise dominates small corpora.
+            if row["peak_kib"] > base["peak_kib"] * (1 + threshold) and row["peak_kib"] - base["peak_kib"] > 256:
+                regressions.append(
+                    f"{name}@{row['size']}: peak memory {row['peak_kib']:.0f} KiB vs baseline {base['peak_kib']:.0f} KiB"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark digest pipeline stages on synthetic corpora")
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated corpus sizes, e.g. 1000,10000,100000")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stage names")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the fastest is kept")
+    parser.add_argument("--output", type=Path, help="write results as JSON (e.g. a new baseline)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression (default 0.2)")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = sorted(set(stages) - set(STAGES))
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+
+    print(f"{'stage':>18} {'size':>8} {'time':>13} {'throughput':>14} {'peak':>14}")
+    report = run_benchmarks(sizes, stages, max(1, args.repeat))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"wrote {args.output}")
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+        print(f"no regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""Local stand-in for OpenAlex ``/works``, the arXiv query API and ``/chat/completions``.
+
+Point the pipeline at it with::
+
+    OPENALEX_URL=http://127.0.0.1:8765/works
+    ARXIV_API_URL=http://127.0.0.1:8765/api/query
+    LLM_API_BASE=http://127.0.0.1:8765/v1
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import dataclasses
+import datetime as dt
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks import synthetic  # noqa: E402
+
+
+def parse_latency(spec: str) -> tuple[str, float, float]:
+    """Parse ``50`` (fixed ms), ``uniform:20:200``, ``exp:100`` (mean ms) or ``lognormal:50:0.6`` (median ms, sigma)."""
+    parts = spec.split(":") if spec else ["0"]
+    if len(parts) == 1:
+        return "fixed", float(parts[0]), 0.0
+    kind = parts[0]
+    if kind == "uniform" and len(parts) == 3:
+        return kind, float(parts[1]), float(parts[2])
+    if kind == "exp" and len(parts) == 2:
+        return kind, float(parts[1]), 0.0
+    if kind == "lognormal" and len(parts) == 3:
+        return kind, float(parts[1]), float(parts[2])
+    raise ValueError(f"unsupported latency spec: {spec!r}")
+
+
+@dataclasses.dataclass
+class StubConfig:
+    latency: str = "0"
+    llm_latency: str = ""
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    disconnect_rate: float = 0.0
+    retry_after: float = 1.0
+    works_per_day: int = 200
+    arxiv_per_day: int = 60
+    arxiv_total: int = 5000
+    arxiv_latest: dt.date = dataclasses.field(default_factory=lambda: dt.datetime.now(dt.timezone.utc).date())
+    abstract_words: tuple[int, int] = (120, 260)
+    summary_chars: int = 160
+    batch_drop_rate: float = 0.0
+    gzip: bool = True
+    seed: int = 7
+
+
+class StubState:
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self.latency = parse_latency(config.latency)
+        self.llm_latency = parse_latency(config.llm_latency) if config.llm_latency else self.latency
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+
+    def roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def delay(self, llm: bool = False) -> float:
+        kind, a, b = self.llm_latency if llm else self.latency
+        with self._lock:
+            if kind == "uniform":
+                ms = self._rng.uniform(a, b)
+            elif kind == "exp":
+                ms = self._rng.expovariate(1 / a) if a > 0 else 0.0
+            elif kind == "lognormal":
+                ms = self._rng.lognormvariate(0, b) * a
+            else:
+                ms = a
+        return ms / 1000
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+
+_EPOCH = dt.date(2000, 1, 1)
+
+
+def _encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int:
+    if cursor in ("", "*"):
+        return 0
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    return int(raw.split(":", 1)[1])
+
+
+def _date_filters(filter_value: str) -> tuple[dt.date, dt.date]:
+    filters = dict(part.split(":", 1) for part in filter_value.split(",") if ":" in part)
+    today = dt.datetime.now(dt.timezone.utc).date()
+    date_from = dt.date.fromisoformat(filters.get("from_publication_date", today.isoformat()))
+    date_to = dt.date.fromisoformat(filters.get("to_publication_date", date_from.isoformat()))
+    return date_from, date_to
+
+
+def openalex_response(state: StubState, query: dict[str, list[str]]) -> bytes:
+    cfg = state.config
+    date_from, date_to = _date_filters(query.get("filter", [""])[0])
+    per_page = max(1, min(int(query.get("per-page", ["25"])[0]), 200))
+    offset = _decode_cursor(query.get("cursor", ["*"])[0])
+    days = max((date_to - date_from).days + 1, 0)
+    total = days * cfg.works_per_day
+
+    works = []
+    for position in range(offset, min(offset + per_page, total)):
+        day = date_from + dt.timedelta(days=position // cfg.works_per_day)
+        # Work ids stay stable per (day, position) and never collide across days.
+        idx = (day - _EPOCH).days * cfg.works_per_day + position % cfg.works_per_day
+        rng = random.Random(f"{cfg.seed}:{idx}")
+        works.append(synthetic.openalex_work(idx, rng, day.isoformat(), cfg.abstract_words))
+    select = [field for field in query.get("select", [""])[0].split(",") if field]
+    if select:
+        works = [synthetic.project(work, select) for work in works]
+    next_offset = offset + len(works)
+    next_cursor = _encode_cursor(next_offset) if works and next_offset < total else None
+    payload = {"meta": {"count": total, "per_page": per_page, "next_cursor": next_cursor}, "results": works}
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def arxiv_response(state: StubState, query: dict[str, list[str]]) -> bytes:
+    cfg = state.config
+    start = int(query.get("start", ["0"])[0])
+    size = int(query.get("max_results", ["10"])[0])
+    entries = []
+    for idx in range(start, min(start + size, cfg.arxiv_total)):
+        day = cfg.arxiv_latest - dt.timedelta(days=idx // max(cfg.arxiv_per_day, 1))
+        rng = random.Random(f"{cfg.seed}:arxiv:{idx}")
+        entries.append(synthetic.arxiv_entry(idx, rng, day.isoformat(), cfg.abstract_words))
+    return synthetic.arxiv_feed(entries, total=cfg.arxiv_total, start=start)
+
+
+def _stub_summary(state: StubState, title: str) -> str:
+    summary = f"（模拟摘要）{title}：本文围绕金融经济学问题展开实证研究。"
+    return summary + "研究结论具有一定政策含义。" * max(0, (state.config.summary_chars - len(summary)) // 13)
+
+
+def chat_completion_response(state: StubState, body: bytes) -> bytes:
+    request = json.loads(body.decode("utf-8") or "{}")
+    messages = request.get("messages") or [{}]
+    try:
+        user = json.loads(messages[-1].get("content", ""))
+    except (ValueError, AttributeError):
+        user = {}
+    if isinstance(user, list):
+        # Batched request: answer with a JSON object keyed by index, dropping some items on purpose.
+        replies = {
+            str(item.get("index")): _stub_summary(state, item.get("title", ""))
+            for item in user
+            if isinstance(item, dict) and state.roll() >= state.config.batch_drop_rate
+        }
+        summary = json.dumps(replies, ensure_ascii=False)
+    else:
+        summary = _stub_summary(state, user.get("title", "") if isinstance(user, dict) else "")
+    prompt_tokens = len(body) // 4
+    completion_tokens = len(summary)
+    payload = {
+        "id": f"chatcmpl-stub-{int(state.roll() * 1e12):x}",
+        "object": "chat.completion",
+        "model": request.get("model", "stub"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": summary}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StubServer"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._dispatch(b"")
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        self._dispatch(self.rfile.read(length) if length else b"")
+
+    def _dispatch(self, body: bytes) -> None:
+        state = self.server.state
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        if parts.path == "/__stats":
+            self._send(200, json.dumps(dict(state.stats)).encode("utf-8"), "application/json")
+            return
+        if parts.path.endswith("/works"):
+            endpoint, content_type = "openalex", "application/json"
+        elif parts.path.endswith("/api/query"):
+            endpoint, content_type = "arxiv", "application/atom+xml; charset=utf-8"
+        elif parts.path.endswith("/chat/completions") and self.command == "POST":
+            endpoint, content_type = "llm", "application/json"
+        else:
+            state.count("unknown.404")
+            self._send(404, b'{"error": "not found"}', "application/json")
+            return
+
+        time.sleep(state.delay(llm=endpoint == "llm"))
+        cfg = state.config
+        roll = state.roll()
+        if roll < cfg.disconnect_rate:
+            state.count(f"{endpoint}.disconnect")
+            self.close_connection = True
+            return
+        roll -= cfg.disconnect_rate
+        if roll < cfg.throttle_rate:
+            state.count(f"{endpoint}.429")
+            self._send(429, b'{"error": "rate limited"}', "application/json", {"Retry-After": f"{cfg.retry_after:g}"})
+            return
+        roll -= cfg.throttle_rate
+        if roll < cfg.error_rate:
+            state.count(f"{endpoint}.503")
+            self._send(503, b'{"error": "unavailable"}', "application/json")
+            return
+
+        if endpoint == "openalex":
+            payload = openalex_response(state, query)
+        elif endpoint == "arxiv":
+            payload = arxiv_response(state, query)
+        else:
+            try:
+                payload = chat_completion_response(state, body)
+            except ValueError:
+                state.count("llm.400")
+                self._send(400, b'{"error": "invalid JSON"}', "application/json")
+                return
+        state.count(f"{endpoint}.200")
+        self._send(200, payload, content_type)
+
+    def _send(self, status: int, payload: bytes, content_type: str, headers: dict[str, str] | None = None) -> None:
+        if self.server.state.config.gzip and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            payload = gzip.compress(payload, compresslevel=5)
+            headers = {**(headers or {}), "Content-Encoding": "gzip"}
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: StubConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        super().__init__((host, port), StubHandler)
+        self.state = StubState(config or StubConfig())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for OpenAlex, arXiv and chat-completions APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="0", help="ms; 50 | uniform:20:200 | exp:100 | lognormal:50:0.6")
+    parser.add_argument("--llm-latency", default="", help="latency for /chat/completions (defaults to --latency)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="fraction of connections dropped unanswered")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429")
+    parser.add_argument("--works-per-day", type=int, default=200)
+    parser.add_argument("--arxiv-per-day", type=int, default=60)
+    parser.add_argument("--arxiv-total", type=int, default=5000)
+    parser.add_argument("--arxiv-latest", type=dt.date.fromisoformat, help="newest arXiv submission date (default today)")
+    parser.add_argument("--abstract-words", default="120,260", help="min,max abstract length in words")
+    parser.add_argument("--summary-chars", type=int, default=160)
+    parser.add_argument("--batch-drop-rate", type=float, default=0.0, help="fraction of items omitted from batch replies")
+    parser.add_argument("--no-gzip", action="store_true")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    low, high = (int(x) for x in args.abstract_words.split(","))
+    config = StubConfig(
+        latency=args.latency,
+        llm_latency=args.llm_latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        disconnect_rate=args.disconnect_rate,
+        retry_after=args.retry_after,
+        works_per_day=args.works_per_day,
+        arxiv_per_day=args.arxiv_per_day,
+        arxiv_total=args.arxiv_total,
+        abstract_words=(low, high),
+        summary_chars=args.summary_chars,
+        batch_drop_rate=args.batch_drop_rate,
+        gzip=not args.no_gzip,
+        seed=args.seed,
+    )
+    if args.arxiv_latest:
+        config.arxiv_latest = args.arxiv_latest
+    parse_latency(config.latency)
+    server = StubServer(config, args.host, args.port)
+    print(f"stub services on {server.base_url} (stats at /__stats)", flush=True)
+    print(f"  OPENALEX_URL={server.base_url}/works", flush=True)
+    print(f"  ARXIV_API_URL={server.base_url}/api/query", flush=True)
+    print(f"  LLM_API_BASE={server.base_url}/v1", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
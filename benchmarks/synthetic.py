@@ -0,0 +1,146 @@
+"""Deterministic synthetic OpenAlex / arXiv corpora for benchmarks and local stand-in services."""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import random
+from html import escape
+from typing import Any
+
+FINANCE_VOCAB = [
+    "asset pricing", "bank", "banking", "credit", "risk", "volatility", "portfolio", "market", "stock",
+    "bond", "interest rate", "monetary policy", "liquidity", "fintech", "corporate finance", "insurance",
+    "derivative", "hedge", "capital", "return", "inflation", "exchange rate", "financial stability",
+]
+GENERAL_VOCAB = [
+    "we", "study", "the", "effect", "of", "on", "using", "a", "novel", "panel", "dataset", "and", "find",
+    "that", "evidence", "model", "estimate", "regression", "difference-in-differences", "shock", "firms",
+    "households", "countries", "results", "suggest", "significant", "heterogeneous", "robust", "to",
+    "alternative", "specifications", "identification", "instrument", "policy", "implications", "data",
+]
+NOISE_TITLES = ["Free dice casino bonus guide", "Lottery jackpot secrets", "Top 10 crypto casino sites"]
+CONCEPTS = ["Finance", "Economics", "Business", "Monetary economics", "Financial economics", "Econometrics"]
+VENUES = ["Journal of Finance", "Review of Financial Studies", "Journal of Banking & Finance", "SSRN Electronic Journal"]
+
+
+def abstract_text(rng: random.Random, words: int) -> str:
+    tokens = []
+    for _ in range(words):
+        tokens.append(rng.choice(FINANCE_VOCAB) if rng.random() < 0.2 else rng.choice(GENERAL_VOCAB))
+    sentences = []
+    for start in range(0, len(tokens), 18):
+        sentences.append(" ".join(tokens[start : start + 18]).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def inverted_index(text: str) -> dict[str, Any]:
+    inverted: dict[str, list[int]] = {}
+    words = text.split()
+    for pos, word in enumerate(words):
+        inverted.setdefault(word, []).append(pos)
+    return {"IndexLength": len(words), "InvertedIndex": inverted}
+
+
+def openalex_work(
+    idx: int, rng: random.Random, date: str = "2026-03-05", abstract_words: tuple[int, int] = (120, 260)
+) -> dict[str, Any]:
+    """One OpenAlex work; roughly 5% are noise and 5% near-duplicates of an earlier work."""
+    roll = rng.random()
+    if roll < 0.05:
+        title = f"{rng.choice(NOISE_TITLES)} {idx}"
+        concepts: list[dict[str, Any]] = [{"display_name": "Gambling", "score": 0.4}]
+        abstract = "Win big with our exclusive bonus codes and jackpot tips."
+    else:
+        seed_idx = rng.randrange(max(idx, 1)) if roll < 0.10 else idx
+        seeded = random.Random(seed_idx)
+        title = " ".join(seeded.choice(FINANCE_VOCAB + GENERAL_VOCAB[:12]) for _ in range(9)).title()
+        abstract = abstract_text(seeded, seeded.randint(*abstract_words))
+        if seed_idx != idx:
+            title = f"{title}: Revisited"
+        concepts = [
+            {"display_name": name, "score": round(rng.random(), 3)} for name in rng.sample(CONCEPTS, 4)
+        ]
+    return {
+        "id": f"https://openalex.org/W{4000000000 + idx}",
+        "doi": f"https://doi.org/10.5555/synthetic.{idx}" if rng.random() < 0.8 else None,
+        "title": title,
+        "display_name": title,
+        "publication_date": date,
+        "cited_by_count": rng.randint(0, 40),
+        "authorships": [
+            {
+                "author_position": "first" if pos == 0 else "middle",
+                "author": {"id": f"https://openalex.org/A{idx * 10 + pos}", "display_name": f"Author {idx}-{pos}"},
+                "institutions": [{"display_name": f"University {rng.randint(1, 300)}"}],
+            }
+            for pos in range(rng.randint(1, 8))
+        ],
+        "primary_location": {"source": {"display_name": rng.choice(VENUES), "type": "journal"}},
+        "concepts": concepts,
+        "abstract_inverted_index": inverted_index(abstract),
+        "locations": [
+            {"is_oa": rng.random() < 0.3, "landing_page_url": f"https://example.org/{idx}/{loc}", "source": None}
+            for loc in range(rng.randint(1, 4))
+        ],
+        "grants": [{"funder_display_name": f"Funder {rng.randint(1, 50)}", "award_id": str(rng.randint(1, 10**6))}],
+        "counts_by_year": [{"year": 2026 - year, "cited_by_count": rng.randint(0, 10)} for year in range(5)],
+        "referenced_works": [f"https://openalex.org/W{rng.randint(1, 10**9)}" for _ in range(rng.randint(10, 60))],
+        "related_works": [f"https://openalex.org/W{rng.randint(1, 10**9)}" for _ in range(10)],
+    }
+
+
+def openalex_works(count: int, seed: int = 7, date: str = "2026-03-05") -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [openalex_work(idx, rng, date) for idx in range(count)]
+
+
+def project(work: dict[str, Any], fields: list[str] | tuple[str, ...]) -> dict[str, Any]:
+    """Apply an OpenAlex ``select=`` projection (root-level fields only)."""
+    return {field: work[field] for field in fields if field in work}
+
+
+def openalex_page(
+    works: list[dict[str, Any]], next_cursor: str | None, select: list[str] | tuple[str, ...] = ()
+) -> bytes:
+    if select:
+        works = [project(work, select) for work in works]
+    payload = {"meta": {"count": len(works), "next_cursor": next_cursor}, "results": works}
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def arxiv_entry(
+    idx: int, rng: random.Random, published: str, abstract_words: tuple[int, int] = (120, 260)
+) -> str:
+    seeded = random.Random(idx)
+    title = " ".join(seeded.choice(FINANCE_VOCAB + GENERAL_VOCAB[:12]) for _ in range(9)).title()
+    authors = "".join(f"<author><name>Author {idx}-{pos}</name></author>" for pos in range(rng.randint(1, 6)))
+    return (
+        f"<entry><id>http://arxiv.org/abs/2603.{idx:05d}v1</id>"
+        f"<updated>{published}T12:00:00Z</updated><published>{published}T10:00:00Z</published>"
+        f"<title>{escape(title)}</title><summary>{escape(abstract_text(seeded, seeded.randint(*abstract_words)))}</summary>"
+        f"{authors}<arxiv:primary_category term=\"q-fin.GN\" scheme=\"http://arxiv.org/schemas/atom\"/>"
+        f"<category term=\"q-fin.GN\" scheme=\"http://arxiv.org/schemas/atom\"/></entry>"
+    )
+
+
+def arxiv_entries(count: int, target: dt.date, seed: int = 7, per_day: int = 0) -> list[str]:
+    """Entries sorted newest first; ``per_day`` > 0 spreads them backwards from ``target``."""
+    rng = random.Random(seed)
+    entries = []
+    for idx in range(count):
+        day = target - dt.timedelta(days=idx // per_day) if per_day > 0 else target
+        entries.append(arxiv_entry(idx, rng, day.isoformat()))
+    return entries
+
+
+def arxiv_feed(entries: list[str], total: int | None = None, start: int = 0) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom" '
+        'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+        "<title>ArXiv Query</title>"
+        f"<opensearch:totalResults>{len(entries) if total is None else total}</opensearch:totalResults>"
+        f"<opensearch:startIndex>{start}</opensearch:startIndex>"
+        f"{''.join(entries)}</feed>"
+    ).encode("utf-8")
@@ -1,20 +1,59 @@
 from __future__ import annotations
 
+import argparse
+import base64
+import contextlib
+import copy
 import dataclasses
 import datetime as dt
+import email.utils
+import functools
+import gzip
+import hashlib
 import html
+import http.client
+import heapq
+import io
+import itertools
 import json
+import math
+import mmap
+import operator
 import os
+import queue
+import random
 import re
+import shutil
+import signal
+import sqlite3
+import struct
+import threading
+import time
+import urllib.request
 import xml.etree.ElementTree as ET
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from email.message import Message
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
-from urllib.error import URLError
-from urllib.parse import quote_plus, urlencode
-from urllib.request import Request, urlopen
-
-OPENALEX_URL = "https://api.openalex.org/works"
-ARXIV_API_URL = "https://export.arxiv.org/api/query"
+from typing import Any, Callable, Iterable, Iterator
+from urllib.error import HTTPError, URLError
+from urllib.parse import SplitResult, parse_qs, quote_plus, unquote, urlencode, urljoin, urlsplit
+
+OPENALEX_URL = os.getenv("OPENALEX_URL", "https://api.openalex.org/works")
+ARXIV_API_URL = os.getenv("ARXIV_API_URL", "https://export.arxiv.org/api/query")
+# Only the fields `_openalex_item_to_paper` reads; OpenAlex `select` takes root-level fields only.
+OPENALEX_SELECT_FIELDS = (
+    "id",
+    "doi",
+    "title",
+    "publication_date",
+    "cited_by_count",
+    "authorships",
+    "primary_location",
+    "abstract_inverted_index",
+    "concepts",
+)
 
 
 @dataclasses.dataclass
@@ -30,6 +69,8 @@ class Paper:
     summary_zh: str
     topics: list[str]
     source: str = "openalex"
+    first_seen: str = ""
+    relevance: float = 0.0
 
 
 @dataclasses.dataclass
@@ -41,6 +82,19 @@ class DigestConfig:
     topic_whitelist: set[str] = dataclasses.field(default_factory=lambda: set(FINANCE_KEYWORDS))
     topic_blacklist: set[str] = dataclasses.field(default_factory=lambda: set(SPAM_TERMS))
     min_quality_score: int = 2
+    openalex_page_size: int = 50
+    openalex_max_works: int = 1000
+    near_duplicate_threshold: float = 0.8
+    repeat_policy: str = "exclude"
+    http_cache_ttl_seconds: int = 3600
+    http_replay: bool = False
+    prometheus_textfile: Path | None = None
+    sources: tuple[str, ...] = ("openalex", "arxiv")
+    source_mode: str = "merge"
+    source_deadline_seconds: float = 120.0
+    day_views: bool = True
+    rank_pool_size: int = 200
+    deadline_seconds: float = 0.0
 
 
 @dataclasses.dataclass
@@ -49,6 +103,14 @@ class LLMConfig:
     api_key: str = ""
     model: str = ""
     timeout_seconds: int = 30
+    concurrency: int = 4
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    cache_max_entries: int = 5000
+    cache_max_age_days: int = 90
+    batch_size: int = 1
+    batch_max_tokens: int = 6000
+    batch_retry_invalid: bool = True
 
     @property
     def enabled(self) -> bool:
@@ -102,49 +164,434 @@ def _normalize_title(text: str) -> str:
     return re.sub(r"\W+", "", text).lower()
 
 
-def _quality_score(paper: Paper, topic_whitelist: set[str]) -> int:
-    text = " ".join([paper.title, paper.abstract, paper.venue, " ".join(paper.topics)]).lower()
-    title_text = paper.title.lower()
-    topic_text = " ".join(paper.topics).lower()
-    score = 0
-    for keyword in topic_whitelist:
-        if keyword in title_text:
-            score += 3
-        elif keyword in topic_text:
-            score += 2
-        elif keyword in text:
-            score += 1
-    return score
-
-
-def _is_relevant_openalex_paper(paper: Paper, topic_whitelist: set[str], topic_blacklist: set[str], min_quality_score: int) -> bool:
-    text = " ".join([paper.title, paper.abstract, paper.venue, " ".join(paper.topics)]).lower()
-    if any(term in text for term in topic_blacklist):
+def _paper_id(paper: Paper) -> str:
+    return paper.openalex_url or paper.doi_url or _normalize_title(paper.title)
+
+
+def _paper_record_id(paper: dict[str, Any]) -> str:
+    """``_paper_id`` for a paper already serialized into ``digest.json``."""
+    return paper.get("openalex_url") or paper.get("doi_url") or _normalize_title(paper.get("title", ""))
+
+
+def _trie_pattern(node: dict[str, Any]) -> str:
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if "" in node else body
+
+
+class KeywordMatcher:
+    # Below this size plain substring scans (which run in C) beat the regex walk.
+    scan_limit = 256
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords = frozenset(keywords)
+        # `"" in text` is always true, so an empty keyword matches every field.
+        self._always = frozenset(k for k in self.keywords if not k)
+        self._terms = tuple(sorted(k for k in self.keywords if k))
+        self._pattern: re.Pattern[str] | None = None
+        self._prefixes: dict[str, frozenset[str]] = {}
+        if len(self._terms) <= self.scan_limit:
+            return
+
+        trie: dict[str, Any] = {}
+        for term in self._terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        # A zero-width lookahead tries every start offset; the trie regex prefers the longest keyword
+        # there, and every shorter keyword matching at the same offset is one of its prefixes.
+        self._pattern = re.compile(f"(?=({_trie_pattern(trie)}))")
+        term_set = set(self._terms)
+        self._prefixes = {
+            term: frozenset(term[:end] for end in range(1, len(term) + 1) if term[:end] in term_set)
+            for term in self._terms
+        }
+
+    def find(self, text: str) -> set[str]:
+        found = set(self._always)
+        if self._pattern is None:
+            found.update(term for term in self._terms if term in text)
+            return found
+        longest: set[str] = set()
+        for match in self._pattern.finditer(text):
+            term = match.group(1)
+            if term not in longest:
+                longest.add(term)
+                found.update(self._prefixes[term])
+        return found
+
+    def matches_any(self, text: str) -> bool:
+        if self._always:
+            return True
+        if self._pattern is None:
+            return any(term in text for term in self._terms)
+        return self._pattern.search(text) is not None
+
+    def score(self, title: str, topics: str, text: str) -> int:
+        if self._pattern is None:
+            score = 3 * len(self._always)
+            for term in self._terms:
+                if term in title:
+                    score += 3
+                elif term in topics:
+                    score += 2
+                elif term in text:
+                    score += 1
+            return score
+        title_hits = self.find(title)
+        topic_hits = self.find(topics) - title_hits
+        text_hits = self.find(text) - title_hits - topic_hits
+        return 3 * len(title_hits) + 2 * len(topic_hits) + len(text_hits)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_keywords(keywords: frozenset[str]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def _keyword_matcher(keywords: Iterable[str] | KeywordMatcher) -> KeywordMatcher:
+    return keywords if isinstance(keywords, KeywordMatcher) else _compile_keywords(frozenset(keywords))
+
+
+def _paper_text(paper: Paper) -> str:
+    return " ".join([paper.title, paper.abstract, paper.venue, " ".join(paper.topics)]).lower()
+
+
+def _quality_score(paper: Paper, topic_whitelist: set[str] | KeywordMatcher) -> int:
+    matcher = _keyword_matcher(topic_whitelist)
+    return matcher.score(paper.title.lower(), " ".join(paper.topics).lower(), _paper_text(paper))
+
+
+def _is_relevant_openalex_paper(
+    paper: Paper,
+    topic_whitelist: set[str] | KeywordMatcher,
+    topic_blacklist: set[str] | KeywordMatcher,
+    min_quality_score: int,
+) -> bool:
+    if _keyword_matcher(topic_blacklist).matches_any(_paper_text(paper)):
         return False
     return _quality_score(paper, topic_whitelist) >= min_quality_score
 
 
+_MINHASH_BINS = 64
+_LSH_BANDS = 16
+# Empty one-permutation bins borrow from the first filled bin in their own fixed random probe order
+# (optimal densification), tagged with the borrowing bin so it never equals a genuine value.
+_minhash_rng = random.Random(20260305)
+_MINHASH_PROBES = [_minhash_rng.sample(range(_MINHASH_BINS), _MINHASH_BINS) for _ in range(_MINHASH_BINS)]
+_MINHASH_BORROWED = 1 << 64
+_ARXIV_ID_RE = re.compile(r"(?:arxiv\.org/(?:abs|pdf)/|10\.48550/arxiv\.)([a-z\-]+/\d{7}|\d{4}\.\d{4,5})", re.I)
+
+
+def _doi_key(paper: Paper) -> str:
+    return re.sub(r"^https?://(dx\.)?doi\.org/", "", paper.doi_url.strip().lower())
+
+
+def _arxiv_id(paper: Paper) -> str:
+    for url in (paper.openalex_url, paper.doi_url):
+        match = _ARXIV_ID_RE.search(url or "")
+        if match:
+            return match.group(1).lower()
+    return ""
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _shingles(text: str, size: int = 3) -> set[int]:
+    """Hashes of the word ``size``-grams of ``text``.
+
+    Tokens are hashed once (and cached); a shingle's hash is the built-in hash of its tuple of token
+    hashes, which is unsalted for ints and so stable within an interpreter version.
+    """
+    hashes = list(map(_token_hash, _WORD_RE.findall(text.lower())))
+    if len(hashes) <= size:
+        return {hash(tuple(hashes))} if hashes else set()
+    return set(map(hash, zip(*(hashes[i:] for i in range(size)))))
+
+
+def _minhash(shingles: set[int]) -> tuple[int, ...]:
+    """One-permutation MinHash: each shingle hash lands in one bin, and each bin keeps its minimum.
+
+    The low bits pick one of the ``_MINHASH_BINS`` bins. Empty bins (short texts) copy a
+    filled bin chosen by ``_MINHASH_PROBES``, so two texts agree on a bin about as often as their
+    shingle sets overlap.
+    """
+    if not shingles:
+        return ()
+    slots = _MINHASH_BINS
+    # Descending order: the last write to each bin is its minimum.
+    values = sorted(shingles, reverse=True)
+    bins = dict(zip(map(operator.and_, values, itertools.repeat(slots - 1)), values))
+    signature = list(map(bins.get, range(slots)))
+    if len(bins) < slots:
+        for slot, value in enumerate(signature):
+            if value is None:
+                source = next(probe for probe in _MINHASH_PROBES[slot] if probe in bins)
+                signature[slot] = bins[source] + (slot + 1) * _MINHASH_BORROWED
+    return tuple(signature)
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold: float = 0.8, bands: int = _LSH_BANDS) -> None:
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = _MINHASH_BINS // bands
+        self._buckets: list[dict[tuple[int, ...], list[str]]] = [{} for _ in range(bands)]
+        self._signatures: dict[str, tuple[int, ...]] = {}
+
+    def _band_keys(self, signature: tuple[int, ...]) -> Iterator[tuple[int, tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows : (band + 1) * self.rows]
+
+    def query(self, signature: tuple[int, ...]) -> tuple[str, float] | None:
+        if not signature:
+            return None
+        best: tuple[str, float] | None = None
+        checked: set[str] = set()
+        for band, key in self._band_keys(signature):
+            for candidate in self._buckets[band].get(key, []):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                other = self._signatures[candidate]
+                similarity = sum(x == y for x, y in zip(signature, other)) / len(signature)
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (candidate, similarity)
+        return best
+
+    def add(self, key: str, signature: tuple[int, ...]) -> None:
+        if not signature:
+            return
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+
 def _dedupe_and_filter(
-    papers: list[Paper], topic_whitelist: set[str], topic_blacklist: set[str], min_quality_score: int
+    papers: Iterable[Paper],
+    topic_whitelist: set[str] | KeywordMatcher,
+    topic_blacklist: set[str] | KeywordMatcher,
+    min_quality_score: int,
+    limit: int | None = None,
+    near_duplicate_threshold: float = 0.8,
+    dropped: list[dict[str, Any]] | None = None,
 ) -> list[Paper]:
-    unique: list[Paper] = []
-    seen_titles: set[str] = set()
+    accepted = _iter_dedupe_and_filter(
+        papers, topic_whitelist, topic_blacklist, min_quality_score, near_duplicate_threshold, dropped
+    )
+    return list(accepted if limit is None else itertools.islice(accepted, max(limit, 0)))
+
+
+def _iter_dedupe_and_filter(
+    papers: Iterable[Paper],
+    topic_whitelist: set[str] | KeywordMatcher,
+    topic_blacklist: set[str] | KeywordMatcher,
+    min_quality_score: int,
+    near_duplicate_threshold: float = 0.8,
+    dropped: list[dict[str, Any]] | None = None,
+) -> Iterator[Paper]:
+    """Yield each paper as soon as it passes dedupe and relevance filtering; pulls ``papers`` lazily."""
+    seen: dict[str, str] = {}
+    whitelist_matcher = _keyword_matcher(topic_whitelist)
+    blacklist_matcher = _keyword_matcher(topic_blacklist)
+    near_duplicates = NearDuplicateIndex(near_duplicate_threshold) if near_duplicate_threshold > 0 else None
+
+    def drop(paper: Paper, duplicate_of: str, reason: str, similarity: float = 1.0) -> None:
+        if dropped is not None:
+            dropped.append(
+                {
+                    "title": paper.title,
+                    "paper_id": _paper_id(paper),
+                    "duplicate_of": duplicate_of,
+                    "reason": reason,
+                    "similarity": round(similarity, 3),
+                }
+            )
 
     for paper in papers:
-        normalized = _normalize_title(paper.title)
-        if normalized and normalized in seen_titles:
+        keys = {
+            "title": _normalize_title(paper.title),
+            "doi": _doi_key(paper),
+            "arxiv": _arxiv_id(paper),
+        }
+        match = next((f"{reason}:{key}" for reason, key in keys.items() if key and f"{reason}:{key}" in seen), "")
+        if match:
+            drop(paper, seen[match], match.split(":", 1)[0])
             continue
         if paper.source == "openalex" and not _is_relevant_openalex_paper(
             paper,
-            topic_whitelist=topic_whitelist,
-            topic_blacklist=topic_blacklist,
+            topic_whitelist=whitelist_matcher,
+            topic_blacklist=blacklist_matcher,
             min_quality_score=min_quality_score,
         ):
             continue
-        if normalized:
-            seen_titles.add(normalized)
-        unique.append(paper)
-    return unique
+
+        paper_id = _paper_id(paper)
+        if near_duplicates is not None:
+            signature = _minhash(_shingles(f"{paper.title} {paper.abstract}"))
+            near = near_duplicates.query(signature)
+            if near is not None:
+                drop(paper, near[0], "near_duplicate", near[1])
+                continue
+            near_duplicates.add(paper_id, signature)
+
+        for reason, key in keys.items():
+            if key:
+                seen[f"{reason}:{key}"] = paper_id
+        yield paper
+
+
+# Prior belief in a venue's relevance/quality, matched on the lower-cased venue name.
+VENUE_PRIORS = {
+    "journal of finance": 1.0,
+    "the journal of finance": 1.0,
+    "journal of financial economics": 1.0,
+    "review of financial studies": 1.0,
+    "the review of financial studies": 1.0,
+    "american economic review": 1.0,
+    "econometrica": 1.0,
+    "quarterly journal of economics": 1.0,
+    "the quarterly journal of economics": 1.0,
+    "journal of political economy": 1.0,
+    "review of economic studies": 1.0,
+    "the review of economic studies": 1.0,
+    "journal of monetary economics": 0.8,
+    "journal of financial and quantitative analysis": 0.8,
+    "review of finance": 0.8,
+    "management science": 0.7,
+    "journal of banking & finance": 0.6,
+    "journal of banking and finance": 0.6,
+    "journal of corporate finance": 0.6,
+    "journal of international money and finance": 0.5,
+    "national bureau of economic research": 0.6,
+    "ssrn electronic journal": 0.3,
+    "arxiv": 0.3,
+}
+
+
+class RelevanceRanker:
+    """Rank candidates by sparse TF-IDF cosine similarity to a reference vocabulary.
+
+    The cosine score is blended with the saturated keyword score from ``KeywordMatcher``
+    and a venue prior. IDF comes from the day's candidate pool, so terms every candidate
+    shares (``economics``, ``paper``) carry little weight.
+    """
+
+    weights = (0.6, 0.3, 0.1)  # tf-idf cosine, keyword score, venue prior
+    keyword_saturation = 6.0
+
+    def __init__(
+        self,
+        vocabulary: Iterable[str],
+        topic_whitelist: set[str] | KeywordMatcher,
+        venue_priors: dict[str, float] | None = None,
+    ) -> None:
+        self.reference = Counter(token for term in sorted(vocabulary) for token in _search_tokens(term))
+        self.matcher = _keyword_matcher(topic_whitelist)
+        self.venue_priors = VENUE_PRIORS if venue_priors is None else venue_priors
+
+    @staticmethod
+    def _term_counts(paper: Paper) -> Counter[str]:
+        # Title and topic terms count four times: they describe the paper more reliably than the abstract.
+        head = f" {paper.title} {' '.join(paper.topics)}"
+        return _token_counts(paper.abstract + head * 4)
+
+    def features(self, paper: Paper) -> tuple[Counter[str], float]:
+        """The part of a paper's score that does not depend on the rest of the pool.
+
+        Returns the paper's term counts and its weighted keyword and venue score.
+        """
+        _, w_keyword, w_venue = self.weights
+        keyword = _quality_score(paper, self.matcher)
+        venue = self.venue_priors.get(paper.venue.strip().lower(), 0.0)
+        return self._term_counts(paper), w_keyword * keyword / (keyword + self.keyword_saturation) + w_venue * venue
+
+    def pool(self, papers: Iterable[Paper] = ()) -> RankPool:
+        pool = RankPool(self)
+        for paper in papers:
+            pool.add(paper)
+        return pool
+
+    def scores(self, papers: list[Paper]) -> list[float]:
+        """Blended scores in ``papers`` order."""
+        return self.pool(papers).scores()
+
+    def top_k(self, papers: list[Paper], k: int) -> list[Paper]:
+        """The ``k`` best papers, best first; ties keep fetch order. Sets ``Paper.relevance``."""
+        return self.pool(papers).top_k(k)
+
+
+class RankPool:
+    """The candidate pool of one ranking, featurized as candidates arrive.
+
+    ``add`` does all per-candidate work: tokenizing, keyword and venue scores, document
+    frequencies. ``build_digest`` calls it as the filter accepts papers, so that work overlaps
+    fetching. Only IDF weighting and the cosine wait for the complete pool. That step costs a few
+    map/sum calls per candidate and handles tens of thousands of candidates in well under a second.
+    """
+
+    def __init__(self, ranker: RelevanceRanker) -> None:
+        self.ranker = ranker
+        self.papers: list[Paper] = []
+        self._docs: list[Counter[str]] = []
+        self._static: list[float] = []
+        self._df: Counter[str] = Counter()
+        self._max_count = 0
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def add(self, paper: Paper) -> Paper:
+        counts, static = self.ranker.features(paper)
+        self.papers.append(paper)
+        self._docs.append(counts)
+        self._static.append(static)
+        self._df.update(counts.keys())
+        self._max_count = max(self._max_count, max(counts.values(), default=0))
+        return paper
+
+    def scores(self) -> list[float]:
+        total = len(self._docs) + 1
+        idf = {token: math.log(total / (1 + freq)) + 1 for token, freq in self._df.items()}
+        unseen_idf = math.log(total) + 1
+        query = {token: (1 + math.log(n)) * idf.get(token, unseen_idf) for token, n in self.ranker.reference.items()}
+        query_norm = math.sqrt(sum(w * w for w in query.values()))
+        query_terms = query.keys()
+        log_tf = [0.0] + [1 + math.log(n) for n in range(1, self._max_count + 1)]
+        # Squared weights are looked up once per token; only the few query terms need the plain ones.
+        log_tf_sq = [w * w for w in log_tf]
+        idf_sq = {token: w * w for token, w in idf.items()}
+
+        w_cosine = self.ranker.weights[0]
+        results = []
+        for counts, static in zip(self._docs, self._static):
+            # Per-document norms stay inside C-level map/sum calls.
+            norm = math.sqrt(sum(map(operator.mul, map(log_tf_sq.__getitem__, counts.values()), map(idf_sq.__getitem__, counts))))
+            # Sum in sorted order, not set order: scores must not depend on the string hash seed.
+            dot = sum(query[t] * log_tf[counts[t]] * idf[t] for t in sorted(query_terms & counts.keys()))
+            cosine = dot / (norm * query_norm) if norm and query_norm else 0.0
+            results.append(w_cosine * cosine + static)
+        return results
+
+    def top_k(self, k: int) -> list[Paper]:
+        """The ``k`` best papers, best first; ties keep fetch order. Sets ``Paper.relevance``."""
+        if k <= 0 or not self.papers:
+            return []
+        scores = self.scores()
+        # Rounding absorbs float noise, so papers with equal content tie and keep fetch order.
+        best = heapq.nlargest(k, range(len(scores)), key=lambda i: (round(scores[i], 9), -i))
+        for i in best:
+            self.papers[i].relevance = round(scores[i], 4)
+        return [self.papers[i] for i in best]
 
 
 def _extract_abstract(indexed_abstract: dict[str, Any] | None) -> str:
@@ -202,17 +649,541 @@ def _simple_zh_summary(title: str, abstract: str, topics: list[str]) -> str:
     )
 
 
-def _llm_zh_summary(title: str, abstract: str, topics: list[str], cfg: LLMConfig) -> str:
+USER_AGENT = "finance-econ-digest/0.1 (+https://github.com/hantrleko/Codex_Finance)"
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+@dataclasses.dataclass
+class HttpResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    elapsed: float = 0.0
+    attempts: int = 1
+
+
+class HttpClient:
+    def __init__(
+        self,
+        timeout: float = 30,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_per_host: int = 8,
+        max_redirects: int = 5,
+    ) -> None:
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_per_host = max_per_host
+        self.max_redirects = max_redirects
+        self.deadline: float | None = None
+        self.stats: deque[dict[str, Any]] = deque(maxlen=1000)
+        # Keyed by (scheme, host, port, proxy): a pooled connection may be a tunnel through ``HTTPS_PROXY``.
+        self._idle: dict[tuple[str, str, int, str], list[http.client.HTTPConnection]] = {}
+        self._slots: dict[tuple[str, str, int], threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def bounded(self, deadline: float | None) -> HttpClient:
+        """A view sharing this client's connection pool whose requests all end by ``deadline``.
+
+        ``deadline`` is a ``time.monotonic()`` value. Each attempt's timeout is cut to the time
+        left, and no retry starts that could not finish in time.
+        """
+        if deadline is None:
+            return self
+        view = copy.copy(self)
+        view.deadline = deadline if self.deadline is None else min(deadline, self.deadline)
+        return view
+
+    def _time_left(self) -> float | None:
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def get(self, url: str, headers: dict[str, str] | None = None, timeout: float | None = None) -> HttpResponse:
+        return self.request("GET", url, headers=headers, timeout=timeout)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> HttpResponse:
+        """Send one request, following up to ``max_redirects`` redirects like ``urllib`` does.
+
+        GET and HEAD follow any ``REDIRECT_STATUSES``; other methods only 307/308, which keep the
+        method and body. Credentials are not forwarded to another host. ``HTTP_PROXY`` /
+        ``HTTPS_PROXY`` / ``NO_PROXY`` from the environment are honoured.
+        """
+        headers = dict(headers or {})
+        for hop in range(self.max_redirects + 1):
+            response = self._request_once(method, url, body, headers, timeout)
+            location = response.headers.get("location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                return response
+            if hop == self.max_redirects or (method not in ("GET", "HEAD") and response.status not in (307, 308)):
+                break
+            next_url = urljoin(url, location)
+            if urlsplit(next_url).netloc != urlsplit(url).netloc:
+                headers = {k: v for k, v in headers.items() if k.lower() not in ("authorization", "cookie")}
+            url = next_url
+        raise _http_error(url, response.status, "redirect not followed", response.headers)
+
+    def _request_once(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        timeout: float | None,
+    ) -> HttpResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        proxy = _proxy_for(scheme, parts.hostname or "")
+        key = (scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        send_headers = {"Accept-Encoding": "gzip", "User-Agent": USER_AGENT, **headers}
+        if proxy is not None and scheme == "http":
+            # Plain HTTP goes to the proxy in absolute form; HTTPS is tunnelled with CONNECT in ``_checkout``.
+            target = url
+            send_headers.update(_proxy_auth(proxy))
+        timeout = self.timeout if timeout is None else timeout
+
+        started = time.monotonic()
+        attempt = 0
+        slot = self._slot(key)
+        left = self._time_left()
+        if not slot.acquire(timeout=None if left is None else max(left, 0.0)):
+            self._record(method, key, target, 0, 0, started, 0)
+            raise URLError(TimeoutError(f"deadline reached waiting for a connection to {key[1]}"))
+        try:
+            while True:
+                left = self._time_left()
+                try:
+                    if left is not None and left <= 0:
+                        raise TimeoutError("deadline reached")
+                    status, reason, resp_headers, payload = self._send(
+                        key, proxy, method, target, body, send_headers, timeout if left is None else min(timeout, left)
+                    )
+                except (OSError, http.client.HTTPException) as exc:
+                    delay = self._backoff(attempt, None)
+                    left = self._time_left()
+                    if attempt >= self.max_retries or (left is not None and delay >= left):
+                        self._record(method, key, target, 0, attempt + 1, started, 0)
+                        raise URLError(exc) from exc
+                else:
+                    if status not in RETRY_STATUSES or attempt >= self.max_retries:
+                        break
+                    delay = self._backoff(attempt, resp_headers.get("retry-after"))
+                    left = self._time_left()
+                    if left is not None and delay >= left:
+                        break
+                attempt += 1
+                time.sleep(delay)
+        finally:
+            slot.release()
+
+        elapsed = self._record(method, key, target, status, attempt + 1, started, len(payload))
+        if status >= 400:
+            raise _http_error(url, status, reason, resp_headers)
+        return HttpResponse(status=status, headers=resp_headers, body=payload, elapsed=elapsed, attempts=attempt + 1)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _slot(self, key: tuple[str, str, int]) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(max(1, self.max_per_host))
+            return slot
+
+    def _checkout(
+        self, key: tuple[str, str, int], proxy: SplitResult | None, timeout: float
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        pool_key = (*key, proxy.geturl() if proxy is not None else "")
+        with self._lock:
+            idle = self._idle.get(pool_key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        if proxy is None:
+            return conn_cls(host, port, timeout=timeout), False
+        conn = conn_cls(proxy.hostname or "", proxy.port or 80, timeout=timeout)
+        if scheme == "https":
+            conn.set_tunnel(host, port, headers=_proxy_auth(proxy))
+        return conn, False
+
+    def _checkin(
+        self, key: tuple[str, str, int], proxy: SplitResult | None, conn: http.client.HTTPConnection
+    ) -> None:
+        with self._lock:
+            idle = self._idle.setdefault((*key, proxy.geturl() if proxy is not None else ""), [])
+            if len(idle) < self.max_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _send(
+        self,
+        key: tuple[str, str, int],
+        proxy: SplitResult | None,
+        method: str,
+        target: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        timeout: float,
+    ) -> tuple[int, str, dict[str, str], bytes]:
+        conn, reused = self._checkout(key, proxy, timeout)
+        try:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            conn.request(method, target, body=body, headers=headers)
+            resp = conn.getresponse()
+            payload = resp.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            if reused:
+                # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                return self._send(key, proxy, method, target, body, headers, timeout)
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(key, proxy, conn)
+        resp_headers = {name.lower(): value for name, value in resp.getheaders()}
+        if resp_headers.get("content-encoding", "").lower() == "gzip":
+            payload = gzip.decompress(payload)
+        return resp.status, resp.reason, resp_headers, payload
+
+    def _backoff(self, attempt: int, retry_after: str | None) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        if retry_after:
+            try:
+                wait = float(retry_after)
+            except ValueError:
+                parsed = email.utils.parsedate_to_datetime(retry_after)
+                wait = (parsed - dt.datetime.now(dt.timezone.utc)).total_seconds() if parsed else 0.0
+            delay = max(delay, min(max(wait, 0.0), self.backoff_max))
+        return delay
+
+    def _record(
+        self, method: str, key: tuple[str, str, int], target: str, status: int, attempts: int, started: float, size: int
+    ) -> float:
+        elapsed = time.monotonic() - started
+        self.stats.append(
+            {
+                "method": method,
+                "host": key[1],
+                "path": target.split("?", 1)[0],
+                "status": status,
+                "attempts": attempts,
+                "seconds": round(elapsed, 4),
+                "bytes": size,
+            }
+        )
+        return elapsed
+
+
+def _http_error(url: str, status: int, reason: str, headers: dict[str, str]) -> HTTPError:
+    msg = Message()
+    for name, value in headers.items():
+        msg[name] = value
+    return HTTPError(url, status, reason, msg, None)
+
+
+def _proxy_for(scheme: str, host: str) -> SplitResult | None:
+    """The ``HTTP_PROXY`` / ``HTTPS_PROXY`` URL for a request to ``host``, unless ``NO_PROXY`` exempts it."""
+    proxy = urllib.request.getproxies_environment().get(scheme)
+    if not proxy or urllib.request.proxy_bypass_environment(host):
+        return None
+    return urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+
+def _proxy_auth(proxy: SplitResult) -> dict[str, str]:
+    if proxy.username is None:
+        return {}
+    credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}".encode("utf-8")
+    return {"Proxy-Authorization": "Basic " + base64.b64encode(credentials).decode("ascii")}
+
+
+class RunMetrics:
+    def __init__(self) -> None:
+        self.spans: list[dict[str, Any]] = []
+        self.counters: dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = {"name": name, "seconds": round(time.perf_counter() - started, 6), **labels}
+            with self._lock:
+                self.spans.append(entry)
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_http(self, prefix: str, response: HttpResponse) -> None:
+        self.incr(f"{prefix}.requests")
+        self.incr(f"{prefix}.bytes", len(response.body))
+        if response.attempts > 1:
+            self.incr(f"{prefix}.retries", response.attempts - 1)
+
+    def stages(self) -> dict[str, dict[str, float]]:
+        stages: dict[str, dict[str, float]] = {}
+        with self._lock:
+            for span in self.spans:
+                stage = stages.setdefault(span["name"], {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+                stage["calls"] += 1
+                stage["seconds"] = round(stage["seconds"] + span["seconds"], 6)
+                stage["max_seconds"] = max(stage["max_seconds"], span["seconds"])
+        return stages
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            spans, counters = list(self.spans), dict(sorted(self.counters.items()))
+        return {
+            "total_seconds": round(time.perf_counter() - self._started, 6),
+            "stages": self.stages(),
+            "counters": counters,
+            "spans": spans,
+        }
+
+    def prometheus_text(self, run_date: str) -> str:
+        data = self.as_dict()
+        lines = [
+            "# HELP digest_run_seconds Wall-clock seconds of the last digest run.",
+            "# TYPE digest_run_seconds gauge",
+            f'digest_run_seconds{{date="{run_date}"}} {data["total_seconds"]}',
+            "# HELP digest_stage_seconds Seconds spent per pipeline stage in the last run.",
+            "# TYPE digest_stage_seconds gauge",
+        ]
+        lines.extend(f'digest_stage_seconds{{stage="{name}"}} {s["seconds"]}' for name, s in data["stages"].items())
+        lines.extend(["# HELP digest_stage_calls Spans recorded per pipeline stage.", "# TYPE digest_stage_calls gauge"])
+        lines.extend(f'digest_stage_calls{{stage="{name}"}} {s["calls"]}' for name, s in data["stages"].items())
+        lines.extend(["# HELP digest_counter Counters from the last digest run.", "# TYPE digest_counter gauge"])
+        lines.extend(f'digest_counter{{name="{name}"}} {value}' for name, value in data["counters"].items())
+        return "\n".join(lines) + "\n"
+
+
+_default_client: HttpClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def _http_client() -> HttpClient:
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+_LLM_SYSTEM_PROMPT = "你是金融经济学研究助手。请用中文输出2-3句摘要，包含研究主题、方法视角和潜在应用价值，不要编造。"
+_LLM_OUTPUT_TOKEN_ESTIMATE = 256
+_LLM_BATCH_SYSTEM_PROMPT = (
+    _LLM_SYSTEM_PROMPT
+    + "输入是 JSON 数组，每项包含 index、title、topics、abstract。"
+    + "请只输出一个 JSON 对象：键为 index（字符串），值为对应文献的中文摘要，不要输出其他内容。"
+)
+_CJK_CHAR_RE = re.compile(r"[\u4e00-\u9fff]")
+
+
+class RunBudget:
+    """Wall-clock budget for one run, handed to stages as absolute ``time.monotonic()`` deadlines.
+
+    Stage ends are cumulative fractions of the budget, so time a stage leaves unused carries over
+    to the next one. The tail after ``summarize`` is reserved for rank/render/write/index, which
+    always run. A budget of 0 means unbounded: every deadline is ``None``.
+    """
+
+    stage_ends = {"fetch": 0.5, "summarize": 0.85}
+
+    def __init__(self, seconds: float = 0.0) -> None:
+        self.seconds = seconds
+        self.started = time.monotonic()
+
+    def deadline(self, stage: str) -> float | None:
+        if self.seconds <= 0:
+            return None
+        return self.started + self.seconds * self.stage_ends[stage]
+
+    def left(self, stage: str) -> float:
+        deadline = self.deadline(stage)
+        return math.inf if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+
+class _RateLimiter:
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_allowance = float(requests_per_minute)
+        self._token_allowance = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0) -> None:
+        rpm, tpm = self.requests_per_minute, self.tokens_per_minute
+        if rpm <= 0 and tpm <= 0:
+            return
+        if tpm > 0:
+            tokens = min(tokens, tpm)
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._updated
+                self._updated = now
+                if rpm > 0:
+                    self._request_allowance = min(float(rpm), self._request_allowance + elapsed * rpm / 60)
+                if tpm > 0:
+                    self._token_allowance = min(float(tpm), self._token_allowance + elapsed * tpm / 60)
+
+                wait = 0.0
+                if rpm > 0 and self._request_allowance < 1:
+                    wait = max(wait, (1 - self._request_allowance) * 60 / rpm)
+                if tpm > 0 and self._token_allowance < tokens:
+                    wait = max(wait, (tokens - self._token_allowance) * 60 / tpm)
+                if wait <= 0:
+                    if rpm > 0:
+                        self._request_allowance -= 1
+                    if tpm > 0:
+                        self._token_allowance -= tokens
+                    return
+            time.sleep(wait)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    def __init__(self, path: Path, max_entries: int = 5000, max_age_days: int = 90) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._used: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "key TEXT PRIMARY KEY, paper_id TEXT NOT NULL, summary TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key_for(paper_id: str, abstract: str, model: str, prompt: str) -> str:
+        return _sha256("\x1f".join([paper_id, _sha256(abstract), model, _sha256(prompt)]))
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Recency is only written by ``save_usage``, so a run that publishes nothing new
+            # leaves the cache file byte-for-byte unchanged.
+            self._used[key] = time.time()
+            return row[0]
+
+    def take_usage(self) -> dict[str, float]:
+        """Hand over the ``last_used`` times of hits since the last call."""
+        with self._lock:
+            used, self._used = self._used, {}
+            return used
+
+    def save_usage(self, used: dict[str, float]) -> int:
+        """Write ``last_used`` times from ``take_usage``, then evict; returns the number of rows removed."""
+        if used:
+            with self._lock:
+                self._conn.executemany(
+                    "UPDATE summaries SET last_used = MAX(last_used, ?) WHERE key = ?",
+                    [(last_used, key) for key, last_used in used.items()],
+                )
+                self._conn.commit()
+        return self.evict()
+
+    def put(self, key: str, paper_id: str, summary: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, paper_id, summary, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, paper_id, summary, now, now),
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        with self._lock:
+            removed = 0
+            # Check before deleting: even a DELETE that matches nothing would rewrite the file.
+            if self.max_age_days > 0:
+                cutoff = time.time() - self.max_age_days * 86400
+                if self._conn.execute("SELECT 1 FROM summaries WHERE created_at < ? LIMIT 1", (cutoff,)).fetchone():
+                    removed += self._conn.execute("DELETE FROM summaries WHERE created_at < ?", (cutoff,)).rowcount
+            if self.max_entries > 0:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()
+                if count > self.max_entries:
+                    removed += self._conn.execute(
+                        "DELETE FROM summaries WHERE key NOT IN "
+                        "(SELECT key FROM summaries ORDER BY last_used DESC, rowid DESC LIMIT ?)",
+                        (self.max_entries,),
+                    ).rowcount
+            if removed:
+                self._conn.commit()
+            return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _llm_zh_summary(
+    title: str,
+    abstract: str,
+    topics: list[str],
+    cfg: LLMConfig,
+    limiter: _RateLimiter | None = None,
+    cache: SummaryCache | None = None,
+    paper_id: str = "",
+    client: HttpClient | None = None,
+    metrics: RunMetrics | None = None,
+    lookup_cache: bool = True,
+) -> str:
     if not cfg.enabled:
         return _simple_zh_summary(title, abstract, topics)
+    metrics = metrics or RunMetrics()
+
+    cache_key = ""
+    if cache is not None:
+        paper_id = paper_id or _normalize_title(title)
+        cache_key = SummaryCache.key_for(paper_id, abstract, cfg.model, _LLM_SYSTEM_PROMPT)
+        cached = cache.get(cache_key) if lookup_cache else None
+        if cached:
+            return cached
 
     payload = {
         "model": cfg.model,
         "messages": [
-            {
-                "role": "system",
-                "content": "你是金融经济学研究助手。请用中文输出2-3句摘要，包含研究主题、方法视角和潜在应用价值，不要编造。",
-            },
+            {"role": "system", "content": _LLM_SYSTEM_PROMPT},
             {
                 "role": "user",
                 "content": json.dumps({"title": title, "topics": topics, "abstract": abstract[:3000]}, ensure_ascii=False),
@@ -220,24 +1191,165 @@ def _llm_zh_summary(title: str, abstract: str, topics: list[str], cfg: LLMConfig
         ],
         "temperature": 0.2,
     }
-    req = Request(
-        url=f"{cfg.api_base.rstrip('/')}/chat/completions",
-        data=json.dumps(payload).encode("utf-8"),
-        method="POST",
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {cfg.api_key}",
-        },
-    )
+    body = json.dumps(payload).encode("utf-8")
     try:
-        with urlopen(req, timeout=cfg.timeout_seconds) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        if limiter is not None:
+            limiter.acquire(len(body) // 4 + _LLM_OUTPUT_TOKEN_ESTIMATE)
+        with metrics.span("llm.summary", paper_id=paper_id):
+            resp = (client or _http_client()).request(
+                "POST",
+                f"{cfg.api_base.rstrip('/')}/chat/completions",
+                body=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {cfg.api_key}",
+                },
+                timeout=cfg.timeout_seconds,
+            )
+        metrics.record_http("llm", resp)
+        data = json.loads(resp.body.decode("utf-8"))
         content = data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+        if content and cache is not None:
+            cache.put(cache_key, paper_id, content)
+        if not content:
+            metrics.incr("llm.fallbacks")
         return content or _simple_zh_summary(title, abstract, topics)
     except Exception:
+        metrics.incr("llm.fallbacks")
         return _simple_zh_summary(title, abstract, topics)
 
 
+def _batch_item(index: int, paper: Paper) -> dict[str, Any]:
+    return {"index": index, "title": paper.title, "topics": paper.topics, "abstract": paper.abstract[:3000]}
+
+
+def _estimate_tokens(item: dict[str, Any]) -> int:
+    return len(json.dumps(item, ensure_ascii=False).encode("utf-8")) // 4 + _LLM_OUTPUT_TOKEN_ESTIMATE
+
+
+def _pack_batches(items: list[dict[str, Any]], max_items: int, max_tokens: int) -> list[list[dict[str, Any]]]:
+    """Greedily pack items in order; an item larger than the budget still gets a batch of its own."""
+    return list(_iter_batches(items, max_items, max_tokens))
+
+
+def _iter_batches(items: Iterable[dict[str, Any]], max_items: int, max_tokens: int) -> Iterator[list[dict[str, Any]]]:
+    """``_pack_batches`` over a lazy stream: each batch is yielded as soon as it is full."""
+    budget = max_tokens - len(_LLM_BATCH_SYSTEM_PROMPT.encode("utf-8")) // 4
+    current: list[dict[str, Any]] = []
+    used = 0
+    for item in items:
+        cost = _estimate_tokens(item)
+        if current and used + cost > budget:
+            yield current
+            current, used = [], 0
+        current.append(item)
+        used += cost
+        if len(current) >= max_items:
+            yield current
+            current, used = [], 0
+    if current:
+        yield current
+
+
+def _parse_batch_reply(content: str) -> dict[str, Any]:
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        return {}
+    try:
+        data = json.loads(text[start : end + 1])
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _valid_summary(value: Any) -> bool:
+    return isinstance(value, str) and bool(_CJK_CHAR_RE.search(value))
+
+
+def _llm_zh_summaries_batch(
+    papers: list[Paper],
+    cfg: LLMConfig,
+    limiter: _RateLimiter | None = None,
+    cache: SummaryCache | None = None,
+    client: HttpClient | None = None,
+    metrics: RunMetrics | None = None,
+) -> list[str]:
+    """Summarize one packed batch with a single request; invalid or missing items are retried alone."""
+    metrics = metrics or RunMetrics()
+    items = [_batch_item(idx, p) for idx, p in enumerate(papers)]
+    body = json.dumps(
+        {
+            "model": cfg.model,
+            "messages": [
+                {"role": "system", "content": _LLM_BATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps(items, ensure_ascii=False)},
+            ],
+            "temperature": 0.2,
+        }
+    ).encode("utf-8")
+
+    replies: dict[str, Any] = {}
+    transport_failed = False
+    try:
+        if limiter is not None:
+            limiter.acquire(len(body) // 4 + _LLM_OUTPUT_TOKEN_ESTIMATE * len(items))
+        with metrics.span("llm.batch", size=str(len(items))):
+            resp = (client or _http_client()).request(
+                "POST",
+                f"{cfg.api_base.rstrip('/')}/chat/completions",
+                body=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {cfg.api_key}",
+                },
+                timeout=cfg.timeout_seconds,
+            )
+        metrics.record_http("llm", resp)
+        data = json.loads(resp.body.decode("utf-8"))
+        replies = _parse_batch_reply(data.get("choices", [{}])[0].get("message", {}).get("content", ""))
+    except (OSError, ValueError):
+        transport_failed = True
+    except Exception:
+        replies = {}
+    metrics.incr("llm.batches")
+    metrics.incr("llm.batch_items", len(items))
+
+    summaries: list[str] = []
+    for idx, p in enumerate(papers):
+        value = replies.get(str(idx))
+        if _valid_summary(value):
+            summary = value.strip()
+            if cache is not None:
+                paper_id = _paper_id(p)
+                cache.put(SummaryCache.key_for(paper_id, p.abstract, cfg.model, _LLM_SYSTEM_PROMPT), paper_id, summary)
+            summaries.append(summary)
+            continue
+        metrics.incr("llm.batch_invalid")
+        if cfg.batch_retry_invalid and not transport_failed:
+            metrics.incr("llm.batch_retries")
+            summaries.append(
+                _llm_zh_summary(
+                    p.title,
+                    p.abstract,
+                    p.topics,
+                    cfg,
+                    limiter=limiter,
+                    cache=cache,
+                    paper_id=_paper_id(p),
+                    client=client,
+                    metrics=metrics,
+                    lookup_cache=False,
+                )
+            )
+        else:
+            metrics.incr("llm.fallbacks")
+            summaries.append(_simple_zh_summary(p.title, p.abstract, p.topics))
+    return summaries
+
+
 def _render_markdown(date: str, papers: list[Paper], note: str = "") -> str:
     lines = [f"# 金融经济学每日文献速递（{date}）", "", f"共筛选到 **{len(papers)}** 篇文献。", ""]
     if note:
@@ -259,6 +1371,7 @@ def _render_markdown(date: str, papers: list[Paper], note: str = "") -> str:
                 f"- 引用数：{p.cited_by_count}",
                 f"- 主题：{', '.join(p.topics) if p.topics else 'N/A'}",
                 f"- 链接：{' '.join(links) if links else 'N/A'}",
+                *([f"- 首次收录：{p.first_seen}"] if p.first_seen else []),
                 "",
                 f"**中文摘要（自动生成）**：{p.summary_zh}",
                 "",
@@ -273,13 +1386,14 @@ def _render_html(date: str, papers: list[Paper], note: str = "") -> str:
         doi_link = f'<a href="{html.escape(p.doi_url)}" target="_blank" rel="noopener noreferrer">DOI</a>' if p.doi_url else ""
         ext_link = f'<a href="{html.escape(p.openalex_url)}" target="_blank" rel="noopener noreferrer">链接</a>' if p.openalex_url else ""
         sep = " | " if doi_link and ext_link else ""
+        first_seen = f"｜首次收录：{html.escape(p.first_seen)}" if p.first_seen else ""
         cards.append(
             f"""
   <article class=\"card\">
     <h2>{idx}. {html.escape(p.title)}</h2>
     <p class=\"meta\">来源：{html.escape(p.source)}｜作者：{html.escape(', '.join(p.authors) if p.authors else 'N/A')}</p>
     <p class=\"meta\">期刊/来源：{html.escape(p.venue)}｜发表：{html.escape(p.published_date)}｜引用数：{p.cited_by_count}</p>
-    <p class=\"meta\">主题：{html.escape(', '.join(p.topics) if p.topics else 'N/A')}</p>
+    <p class=\"meta\">主题：{html.escape(', '.join(p.topics) if p.topics else 'N/A')}{first_seen}</p>
     <p>{doi_link}{sep}{ext_link}</p>
     <p class=\"summary\"><strong>中文摘要（自动生成）:</strong> {html.escape(p.summary_zh)}</p>
   </article>
@@ -312,101 +1426,1360 @@ def _render_html(date: str, papers: list[Paper], note: str = "") -> str:
 """
 
 
-def fetch_openalex_papers(date_from: dt.date, date_to: dt.date, per_page: int = 50) -> list[Paper]:
+def _render_archive_month_html(month: str, days: dict[str, Any], months: list[str]) -> str:
+    rows: list[str] = []
+    for date in sorted(days, reverse=True):
+        day = days[date]
+        items: list[str] = []
+        for p in day["papers"]:
+            title = html.escape(p["title"])
+            if p.get("url"):
+                title = f'<a href="{html.escape(p["url"])}" target="_blank" rel="noopener noreferrer">{title}</a>'
+            items.append(f"<li>{title}</li>")
+        titles = "".join(items)
+        rows.append(
+            f"""
+  <article class=\"card\">
+    <h2><a href=\"../../{html.escape(date)}/index.html\">{html.escape(date)}</a></h2>
+    <p class=\"meta\">篇数：{day['count']}｜来源：{html.escape(str(day['source_used']))}</p>
+    <ul>{titles}</ul>
+  </article>
+            """.strip()
+        )
+
+    position = months.index(month) if month in months else -1
+    nav: list[str] = ['<a href="../index.html">归档首页</a>']
+    if 0 <= position < len(months) - 1:
+        nav.append(f'<a href="{html.escape(months[position + 1])}.html">← {html.escape(months[position + 1])}</a>')
+    if position > 0:
+        nav.append(f'<a href="{html.escape(months[position - 1])}.html">{html.escape(months[position - 1])} →</a>')
+    rows_html = "\n".join(rows)
+    return f"""<!doctype html>
+<html lang=\"zh-CN\">
+<head>
+  <meta charset=\"utf-8\" />
+  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
+  <title>金融经济学每日文献速递归档 - {html.escape(month)}</title>
+  <style>
+    body {{ font-family: Arial, sans-serif; margin: 2rem auto; max-width: 900px; line-height: 1.6; color: #111; padding: 0 1rem; }}
+    .card {{ border: 1px solid #e6e6e6; border-radius: 10px; padding: 1rem; margin-bottom: 1rem; }}
+    .meta {{ color: #666; font-size: 0.95rem; }}
+  </style>
+</head>
+<body>
+  <h1>金融经济学每日文献速递归档（{html.escape(month)}）</h1>
+  <p class=\"meta\">{' ｜ '.join(nav)}</p>
+  {rows_html}
+</body>
+</html>
+"""
+
+
+def _render_archive_index_html(months: list[dict[str, Any]]) -> str:
+    rows = "\n".join(
+        f'  <li><a href="months/{html.escape(m["month"])}.html">{html.escape(m["month"])}</a>'
+        f'<span class="meta">（{m["days"]} 期，{m["papers"]} 篇）</span></li>'
+        for m in months
+    )
+    return f"""<!doctype html>
+<html lang=\"zh-CN\">
+<head>
+  <meta charset=\"utf-8\" />
+  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
+  <title>金融经济学每日文献速递归档</title>
+  <style>
+    body {{ font-family: Arial, sans-serif; margin: 2rem auto; max-width: 900px; line-height: 1.6; color: #111; padding: 0 1rem; }}
+    .meta {{ color: #666; font-size: 0.95rem; }}
+  </style>
+</head>
+<body>
+  <h1>金融经济学每日文献速递归档</h1>
+  <p class=\"meta\"><a href=\"../latest/index.html\">最新一期</a>｜共 {sum(m['days'] for m in months)} 期</p>
+  <ul>
+{rows}
+  </ul>
+</body>
+</html>
+"""
+
+
+_archive_lock = threading.Lock()
+
+
+class DigestArchive:
+    def __init__(self, output_dir: Path) -> None:
+        self.output_dir = output_dir
+        self.root = output_dir / "archive"
+        self.months_dir = self.root / "months"
+        self.search_path = self.root / "search.json"
+
+    def record(self, metadata: dict[str, Any]) -> None:
+        with _archive_lock:
+            months = self._load_months()
+            touched: set[str] = set()
+            if not months:  # first run, or an archive predating search.json: seed it with every published day
+                for previous in _published_digests(self.output_dir):
+                    if previous["date"] != metadata["date"]:
+                        touched.add(self._add(previous, months))
+
+            month = metadata["date"][:7]
+            is_new_month = month not in months
+            touched.add(self._add(metadata, months))
+            ordered = sorted(months, reverse=True)
+            if is_new_month:
+                # Neighbouring pages carry prev/next links to this month.
+                position = ordered.index(month)
+                touched.update(ordered[max(0, position - 1) : position + 2])
+            for name in touched:
+                self._render_month(name, ordered)
+            summaries = [months[name] for name in ordered]
+            _atomic_write(self.search_path, json.dumps({"months": summaries}, ensure_ascii=False, separators=(",", ":")))
+            _atomic_write(self.root / "index.html", _render_archive_index_html(summaries))
+
+    def _load_months(self) -> dict[str, dict[str, Any]]:
+        try:
+            data = json.loads(self.search_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return {m["month"]: m for m in data.get("months", [])}
+
+    def _add(self, metadata: dict[str, Any], months: dict[str, dict[str, Any]]) -> str:
+        date = metadata["date"]
+        papers = metadata.get("papers", [])
+        month = date[:7]
+        month_path = self.months_dir / f"{month}.json"
+        try:
+            month_data = json.loads(month_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            month_data = {"month": month, "days": {}}
+        month_data["days"][date] = {
+            "count": metadata.get("count", len(papers)),
+            "source_used": metadata.get("source_used", ""),
+            "papers": [
+                {
+                    "id": _paper_record_id(p),
+                    "title": p.get("title", ""),
+                    "url": p.get("doi_url") or p.get("openalex_url") or "",
+                    "source": p.get("source", ""),
+                    "topics": p.get("topics", [])[:3],
+                }
+                for p in papers
+            ],
+        }
+        self.months_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(month_path, json.dumps(month_data, ensure_ascii=False, separators=(",", ":")))
+        months[month] = {
+            "month": month,
+            "days": len(month_data["days"]),
+            "papers": sum(day["count"] for day in month_data["days"].values()),
+            "url": f"months/{month}.json",
+        }
+        return month
+
+    def _render_month(self, month: str, ordered_months: list[str]) -> None:
+        month_data = json.loads((self.months_dir / f"{month}.json").read_text(encoding="utf-8"))
+        html_text = _render_archive_month_html(month, month_data["days"], ordered_months)
+        _atomic_write(self.months_dir / f"{month}.html", html_text)
+
+
+# date, kind (0 = day, 1 = paper), blake2b-128 of the paper id (zeros for days), offset, length
+_STORE_RECORD = struct.Struct("<10sB16sQI")
+_STORE_DAY = 0
+_STORE_PAPER = 1
+_store_lock = threading.Lock()
+
+
+class PaperStore:
+    """Append-only consolidated store of every published paper plus a fixed-width offset index.
+
+    ``papers.jsonl`` holds one compact line per record: a ``day`` record (digest metadata
+    without papers) followed by one ``paper`` record per selected paper. ``papers.idx`` holds one
+    fixed-width ``_STORE_RECORD`` per line and can be memory-mapped to seek to a day or paper directly.
+    A rerun appends a new generation for its date; the last one wins.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.data_path = root / "papers.jsonl"
+        self.index_path = root / "papers.idx"
+        # Positions of index records, folded in incrementally by ``_refresh``.
+        self._refresh_lock = threading.Lock()
+        self._scanned = 0
+        self._days: dict[str, tuple[int, int]] = {}  # date -> [day record, end) of its latest generation
+        self._papers: dict[bytes, list[tuple[str, int]]] = {}  # paper key -> (date, position) of each record
+
+    @staticmethod
+    def paper_key(paper_id: str) -> bytes:
+        return hashlib.blake2b(paper_id.encode("utf-8"), digest_size=16).digest()
+
+    def append_day(self, metadata: dict[str, Any], note: str = "") -> None:
+        date = metadata["date"]
+        day = {"kind": "day", **{k: v for k, v in metadata.items() if k != "papers"}, "note": note}
+        records = [(_STORE_DAY, bytes(16), day)]
+        for rank, paper in enumerate(metadata.get("papers", [])):
+            paper_id = _paper_record_id(paper)
+            record = {"kind": "paper", "run_date": date, "rank": rank, **paper}
+            records.append((_STORE_PAPER, self.paper_key(paper_id), record))
+
+        lines = [
+            (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+            for *_, record in records
+        ]
+        with _store_lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self.data_path.open("ab") as fh:
+                offset = fh.seek(0, os.SEEK_END)
+                fh.write(b"".join(lines))
+                fh.flush()
+                os.fsync(fh.fileno())
+            # The index is written after the data is durable, so every indexed record is complete.
+            entries = []
+            for (kind, key, _), line in zip(records, lines):
+                entries.append(_STORE_RECORD.pack(date.encode("ascii"), kind, key, offset, len(line)))
+                offset += len(line)
+            with self.index_path.open("ab") as fh:
+                torn = fh.seek(0, os.SEEK_END) % _STORE_RECORD.size
+                if torn:
+                    # Drop a record torn by an interrupted append, or every later record is misaligned.
+                    fh.truncate(fh.tell() - torn)
+                fh.write(b"".join(entries))
+                fh.flush()
+                os.fsync(fh.fileno())
+
+    def _refresh(self) -> None:
+        """Fold index records appended since the last call into the date and paper maps."""
+        try:
+            size = self.index_path.stat().st_size
+        except OSError:
+            size = 0
+        size -= size % _STORE_RECORD.size  # ignore a torn trailing record
+        with self._refresh_lock:
+            if size < self._scanned:  # the index was replaced: start over
+                self._scanned, self._days, self._papers = 0, {}, {}
+            if size == self._scanned:
+                return
+            with self.index_path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for start in range(self._scanned, size, _STORE_RECORD.size):
+                    raw_date, kind, key, _offset, _length = _STORE_RECORD.unpack_from(view, start)
+                    date, position = raw_date.decode("ascii"), start // _STORE_RECORD.size
+                    if kind == _STORE_DAY:
+                        self._days[date] = (position, position + 1)
+                    else:
+                        self._papers.setdefault(key, []).append((date, position))
+                        span = self._days.get(date)
+                        if span is not None and span[1] == position:  # extends this date's latest generation
+                            self._days[date] = (span[0], position + 1)
+            self._scanned = size
+
+    def _locations(self, positions: Iterable[int]) -> list[tuple[int, int]]:
+        """(offset, length) in ``papers.jsonl`` of the index records at ``positions``."""
+        with self.index_path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return [_STORE_RECORD.unpack_from(view, p * _STORE_RECORD.size)[3:] for p in positions]
+
+    def _read(self, fh: Any, offset: int, length: int) -> dict[str, Any]:
+        fh.seek(offset)
+        return json.loads(fh.read(length))
+
+    def dates(self) -> list[str]:
+        self._refresh()
+        return sorted(self._days)
+
+    def _load(self, fh: Any, span: tuple[int, int]) -> dict[str, Any]:
+        day_location, *paper_locations = self._locations(range(*span))
+        day = self._read(fh, *day_location)
+        papers = []
+        for offset, length in paper_locations:
+            record = self._read(fh, offset, length)
+            papers.append({k: v for k, v in record.items() if k not in ("kind", "run_date", "rank")})
+        metadata: dict[str, Any] = {}
+        for key, value in day.items():
+            if key in ("kind", "note"):
+                continue
+            metadata[key] = value
+            if key == "latest_updated":
+                metadata["papers"] = papers
+        metadata.setdefault("papers", papers)
+        metadata["note"] = day.get("note", "")
+        return metadata
+
+    def _day_record(self, fh: Any, date: str) -> dict[str, Any]:
+        return self._read(fh, *self._locations([self._days[date][0]])[0])
+
+    def load_day(self, date: str) -> dict[str, Any] | None:
+        """Return the digest metadata for ``date`` in the same shape as ``digest.json`` plus ``note``."""
+        self._refresh()
+        span = self._days.get(date)
+        if span is None:
+            return None
+        with self.data_path.open("rb") as fh:
+            return self._load(fh, span)
+
+    def find_paper(self, paper_id: str) -> list[dict[str, Any]]:
+        """Every current appearance of a paper (one per digest day), oldest first."""
+        self._refresh()
+        positions = []
+        for date, position in self._papers.get(self.paper_key(paper_id), []):
+            first, end = self._days[date]
+            if first < position < end:
+                positions.append(position)
+        with self.data_path.open("rb") as fh:
+            return [self._read(fh, offset, length) for offset, length in self._locations(positions)]
+
+    def fingerprint(self, date: str) -> str:
+        self._refresh()
+        if date not in self._days:
+            return ""
+        with self.data_path.open("rb") as fh:
+            return str(self._day_record(fh, date).get("fingerprint", ""))
+
+    def migrate(self, output_dir: Path) -> list[str]:
+        """One-time import of existing ``output/YYYY-MM-DD/digest.json`` files not yet in the store."""
+        known = set(self.dates())
+        imported = []
+        for digest_path in sorted(output_dir.glob("*/digest.json")):
+            day = digest_path.parent.name
+            if day in known or not re.fullmatch(r"\d{4}-\d{2}-\d{2}", day):
+                continue
+            try:
+                metadata = json.loads(digest_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            metadata["date"] = day
+            self.append_day(metadata)
+            imported.append(day)
+        return imported
+
+    def write_views(self, output_dir: Path, dates: Iterable[str] | None = None, update_latest: bool = True) -> list[str]:
+        """Regenerate per-day ``digest.md`` / ``index.html`` / ``digest.json`` views from the store."""
+        self._refresh()
+        wanted = sorted(self._days) if dates is None else sorted(d for d in dates if d in self._days)
+        written = []
+        for date in wanted:
+            with self.data_path.open("rb") as fh:
+                metadata = self._load(fh, self._days[date])
+            _publish_artifacts(_digest_artifacts(metadata), [output_dir / date], staging_dir=output_dir)
+            written.append(date)
+        if update_latest:
+            metadata = self.latest_published()
+            if metadata is not None:
+                _publish_artifacts(_digest_artifacts(metadata), [output_dir / "latest"], staging_dir=output_dir)
+        return written
+
+    def latest_published(self) -> dict[str, Any] | None:
+        """The newest day whose run updated ``latest`` (what the ``latest`` view shows)."""
+        self._refresh()
+        if not self._days:
+            return None
+        with self.data_path.open("rb") as fh:
+            for date in sorted(self._days, reverse=True):
+                if self._day_record(fh, date).get("latest_updated"):
+                    return self._load(fh, self._days[date])
+        return None
+
+
+_CJK_RUN_RE = re.compile(r"[㐀-䶿一-鿿豈-﫿]+")
+_LATIN_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SEARCH_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "by", "for", "from", "in", "is", "of", "on", "or", "the", "to", "we", "with",
+}
+
+
+# Maps every ASCII character outside [a-z0-9] to a space, so ASCII text tokenizes with str.split().
+_ASCII_SEPARATORS = str.maketrans({chr(c): " " for c in range(128) if not chr(c).isalnum() or chr(c).isupper()})
+
+
+def _raw_tokens(text: str) -> list[str]:
+    text = text.lower()
+    if text.isascii():
+        return text.translate(_ASCII_SEPARATORS).split()
+    tokens = _LATIN_TOKEN_RE.findall(text)
+    for run in _CJK_RUN_RE.findall(text):
+        # Chinese has no word boundaries; overlapping bigrams match any multi-character query term.
+        tokens.extend([run] if len(run) == 1 else [run[i : i + 2] for i in range(len(run) - 1)])
+    return tokens
+
+
+def _search_tokens(text: str) -> list[str]:
+    return [t for t in _raw_tokens(text) if t not in _SEARCH_STOPWORDS]
+
+
+def _token_counts(text: str) -> Counter[str]:
+    counts = Counter(_raw_tokens(text))
+    for word in _SEARCH_STOPWORDS.intersection(counts):
+        del counts[word]
+    return counts
+
+
+def _published_digests(output_dir: Path) -> Iterator[dict[str, Any]]:
+    """Every published digest, oldest first, read from the store (day views may be switched off).
+
+    Days still only present as ``output/YYYY-MM-DD/digest.json`` (before ``migrate-store``) are included too.
+    """
+    store = PaperStore(output_dir / "store")
+    stored = set(store.dates())
+    legacy = {
+        path.parent.name: path
+        for path in output_dir.glob("*/digest.json")
+        if re.fullmatch(r"\d{4}-\d{2}-\d{2}", path.parent.name) and path.parent.name not in stored
+    }
+    for day in sorted(stored | legacy.keys()):
+        if day in stored:
+            metadata = store.load_day(day)
+        else:
+            try:
+                metadata = json.loads(legacy[day].read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+        if metadata is not None:
+            metadata.setdefault("date", day)
+            yield metadata
+
+
+class SearchIndex:
+    k1 = 1.5
+    b = 0.75
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(str(path), timeout=30)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id INTEGER PRIMARY KEY, date TEXT NOT NULL, source TEXT NOT NULL, paper_id TEXT NOT NULL,
+                title TEXT NOT NULL, url TEXT NOT NULL, length INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS docs_date ON docs (date);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL, doc_id INTEGER NOT NULL, tf INTEGER NOT NULL, PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+            """
+        )
+
+    def is_empty(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM docs LIMIT 1").fetchone() is None
+
+    def index_digest(self, metadata: dict[str, Any]) -> None:
+        date = metadata["date"]
+        with self._conn:
+            self._conn.execute("DELETE FROM postings WHERE doc_id IN (SELECT doc_id FROM docs WHERE date = ?)", (date,))
+            self._conn.execute("DELETE FROM docs WHERE date = ?", (date,))
+            for p in metadata.get("papers", []):
+                fields = [p.get("title", "")] * 2 + [
+                    p.get("abstract", ""),
+                    " ".join(p.get("topics", [])),
+                    " ".join(p.get("authors", [])),
+                    p.get("summary_zh", ""),
+                ]
+                counts: dict[str, int] = {}
+                for token in _search_tokens(" ".join(fields)):
+                    counts[token] = counts.get(token, 0) + 1
+                cursor = self._conn.execute(
+                    "INSERT INTO docs (date, source, paper_id, title, url, length) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        date,
+                        p.get("source", ""),
+                        _paper_record_id(p),
+                        p.get("title", ""),
+                        p.get("doi_url") or p.get("openalex_url") or "",
+                        sum(counts.values()),
+                    ),
+                )
+                self._conn.executemany(
+                    "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                    [(term, cursor.lastrowid, tf) for term, tf in counts.items()],
+                )
+
+    def reindex(self, output_dir: Path) -> int:
+        indexed = 0
+        for metadata in _published_digests(output_dir):
+            self.index_digest(metadata)
+            indexed += 1
+        return indexed
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        date_from: str = "",
+        date_to: str = "",
+        source: str = "",
+    ) -> list[dict[str, Any]]:
+        terms = list(dict.fromkeys(_search_tokens(query)))
+        if not terms:
+            return []
+        total, avg_length = self._conn.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+        if not total:
+            return []
+        avg_length = avg_length or 1.0
+
+        clauses, params = [], []
+        if date_from:
+            clauses.append("d.date >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("d.date <= ?")
+            params.append(date_to)
+        if source:
+            clauses.append("d.source = ?")
+            params.append(source)
+        where = "".join(f" AND {clause}" for clause in clauses)
+
+        scores: dict[int, float] = {}
+        for term in terms:
+            (df,) = self._conn.execute("SELECT COUNT(*) FROM postings WHERE term = ?", (term,)).fetchone()
+            if not df:
+                continue
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            rows = self._conn.execute(
+                "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.doc_id = p.doc_id "
+                f"WHERE p.term = ?{where}",
+                (term, *params),
+            )
+            for doc_id, tf, length in rows:
+                norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        results: list[dict[str, Any]] = []
+        for doc_id, score in best:
+            date, doc_source, paper_id, title, url = self._conn.execute(
+                "SELECT date, source, paper_id, title, url FROM docs WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+            results.append(
+                {
+                    "score": round(score, 4),
+                    "date": date,
+                    "source": doc_source,
+                    "paper_id": paper_id,
+                    "title": title,
+                    "url": url,
+                }
+            )
+        return results
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class HttpCache:
+    def __init__(self, root: Path, ttl_seconds: int = 3600, replay: bool = False) -> None:
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.replay = replay
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = _sha256(url)
+        return self.root / f"{key}.json", self.root / f"{key}.body"
+
+    def load(self, url: str) -> tuple[dict[str, Any], bytes] | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or meta.get("size") != len(body):
+            return None
+        return meta, body
+
+    def is_fresh(self, meta: dict[str, Any]) -> bool:
+        return time.time() - float(meta.get("fetched_at", 0)) < self.ttl_seconds
+
+    def store(self, url: str, body: bytes, etag: str = "", last_modified: str = "") -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": len(body),
+        }
+        tmp_body = body_path.with_suffix(".body.tmp")
+        tmp_body.write_bytes(body)
+        os.replace(tmp_body, body_path)
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+
+    def refresh(self, url: str, meta: dict[str, Any], body: bytes) -> None:
+        self.store(url, body, etag=meta.get("etag", ""), last_modified=meta.get("last_modified", ""))
+
+
+def _http_get(
+    url: str,
+    timeout: int = 30,
+    cache: HttpCache | None = None,
+    client: HttpClient | None = None,
+    metrics: RunMetrics | None = None,
+    metrics_prefix: str = "http",
+) -> bytes:
+    cached = cache.load(url) if cache is not None else None
+    if cache is not None:
+        if cached is not None and (cache.replay or cache.is_fresh(cached[0])):
+            if metrics is not None:
+                metrics.incr(f"{metrics_prefix}.cache_hits")
+            return cached[1]
+        if cache.replay:
+            raise URLError(f"HTTP cache replay miss: {url}")
+
+    headers: dict[str, str] = {}
+    if cached is not None:
+        meta = cached[0]
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = (client or _http_client()).get(url, headers=headers, timeout=timeout)
+    if metrics is not None:
+        metrics.record_http(metrics_prefix, response)
+    if response.status == 304 and cache is not None and cached is not None:
+        if metrics is not None:
+            metrics.incr(f"{metrics_prefix}.cache_revalidated")
+        cache.refresh(url, cached[0], cached[1])
+        return cached[1]
+
+    if cache is not None:
+        cache.store(
+            url,
+            response.body,
+            etag=response.headers.get("etag", ""),
+            last_modified=response.headers.get("last-modified", ""),
+        )
+    return response.body
+
+
+def _openalex_item_to_paper(item: dict[str, Any]) -> Paper:
+    doi = item.get("doi") or ""
+    primary_location = item.get("primary_location") or {}
+    if not isinstance(primary_location, dict):
+        primary_location = {}
+    source = primary_location.get("source") or {}
+    if not isinstance(source, dict):
+        source = {}
+
+    authorships = item.get("authorships") or []
+    if not isinstance(authorships, list):
+        authorships = []
+
+    return Paper(
+        title=item.get("title") or "Untitled",
+        authors=[
+            a.get("author", {}).get("display_name", "")
+            for a in authorships[:5]
+            if isinstance(a, dict) and a.get("author", {}).get("display_name")
+        ],
+        venue=source.get("display_name") or "Unknown",
+        published_date=item.get("publication_date") or "",
+        doi_url=doi if doi.startswith("http") else (f"https://doi.org/{doi}" if doi else ""),
+        openalex_url=item.get("id", ""),
+        cited_by_count=item.get("cited_by_count", 0),
+        abstract=_extract_abstract(item.get("abstract_inverted_index")),
+        summary_zh="",
+        topics=_topic_names(item.get("concepts", [])),
+        source="openalex",
+    )
+
+
+_JSON_WS = " \t\n\r"
+
+
+def _iter_json_array_field(text: str, field: str, header: dict[str, Any]) -> Iterator[Any]:
+    """Yield the elements of a top-level array field one at a time.
+
+    Other top-level fields are decoded into ``header`` as they are passed, so values that
+    follow the array (e.g. ``meta``) are only complete once the iterator is exhausted.
+    Raises ``ValueError`` on malformed input, like ``json.loads``.
+    """
+    decoder = json.JSONDecoder()
+    end = len(text)
+
+    def skip(pos: int) -> int:
+        while pos < end and text[pos] in _JSON_WS:
+            pos += 1
+        return pos
+
+    def expect(pos: int, char: str) -> int:
+        pos = skip(pos)
+        if pos >= end or text[pos] != char:
+            raise ValueError(f"expected {char!r} at offset {pos}")
+        return pos + 1
+
+    pos = skip(expect(0, "{"))
+    if pos < end and text[pos] == "}":
+        return
+    while True:
+        key, pos = decoder.raw_decode(text, skip(pos))
+        pos = skip(expect(pos, ":"))
+        if key == field and pos < end and text[pos] == "[":
+            pos = skip(pos + 1)
+            if pos < end and text[pos] == "]":
+                pos += 1
+            else:
+                while True:
+                    item, pos = decoder.raw_decode(text, pos)
+                    yield item
+                    pos = skip(pos)
+                    if pos < end and text[pos] == ",":
+                        pos = skip(pos + 1)
+                        continue
+                    pos = expect(pos, "]")
+                    break
+        else:
+            header[key], pos = decoder.raw_decode(text, pos)
+        pos = skip(pos)
+        if pos < end and text[pos] == ",":
+            pos += 1
+            continue
+        expect(pos, "}")
+        return
+
+
+def _parse_openalex_page(body: bytes) -> tuple[list[Paper], dict[str, Any]]:
+    """Convert each result straight into a ``Paper`` without materializing the whole response."""
+    header: dict[str, Any] = {}
+    papers = [_openalex_item_to_paper(item) for item in _iter_json_array_field(body.decode("utf-8"), "results", header)]
+    return papers, header
+
+
+def fetch_openalex_papers(
+    date_from: dt.date,
+    date_to: dt.date,
+    per_page: int = 50,
+    max_works: int | None = None,
+    cache: HttpCache | None = None,
+    client: HttpClient | None = None,
+    metrics: RunMetrics | None = None,
+) -> Iterator[Paper]:
+    metrics = metrics or RunMetrics()
     filters = [
         f"from_publication_date:{date_from.isoformat()}",
         f"to_publication_date:{date_to.isoformat()}",
         "concepts.id:C162324750",
     ]
-    params = urlencode({"filter": ",".join(filters), "sort": "cited_by_count:desc", "per-page": per_page})
+    cursor: str | None = "*"
+    fetched = 0
+
+    while cursor:
+        page_size = per_page if max_works is None else min(per_page, max_works - fetched)
+        if page_size <= 0:
+            return
+        params = urlencode(
+            {
+                "filter": ",".join(filters),
+                "select": ",".join(OPENALEX_SELECT_FIELDS),
+                "sort": "cited_by_count:desc",
+                "per-page": page_size,
+                "cursor": cursor,
+            }
+        )
+        try:
+            with metrics.span("openalex.fetch"):
+                body = _http_get(
+                    f"{OPENALEX_URL}?{params}",
+                    timeout=30,
+                    cache=cache,
+                    client=client,
+                    metrics=metrics,
+                    metrics_prefix="openalex",
+                )
+            with metrics.span("openalex.parse"):
+                page, header = _parse_openalex_page(body)
+        except (URLError, ValueError):
+            metrics.incr("openalex.errors")
+            return
+
+        metrics.incr("openalex.works", len(page))
+        fetched += len(page)
+        yield from page
+        if not page:
+            return
+        cursor = (header.get("meta") or {}).get("next_cursor")
+
+
+_ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+_ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
+
+
+def _arxiv_entry_to_paper(entry: ET.Element, published: str) -> Paper:
+    ns = _ATOM_NS
+    title = (entry.findtext("atom:title", default="", namespaces=ns) or "").strip().replace("\n", " ")
+    abstract = (entry.findtext("atom:summary", default="", namespaces=ns) or "").strip().replace("\n", " ")
+    authors = [
+        author.findtext("atom:name", default="", namespaces=ns) or ""
+        for author in entry.findall("atom:author", ns)
+    ]
+    return Paper(
+        title=title or "Untitled",
+        authors=[a for a in authors if a][:5],
+        venue="arXiv",
+        published_date=published,
+        doi_url="",
+        openalex_url=entry.findtext("atom:id", default="", namespaces=ns) or "",
+        cited_by_count=0,
+        abstract=abstract,
+        summary_zh="",
+        topics=["Economics", "Finance"],
+        source="arxiv",
+    )
 
-    try:
-        with urlopen(f"{OPENALEX_URL}?{params}", timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8")).get("results", [])
-    except URLError:
-        return []
 
+def _parse_arxiv_page(body: bytes, target: str) -> tuple[list[Paper], int, bool]:
     papers: list[Paper] = []
-    for item in data:
-        doi = item.get("doi") or ""
-        primary_location = item.get("primary_location") or {}
-        if not isinstance(primary_location, dict):
-            primary_location = {}
-        source = primary_location.get("source") or {}
-        if not isinstance(source, dict):
-            source = {}
-
-        authorships = item.get("authorships") or []
-        if not isinstance(authorships, list):
-            authorships = []
-
-        papers.append(
-            Paper(
-                title=item.get("title") or "Untitled",
-                authors=[
-                    a.get("author", {}).get("display_name", "")
-                    for a in authorships[:5]
-                    if isinstance(a, dict) and a.get("author", {}).get("display_name")
-                ],
-                venue=source.get("display_name") or "Unknown",
-                published_date=item.get("publication_date") or "",
-                doi_url=doi if doi.startswith("http") else (f"https://doi.org/{doi}" if doi else ""),
-                openalex_url=item.get("id", ""),
-                cited_by_count=item.get("cited_by_count", 0),
-                abstract=_extract_abstract(item.get("abstract_inverted_index")),
-                summary_zh="",
-                topics=_topic_names(item.get("concepts", [])),
-                source="openalex",
-            )
+    entries = 0
+    events = ET.iterparse(io.BytesIO(body), events=("start", "end"))
+    _, root = next(events)
+    for event, elem in events:
+        if event != "end" or elem.tag != _ATOM_ENTRY:
+            continue
+        entries += 1
+        published = (elem.findtext("atom:published", default="", namespaces=_ATOM_NS) or "")[:10]
+        if published and published < target:
+            # Results are sorted by submission date, so everything after this is older too.
+            return papers, entries, True
+        if published == target:
+            papers.append(_arxiv_entry_to_paper(elem, published))
+        root.clear()
+    return papers, entries, False
+
+
+def fetch_arxiv_finance_econ_papers(
+    date_from: dt.date,
+    max_results: int = 1000,
+    page_size: int = 100,
+    cache: HttpCache | None = None,
+    client: HttpClient | None = None,
+    page_delay_seconds: float = 3.0,
+    metrics: RunMetrics | None = None,
+) -> Iterator[Paper]:
+    metrics = metrics or RunMetrics()
+    query = quote_plus("cat:q-fin.* OR cat:econ.*")
+    target = date_from.isoformat()
+    start = 0
+
+    while start < max_results:
+        if start:
+            time.sleep(page_delay_seconds)
+        size = min(page_size, max_results - start)
+        params = (
+            f"search_query={query}&start={start}&max_results={size}&sortBy=submittedDate&sortOrder=descending"
         )
-    return papers
+        try:
+            with metrics.span("arxiv.fetch"):
+                body = _http_get(
+                    f"{ARXIV_API_URL}?{params}",
+                    timeout=30,
+                    cache=cache,
+                    client=client,
+                    metrics=metrics,
+                    metrics_prefix="arxiv",
+                )
+            with metrics.span("arxiv.parse"):
+                papers, entries, reached_older = _parse_arxiv_page(body, target)
+        except (URLError, ET.ParseError, StopIteration):
+            metrics.incr("arxiv.errors")
+            return
+
+        metrics.incr("arxiv.works", len(papers))
+        yield from papers
+        if reached_older or entries < size:
+            return
+        start += entries
 
 
-def fetch_arxiv_finance_econ_papers(date_from: dt.date, max_results: int = 30) -> list[Paper]:
-    query = quote_plus("cat:q-fin.* OR cat:econ.*")
-    params = f"search_query={query}&start=0&max_results={max_results}&sortBy=submittedDate&sortOrder=descending"
+@dataclasses.dataclass
+class SourceContext:
+    config: DigestConfig
+    client: HttpClient
+    metrics: RunMetrics
+    cache: HttpCache | None = None
+
+
+@dataclasses.dataclass
+class PaperSource:
+    """A named paper feed; ``fetch`` yields ``Paper`` objects whose ``source`` equals ``name``."""
+
+    name: str
+    fetch: Callable[[dt.date, SourceContext], Iterable[Paper]]
+    deadline_seconds: float | None = None
+
+
+PAPER_SOURCES: dict[str, PaperSource] = {}
+
+
+def register_source(source: PaperSource) -> PaperSource:
+    PAPER_SOURCES[source.name] = source
+    return source
+
+
+def _fetch_openalex_source(run_date: dt.date, ctx: SourceContext) -> Iterable[Paper]:
+    return fetch_openalex_papers(
+        run_date,
+        run_date,
+        per_page=ctx.config.openalex_page_size,
+        max_works=ctx.config.openalex_max_works,
+        cache=ctx.cache,
+        client=ctx.client,
+        metrics=ctx.metrics,
+    )
+
+
+def _fetch_arxiv_source(run_date: dt.date, ctx: SourceContext) -> Iterable[Paper]:
+    return fetch_arxiv_finance_econ_papers(run_date, cache=ctx.cache, client=ctx.client, metrics=ctx.metrics)
+
+
+register_source(PaperSource("openalex", _fetch_openalex_source))
+register_source(PaperSource("arxiv", _fetch_arxiv_source))
+
+_SOURCE_DONE = object()
+
+
+class _SourceStream:
+    """Runs one source on a background thread and hands its papers over through a bounded queue.
+
+    The queue keeps the producer at most ``buffer`` papers ahead of the filter, so a source
+    still stops paging soon after the digest has enough papers.
+    """
+
+    def __init__(
+        self, source: PaperSource, run_date: dt.date, ctx: SourceContext, deadline_seconds: float, buffer: int = 64
+    ) -> None:
+        self.name = source.name
+        self.stats: dict[str, Any] = {"status": "running", "fetched": 0, "selected": 0, "seconds": 0.0, "error": ""}
+        self._metrics = ctx.metrics
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=buffer)
+        self._stop = threading.Event()
+        self._started = time.monotonic()
+        self._finished: float | None = None
+        self._deadline = self._started + deadline_seconds
+        self._thread = threading.Thread(
+            target=self._produce, args=(source, run_date, ctx), name=f"digest-source-{source.name}", daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, source: PaperSource, run_date: dt.date, ctx: SourceContext) -> None:
+        try:
+            for paper in source.fetch(run_date, ctx):
+                if not self._put(paper):
+                    return
+            self._put(_SOURCE_DONE)
+        except Exception as exc:  # a broken source must not take the others down
+            self._put(exc)
+        finally:
+            self._finished = time.monotonic()
+
+    def _finish(self, status: str, error: str = "") -> None:
+        if self.stats["status"] != "running":
+            return
+        self._stop.set()
+        self.stats["status"] = status
+        self.stats["error"] = error
+        self.stats["seconds"] = round((self._finished or time.monotonic()) - self._started, 3)
+        if status in ("timeout", "error"):
+            self._metrics.incr(f"source.{self.name}.{status}s")
+
+    def papers(self) -> Iterator[Paper]:
+        while self.stats["status"] == "running":
+            try:
+                item = self._queue.get(timeout=max(self._deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self._finish("timeout")
+                return
+            if item is _SOURCE_DONE:
+                self._finish("ok" if self.stats["fetched"] else "empty")
+                return
+            if isinstance(item, Exception):
+                self._finish("error", f"{type(item).__name__}: {item}")
+                return
+            self.stats["fetched"] += 1
+            self._metrics.incr(f"source.{self.name}.fetched")
+            yield item
+
+    def close(self, status: str = "stopped") -> None:
+        if status == "stopped" and self._finished is not None and self._queue.empty():
+            status = "ok" if self.stats["fetched"] else "empty"
+        self._finish(status)
+
+
+def _merge_sources(streams: list[_SourceStream], mode: str) -> Iterator[Paper]:
+    """Interleave sources round-robin (``merge``) or use the first non-empty one in order (``fallback``)."""
+    if mode == "fallback":
+        for position, stream in enumerate(streams):
+            papers = stream.papers()
+            first = next(papers, None)
+            if first is None:
+                continue
+            for later in streams[position + 1 :]:
+                later.close("skipped")
+            yield first
+            yield from papers
+            return
+        return
+
+    active = [stream.papers() for stream in streams]
+    while active:
+        for papers in list(active):
+            paper = next(papers, None)
+            if paper is None:
+                active.remove(papers)
+            else:
+                yield paper
+
+
+def _source_used(streams: list[_SourceStream], mode: str) -> str:
+    contributing = [stream.name for stream in streams if stream.stats["fetched"]]
+    if not contributing:
+        return "none"
+    if mode == "fallback":
+        return contributing[0] if contributing[0] == streams[0].name else f"{contributing[0]}-fallback"
+    return "+".join(contributing)
+
+
+# Don't start an LLM request with less time than this left before the summarize deadline.
+_LLM_DEADLINE_MARGIN_SECONDS = 3.0
+
+
+def _map_until(
+    fn: Callable[[Any], Any], items: Iterable[Any], workers: int, deadline: float | None
+) -> tuple[list[Any], list[Any]]:
+    """Map ``fn`` over a thread pool as ``items`` arrive; returns the items taken and their results.
+
+    At most ``2 * workers`` calls are queued at a time, so a lazy ``items`` is only pulled as fast
+    as the workers drain it. Waiting stops at ``deadline``; unfinished results come back as None.
+    """
+    workers = max(1, workers)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="digest-llm")
+    slots = threading.BoundedSemaphore(2 * workers)
+    taken: list[Any] = []
+    futures = []
     try:
-        with urlopen(f"{ARXIV_API_URL}?{params}", timeout=30) as response:
-            xml_text = response.read().decode("utf-8")
-    except URLError:
-        return []
+        for item in items:
+            slots.acquire()
+            future = pool.submit(fn, item)
+            future.add_done_callback(lambda _future: slots.release())
+            taken.append(item)
+            futures.append(future)
+        wait(futures, timeout=None if deadline is None else max(deadline - time.monotonic(), 0.0))
+    finally:
+        # Queued calls are cancelled; calls in flight end by the deadline on their bounded client.
+        pool.shutdown(wait=deadline is None, cancel_futures=True)
+    return taken, [f.result() if f.done() and not f.cancelled() else None for f in futures]
+
+
+def _apply_summaries(
+    papers: Iterable[Paper],
+    llm_cfg: LLMConfig,
+    cache: SummaryCache | None = None,
+    client: HttpClient | None = None,
+    metrics: RunMetrics | None = None,
+    deadline: float | None = None,
+    degraded: list[dict[str, Any]] | None = None,
+) -> list[Paper]:
+    """Summarize ``papers`` in place and return them as a list.
+
+    ``papers`` may be a lazy stream (e.g. papers as the filter accepts them): each paper is
+    handed to a summary worker as soon as it arrives. With a ``deadline`` (``time.monotonic()``),
+    no LLM request outlives it: papers whose request cannot start or finish in time get
+    ``_simple_zh_summary`` instead. Every paper that ends up with the simple summary although an
+    LLM is configured is appended to ``degraded``.
+    """
+    if not llm_cfg.enabled:
+        papers = list(papers)
+        for p in papers:
+            p.summary_zh = _simple_zh_summary(p.title, p.abstract, p.topics)
+        return papers
+    limiter = _RateLimiter(llm_cfg.requests_per_minute, llm_cfg.tokens_per_minute)
+    client = (client or _http_client()).bounded(deadline)
+
+    def in_time() -> bool:
+        return deadline is None or deadline - time.monotonic() >= _LLM_DEADLINE_MARGIN_SECONDS
+
+    def summarize(p: Paper) -> str | None:
+        if not in_time():
+            return None
+        return _llm_zh_summary(
+            p.title,
+            p.abstract,
+            p.topics,
+            llm_cfg,
+            limiter=limiter,
+            cache=cache,
+            paper_id=_paper_id(p),
+            client=client,
+            metrics=metrics,
+        )
 
-    root = ET.fromstring(xml_text)
-    ns = {"atom": "http://www.w3.org/2005/Atom"}
+    if llm_cfg.batch_size > 1:
+        papers, summaries = _batched_summaries(papers, llm_cfg, limiter, cache, client, metrics, deadline, in_time)
+    else:
+        papers, summaries = _map_until(summarize, papers, llm_cfg.concurrency, deadline)
 
-    papers: list[Paper] = []
-    for entry in root.findall("atom:entry", ns):
-        published = (entry.findtext("atom:published", default="", namespaces=ns) or "")[:10]
-        if published != date_from.isoformat():
+    out_of_time = deadline is not None and time.monotonic() >= deadline - _LLM_DEADLINE_MARGIN_SECONDS
+    for p, summary in zip(papers, summaries):
+        simple = _simple_zh_summary(p.title, p.abstract, p.topics)
+        p.summary_zh = summary or simple
+        if p.summary_zh != simple:
             continue
-        title = (entry.findtext("atom:title", default="", namespaces=ns) or "").strip().replace("\n", " ")
-        abstract = (entry.findtext("atom:summary", default="", namespaces=ns) or "").strip().replace("\n", " ")
-        authors = [
-            author.findtext("atom:name", default="", namespaces=ns) or ""
-            for author in entry.findall("atom:author", ns)
-        ]
-        papers.append(
-            Paper(
-                title=title or "Untitled",
-                authors=[a for a in authors if a][:5],
-                venue="arXiv",
-                published_date=published,
-                doi_url="",
-                openalex_url=entry.findtext("atom:id", default="", namespaces=ns) or "",
-                cited_by_count=0,
-                abstract=abstract,
-                summary_zh="",
-                topics=["Economics", "Finance"],
-                source="arxiv",
-            )
-        )
+        reason = "deadline" if summary is None or out_of_time else "llm_error"
+        if metrics is not None:
+            metrics.incr(f"summaries.degraded.{reason}")
+        if degraded is not None:
+            degraded.append({"title": p.title, "paper_id": _paper_id(p), "reason": reason})
     return papers
 
 
-def _apply_summaries(papers: list[Paper], llm_cfg: LLMConfig) -> list[Paper]:
-    for p in papers:
-        p.summary_zh = _llm_zh_summary(p.title, p.abstract, p.topics, llm_cfg)
-    return papers
+def _batched_summaries(
+    papers: Iterable[Paper],
+    llm_cfg: LLMConfig,
+    limiter: _RateLimiter,
+    cache: SummaryCache | None,
+    client: HttpClient | None,
+    metrics: RunMetrics | None,
+    deadline: float | None,
+    in_time: Callable[[], bool],
+) -> tuple[list[Paper], list[str | None]]:
+    taken: list[Paper] = []
+    summaries: dict[int, str] = {}
+
+    def uncached() -> Iterator[dict[str, Any]]:
+        for p in papers:
+            idx = len(taken)
+            taken.append(p)
+            key = SummaryCache.key_for(_paper_id(p), p.abstract, llm_cfg.model, _LLM_SYSTEM_PROMPT)
+            cached = cache.get(key) if cache is not None else None
+            if cached:
+                summaries[idx] = cached
+            else:
+                yield _batch_item(idx, p)
+
+    def summarize(batch: list[dict[str, Any]]) -> list[str] | None:
+        if not in_time():
+            return None
+        return _llm_zh_summaries_batch(
+            [taken[item["index"]] for item in batch], llm_cfg, limiter=limiter, cache=cache, client=client, metrics=metrics
+        )
+
+    batches = _iter_batches(uncached(), llm_cfg.batch_size, llm_cfg.batch_max_tokens)
+    for batch, results in zip(*_map_until(summarize, batches, llm_cfg.concurrency, deadline)):
+        for item, summary in zip(batch, results or []):
+            summaries[item["index"]] = summary
+    return taken, [summaries.get(idx) for idx in range(len(taken))]
+
+
+_seen_index_lock = threading.Lock()
+
+
+class SeenPaperIndex:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._first_seen: dict[str, str] = {}
+        self._pending: dict[str, str] = {}
+        # One index may be shared by concurrent backfill days.
+        self._lock = threading.RLock()
+        if path.exists():
+            self._merge_log()
+        else:
+            self._bootstrap(path.parent)
+
+    @staticmethod
+    def keys_for(paper: Paper) -> list[str]:
+        keys = [f"id:{paper.openalex_url}"] if paper.openalex_url else []
+        doi = _doi_key(paper)
+        if doi:
+            keys.append(f"doi:{doi}")
+        title = _normalize_title(paper.title)
+        if title:
+            keys.append(f"title:{title}")
+        return keys
+
+    def _remember(self, key: str, date: str) -> None:
+        known = self._first_seen.get(key)
+        if known is None or date < known:
+            self._first_seen[key] = date
+
+    def _merge_log(self) -> None:
+        with self.path.open(encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                for key in entry.get("keys", []):
+                    self._remember(key, entry.get("date", ""))
+
+    def _bootstrap(self, output_dir: Path) -> None:
+        fields = {f.name for f in dataclasses.fields(Paper)}
+        for data in _published_digests(output_dir):
+            papers = [Paper(**{k: v for k, v in raw.items() if k in fields}) for raw in data.get("papers", [])]
+            self.record(papers, data["date"])
+
+    def first_seen(self, paper: Paper) -> str:
+        with self._lock:
+            dates = [self._first_seen[key] for key in self.keys_for(paper) if key in self._first_seen]
+        return min(dates) if dates else ""
+
+    def record(self, papers: Iterable[Paper], date: str) -> None:
+        with self._lock:
+            for paper in papers:
+                for key in self.keys_for(paper):
+                    self._remember(key, date)
+                    if key not in self._pending or date < self._pending[key]:
+                        self._pending[key] = date
+
+    def save(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        by_date: dict[str, list[str]] = {}
+        for key, date in sorted(pending.items()):
+            by_date.setdefault(date, []).append(key)
+        lines = "".join(
+            json.dumps({"date": date, "keys": keys}, ensure_ascii=False) + "\n" for date, keys in sorted(by_date.items())
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _seen_index_lock, self.path.open("a", encoding="utf-8") as fh:
+            fh.write(lines)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+
+class _DateOrder:
+    """Lets concurrently built days pass one step of the run in date order.
+
+    Backfill uses it around paper selection: a day checks the shared ``SeenPaperIndex`` only
+    after every earlier day has recorded its picks, so repeats do not depend on thread timing.
+    """
+
+    def __init__(self, dates: Iterable[str]) -> None:
+        self._pending = set(dates)
+        self._cond = threading.Condition()
+
+    def wait(self, date: str) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: not any(earlier < date for earlier in self._pending))
+
+    def done(self, date: str) -> None:
+        with self._cond:
+            self._pending.discard(date)
+            self._cond.notify_all()
+
+
+def _exclude_repeats(
+    papers: Iterable[Paper], index: SeenPaperIndex, run_date: str, policy: str, repeats: list[dict[str, Any]]
+) -> Iterator[Paper]:
+    for paper in papers:
+        first_seen = index.first_seen(paper)
+        if not first_seen or first_seen >= run_date:
+            yield paper
+            continue
+        repeats.append({"title": paper.title, "paper_id": _paper_id(paper), "first_seen": first_seen})
+        if policy == "mark":
+            paper.first_seen = first_seen
+            yield paper
+
+
+def _fsync_write(path: Path, text: str) -> None:
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write(text)
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    _fsync_write(tmp_path, text)
+    os.replace(tmp_path, path)
+
+
+def _publish_artifacts(artifacts: dict[str, str], directories: list[Path], staging_dir: Path) -> None:
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    token = f"{os.getpid()}.{threading.get_ident()}"
+    staged: dict[str, Path] = {}
+    try:
+        for name, text in artifacts.items():
+            staged[name] = staging_dir / f".publish.{token}.{name}"
+            _fsync_write(staged[name], text)
+
+        # Each file is swapped in with an atomic rename; the insertion order of `artifacts`
+        # decides publish order, so callers put digest.json last as the commit marker.
+        for directory in directories:
+            directory.mkdir(parents=True, exist_ok=True)
+            for name, source in staged.items():
+                tmp_target = directory / f".{name}.{token}.tmp"
+                try:
+                    os.link(source, tmp_target)
+                except OSError:
+                    shutil.copyfile(source, tmp_target)
+                os.replace(tmp_target, directory / name)
+    finally:
+        for source in staged.values():
+            source.unlink(missing_ok=True)
+
+
+def _paper_from_dict(data: dict[str, Any]) -> Paper:
+    names = {field.name for field in dataclasses.fields(Paper)}
+    return Paper(**{k: v for k, v in data.items() if k in names})
+
+
+def _digest_artifacts(metadata: dict[str, Any], papers: list[Paper] | None = None) -> dict[str, str]:
+    """Render the per-day views; ``metadata`` may carry the page ``note``, which stays out of digest.json."""
+    note = metadata.get("note", "")
+    digest = {k: v for k, v in metadata.items() if k != "note"}
+    if papers is None:
+        papers = [_paper_from_dict(p) for p in digest.get("papers", [])]
+    # digest.json goes last: `_publish_artifacts` uses it as the commit marker.
+    return {
+        "digest.md": _render_markdown(digest["date"], papers, note=note),
+        "index.html": _render_html(digest["date"], papers, note=note),
+        "digest.json": json.dumps(digest, ensure_ascii=False, indent=2),
+    }
+
+
+# Bump whenever `_render_markdown` / `_render_html` / the digest.json layout change output.
+RENDERER_VERSION = "1"
+_FINGERPRINT_CONFIG_FIELDS = (
+    "max_papers",
+    "rank_pool_size",
+    "min_citations",
+    "topic_whitelist",
+    "topic_blacklist",
+    "min_quality_score",
+    "near_duplicate_threshold",
+    "repeat_policy",
+    "sources",
+    "source_mode",
+)
+
+
+def _digest_fingerprint(metadata: dict[str, Any], config: DigestConfig) -> str:
+    # Per-source status and timings differ on every run and are left out on purpose.
+    content = {key: value for key, value in metadata.items() if key not in ("sources", "fingerprint")}
+    settings = {
+        name: sorted(value) if isinstance(value, set) else value
+        for name, value in ((name, getattr(config, name)) for name in _FINGERPRINT_CONFIG_FIELDS)
+    }
+    payload = {"renderer": RENDERER_VERSION, "config": settings, "digest": content}
+    return _sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str))
+
+
+def _stored_fingerprint(path: Path) -> str:
+    try:
+        return str(json.loads(path.read_text(encoding="utf-8")).get("fingerprint", ""))
+    except (OSError, ValueError, AttributeError):
+        return ""
 
 
 def _load_latest_count(latest_json_path: Path) -> int:
@@ -418,56 +2791,257 @@ def _load_latest_count(latest_json_path: Path) -> int:
         return 0
 
 
-def build_digest(config: DigestConfig, llm_cfg: LLMConfig, run_date: dt.date | None = None) -> dict[str, Any]:
-    run_date = run_date or dt.date.today()
+def _counted(papers: Iterable[Paper], metrics: RunMetrics, name: str) -> Iterator[Paper]:
+    for paper in papers:
+        metrics.incr(name)
+        yield paper
 
-    primary = fetch_openalex_papers(run_date, run_date)
-    fallback = fetch_arxiv_finance_econ_papers(run_date) if not primary else []
-    source_used = "openalex" if primary else ("arxiv-fallback" if fallback else "none")
 
-    papers = (primary or fallback)
-    papers = [p for p in papers if p.source == "arxiv" or p.cited_by_count >= config.min_citations]
-    papers = _dedupe_and_filter(
-        papers,
-        topic_whitelist=config.topic_whitelist,
-        topic_blacklist=config.topic_blacklist,
-        min_quality_score=config.min_quality_score,
-    )[: config.max_papers]
-    papers = _apply_summaries(papers, llm_cfg)
+def _until_limit(papers: Iterable[Paper], limit: int, streams: list[_SourceStream]) -> Iterator[Paper]:
+    """The first ``limit`` papers; the sources stop fetching as soon as the last one is taken."""
+    try:
+        yield from itertools.islice(papers, max(limit, 0))
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+@contextlib.contextmanager
+def _run_summary_cache(
+    config: DigestConfig, llm_cfg: LLMConfig, shared: SummaryCache | None
+) -> Iterator[SummaryCache | None]:
+    """The summary cache for one run: ``shared`` if given (left open), else one opened for the run.
+
+    Hit recency and eviction are not written here: ``build_digest`` saves them through
+    ``_save_summary_usage`` only when the run publishes a changed digest.
+    """
+    if not llm_cfg.enabled:
+        yield None
+        return
+    cache = shared
+    if cache is None and llm_cfg.cache_max_entries > 0:
+        cache = SummaryCache(
+            config.output_dir / "cache" / "summaries.sqlite3",
+            max_entries=llm_cfg.cache_max_entries,
+            max_age_days=llm_cfg.cache_max_age_days,
+        )
+    try:
+        yield cache
+    finally:
+        if cache is not None and shared is None:
+            cache.close()
+
+
+def _save_summary_usage(
+    config: DigestConfig, llm_cfg: LLMConfig, shared: SummaryCache | None, used: dict[str, float]
+) -> None:
+    with _run_summary_cache(config, llm_cfg, shared) as cache:
+        if cache is not None:
+            cache.save_usage(used)
+
+
+def build_digest(
+    config: DigestConfig,
+    llm_cfg: LLMConfig,
+    run_date: dt.date | None = None,
+    client: HttpClient | None = None,
+    update_latest: bool = True,
+    summary_cache: SummaryCache | None = None,
+    seen_index: SeenPaperIndex | None = None,
+    date_order: _DateOrder | None = None,
+) -> dict[str, Any]:
+    """Build and publish one day's digest.
+
+    ``client`` and ``summary_cache`` may be shared across runs (see ``DigestService``); a
+    ``summary_cache`` passed in is left open for the caller. ``backfill`` passes one shared
+    ``seen_index`` plus a ``date_order``: concurrent days then fetch and select papers in date
+    order (repeat exclusion depends on earlier days' picks) but summarize in parallel.
+    """
+    run_date = run_date or dt.date.today()
+    client = client or _http_client()
+    unknown = [name for name in config.sources if name not in PAPER_SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown paper source(s): {', '.join(unknown)}")
+    if config.source_mode not in ("merge", "fallback"):
+        raise ValueError(f"Unknown source mode: {config.source_mode}")
+    if config.repeat_policy == "off":
+        seen_index = None
+    elif seen_index is None:
+        seen_index = SeenPaperIndex(config.output_dir / "seen_papers.jsonl")
+    ordered = date_order is not None and seen_index is not None
+    if ordered:
+        # Waiting for earlier days is not part of this run: budgets and source deadlines start after it.
+        date_order.wait(run_date.isoformat())
+    metrics = RunMetrics()
+    budget = RunBudget(config.deadline_seconds)
+
+    http_cache = HttpCache(
+        config.output_dir / "cache" / "http", ttl_seconds=config.http_cache_ttl_seconds, replay=config.http_replay
+    )
+    ctx = SourceContext(config=config, client=client.bounded(budget.deadline("fetch")), metrics=metrics, cache=http_cache)
+    streams = [
+        _SourceStream(
+            PAPER_SOURCES[name],
+            run_date,
+            ctx,
+            deadline_seconds=min(
+                PAPER_SOURCES[name].deadline_seconds or config.source_deadline_seconds, budget.left("fetch")
+            ),
+        )
+        for name in config.sources
+    ]
+    candidates: Iterable[Paper] = _merge_sources(streams, config.source_mode)
+    candidates = _counted(candidates, metrics, "papers.fetched")
+    candidates = (p for p in candidates if p.source == "arxiv" or p.cited_by_count >= config.min_citations)
+    candidates = _counted(candidates, metrics, "papers.after_min_citations")
+    duplicates: list[dict[str, Any]] = []
+    repeats: list[dict[str, Any]] = []
+    if seen_index is not None:
+        candidates = _exclude_repeats(candidates, seen_index, run_date.isoformat(), config.repeat_policy, repeats)
+    candidates = _counted(candidates, metrics, "papers.after_repeats")
+    pool_size = max(config.max_papers, config.rank_pool_size)
+    accepted = _until_limit(
+        _iter_dedupe_and_filter(
+            candidates,
+            topic_whitelist=config.topic_whitelist,
+            topic_blacklist=config.topic_blacklist,
+            min_quality_score=config.min_quality_score,
+            near_duplicate_threshold=config.near_duplicate_threshold,
+            dropped=duplicates,
+        ),
+        pool_size,
+        streams,
+    )
+    rank_pool = None
+    if config.rank_pool_size > 0:
+        # Candidates are featurized as they are accepted; only the final scoring waits for the pool.
+        rank_pool = RelevanceRanker(config.topic_whitelist | FINANCE_KEYWORDS, config.topic_whitelist).pool()
+        accepted = map(rank_pool.add, accepted)
+    # Ranking is on by default and needs the complete pool before selection. With ranking turned
+    # off (rank_pool_size=0) every accepted paper is in the digest, so it can be summarized while
+    # the sources are still fetching.
+    # Date-ordered backfill days hand over their turn before summarizing instead.
+    pipelined = llm_cfg.enabled and pool_size == config.max_papers and not ordered
+    degraded: list[dict[str, Any]] = []
+    cache_stats = {"hits": 0, "misses": 0}
+    with _run_summary_cache(config, llm_cfg, summary_cache) as cache:
+        hits_before, misses_before = (cache.hits, cache.misses) if cache is not None else (0, 0)
+        summarize = functools.partial(
+            _apply_summaries,
+            llm_cfg=llm_cfg,
+            cache=cache,
+            client=client,
+            metrics=metrics,
+            deadline=budget.deadline("summarize"),
+            degraded=degraded,
+        )
+        try:
+            if pipelined:
+                with metrics.span("filter+summarize"):
+                    pool = summarize(accepted)
+            else:
+                with metrics.span("filter"):
+                    pool = list(accepted)
+        finally:
+            for stream in streams:
+                stream.close()
+        if rank_pool is not None:
+            with metrics.span("rank"):
+                papers = rank_pool.top_k(config.max_papers)
+        else:
+            papers = pool[: config.max_papers]
+        if ordered:
+            # The selection is final: later days may now check their candidates against it.
+            seen_index.record(papers, run_date.isoformat())
+            date_order.done(run_date.isoformat())
+        if not pipelined:
+            with metrics.span("summarize"):
+                papers = summarize(papers)
+        summary_usage: dict[str, float] = {}
+        if cache is not None:
+            cache_stats = {"hits": cache.hits - hits_before, "misses": cache.misses - misses_before}
+            summary_usage = cache.take_usage()
+    source_used = _source_used(streams, config.source_mode)
+    sources = {stream.name: stream.stats for stream in streams}
+    for p in papers:
+        if p.source in sources:
+            sources[p.source]["selected"] += 1
+    considered = int(metrics.counters.get("papers.after_repeats", 0))
+    metrics.incr("papers.duplicates", len(duplicates))
+    metrics.incr("papers.irrelevant", considered - len(duplicates) - len(pool))
+    metrics.incr("papers.ranked_out", len(pool) - len(papers))
+    metrics.incr("papers.selected", len(papers))
+    metrics.incr("summary_cache.hits", cache_stats["hits"])
+    metrics.incr("summary_cache.misses", cache_stats["misses"])
 
     config.output_dir.mkdir(parents=True, exist_ok=True)
     daily_dir = config.output_dir / run_date.isoformat()
     daily_dir.mkdir(parents=True, exist_ok=True)
 
-    latest_json_path = config.output_dir / "latest" / "digest.json"
-    latest_count = _load_latest_count(latest_json_path)
-    skip_latest_update = config.keep_latest_when_empty and len(papers) == 0 and latest_count > 0
-    note = "今日抓取结果为空，已保留上一期 latest 内容，避免覆盖有效日报。" if skip_latest_update else ""
+    store = PaperStore(config.output_dir / "store")
+    if config.day_views:
+        latest_count = _load_latest_count(config.output_dir / "latest" / "digest.json")
+    else:
+        latest_count = int((store.latest_published() or {}).get("count", 0))
+    skip_latest_update = not update_latest or (
+        config.keep_latest_when_empty and len(papers) == 0 and latest_count > 0
+    )
+    note = "今日抓取结果为空，已保留上一期 latest 内容，避免覆盖有效日报。" if skip_latest_update and update_latest else ""
 
     metadata = {
         "date": run_date.isoformat(),
         "count": len(papers),
         "source_used": source_used,
+        "sources": sources,
         "latest_updated": not skip_latest_update,
         "papers": [dataclasses.asdict(p) for p in papers],
+        "duplicates": duplicates,
+        "repeats": repeats,
+        "degraded": degraded,
     }
 
+    metadata["fingerprint"] = _digest_fingerprint(metadata, config)
+    latest_dir = config.output_dir / "latest"
+    targets = [daily_dir] if skip_latest_update else [daily_dir, latest_dir]
+    if not config.day_views:
+        targets = []
+    unchanged = store.fingerprint(run_date.isoformat()) == metadata["fingerprint"] and all(
+        _stored_fingerprint(d / "digest.json") == metadata["fingerprint"] for d in targets
+    )
+    latest_updated = not skip_latest_update
+
     json_path = daily_dir / "digest.json"
     md_path = daily_dir / "digest.md"
     html_path = daily_dir / "index.html"
 
-    json_path.write_text(json.dumps(metadata, ensure_ascii=False, indent=2), encoding="utf-8")
-    md_path.write_text(_render_markdown(run_date.isoformat(), papers, note=note), encoding="utf-8")
-    html_path.write_text(_render_html(run_date.isoformat(), papers, note=note), encoding="utf-8")
-
-    latest_updated = False
-    latest_dir = config.output_dir / "latest"
-    latest_dir.mkdir(parents=True, exist_ok=True)
-    if not skip_latest_update:
-        (latest_dir / "digest.json").write_text(json.dumps(metadata, ensure_ascii=False, indent=2), encoding="utf-8")
-        (latest_dir / "digest.md").write_text(_render_markdown(run_date.isoformat(), papers), encoding="utf-8")
-        (latest_dir / "index.html").write_text(_render_html(run_date.isoformat(), papers), encoding="utf-8")
-        latest_updated = True
+    if unchanged:
+        # Same papers, summaries, config and renderer as the published digest: keep every file as is.
+        metrics.incr("digest.unchanged")
+    else:
+        with metrics.span("write"):
+            store.append_day(metadata, note=note)
+            # The summary cache is committed with output/, so it only changes alongside the digest.
+            _save_summary_usage(config, llm_cfg, summary_cache, summary_usage)
+        if targets:
+            with metrics.span("render"):
+                artifacts = _digest_artifacts({**metadata, "note": note}, papers)
+            with metrics.span("write"):
+                _publish_artifacts(artifacts, targets, staging_dir=config.output_dir)
+
+        with metrics.span("index"):
+            if seen_index is not None:
+                seen_index.record(papers, run_date.isoformat())
+                seen_index.save()
+            DigestArchive(config.output_dir).record(metadata)
+            # The index is a git-ignored cache: keep an existing one current, but leave building it from
+            # scratch to the first `search` (fresh CI checkouts would otherwise reindex all history).
+            search_path = config.output_dir / "archive" / "fulltext.sqlite3"
+            if search_path.exists():
+                search_index = SearchIndex(search_path)
+                try:
+                    search_index.index_digest(metadata)
+                finally:
+                    search_index.close()
 
     if len(papers) == 0:
         alerts_dir = config.output_dir / "alerts"
@@ -478,7 +3052,14 @@ def build_digest(config: DigestConfig, llm_cfg: LLMConfig, run_date: dt.date | N
             "message": "No papers fetched for this run. latest preserved if previous digest exists.",
             "source_used": source_used,
         }
-        (alerts_dir / f"{run_date.isoformat()}.json").write_text(json.dumps(alert, ensure_ascii=False, indent=2), encoding="utf-8")
+        _atomic_write(alerts_dir / f"{run_date.isoformat()}.json", json.dumps(alert, ensure_ascii=False, indent=2))
+
+    metrics_path = daily_dir / "metrics.json"
+    if not unchanged or not metrics_path.exists():
+        _atomic_write(metrics_path, json.dumps({"date": run_date.isoformat(), **metrics.as_dict()}, indent=2))
+    if config.prometheus_textfile is not None:
+        config.prometheus_textfile.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(config.prometheus_textfile, metrics.prometheus_text(run_date.isoformat()))
 
     return {
         "json": json_path,
@@ -487,16 +3068,372 @@ def build_digest(config: DigestConfig, llm_cfg: LLMConfig, run_date: dt.date | N
         "count": len(papers),
         "latest_updated": latest_updated,
         "source_used": source_used,
+        "sources": sources,
+        "summary_cache": cache_stats,
+        "metrics": metrics_path,
+        "unchanged": unchanged,
     }
 
 
-def main() -> None:
+def _load_backfill_checkpoint(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"completed": {}}
+    if not isinstance(data.get("completed"), dict):
+        data["completed"] = {}
+    return data
+
+
+def backfill(
+    config: DigestConfig,
+    llm_cfg: LLMConfig,
+    date_from: dt.date,
+    date_to: dt.date,
+    workers: int = 4,
+    client: HttpClient | None = None,
+    resume: bool = True,
+) -> dict[str, dict[str, Any]]:
+    if date_to < date_from:
+        raise ValueError(f"backfill range is empty: {date_from} > {date_to}")
+    client = client or _http_client()
+    config.output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = config.output_dir / "backfill_checkpoint.json"
+    checkpoint = _load_backfill_checkpoint(checkpoint_path) if resume else {"completed": {}}
+    completed: dict[str, Any] = checkpoint["completed"]
+
+    days = [date_from + dt.timedelta(days=offset) for offset in range((date_to - date_from).days + 1)]
+    pending = [day for day in days if day.isoformat() not in completed]
+    results: dict[str, dict[str, Any]] = {}
+    pool_size = max(1, min(workers, len(pending)))
+    seen_index = SeenPaperIndex(config.output_dir / "seen_papers.jsonl") if config.repeat_policy != "off" else None
+    # Days are submitted in date order, so a day waiting for its turn only waits on days already running.
+    date_order = _DateOrder(day.isoformat() for day in pending) if seen_index is not None else None
+
+    def build_day(day: dt.date) -> dict[str, Any]:
+        try:
+            return build_digest(
+                config,
+                llm_cfg,
+                run_date=day,
+                client=client,
+                update_latest=day == date_to,
+                seen_index=seen_index,
+                date_order=date_order,
+            )
+        finally:
+            # A day that fails before its turn must not hold up the later ones.
+            if date_order is not None:
+                date_order.done(day.isoformat())
+
+    with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="digest-day") as pool:
+        futures = {pool.submit(build_day, day): day for day in pending}
+        failures: dict[str, BaseException] = {}
+        for future in as_completed(futures):
+            day = futures[future].isoformat()
+            try:
+                result = future.result()
+            except Exception as exc:
+                failures[day] = exc
+                continue
+            results[day] = result
+            completed[day] = {"count": result["count"], "source_used": result["source_used"]}
+            _atomic_write(checkpoint_path, json.dumps(checkpoint, ensure_ascii=False, indent=2))
+    if failures:
+        first = min(failures)
+        raise RuntimeError(
+            f"backfill failed for {len(failures)} day(s): {', '.join(sorted(failures))}; "
+            f"first error ({first}): {failures[first]}"
+        ) from failures[first]
+    return results
+
+
+def _utc_timestamp(epoch: float | None = None) -> str:
+    moment = dt.datetime.fromtimestamp(time.time() if epoch is None else epoch, dt.timezone.utc)
+    return moment.isoformat(timespec="seconds")
+
+
+_SERVED_FILES = {
+    "index.html": "text/html; charset=utf-8",
+    "digest.md": "text/markdown; charset=utf-8",
+    "digest.json": "application/json; charset=utf-8",
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class _ServedFile:
+    body: bytes
+    gzipped: bytes
+    etag: str
+    content_type: str
+
+    @classmethod
+    def from_text(cls, text: str, content_type: str) -> _ServedFile:
+        body = text.encode("utf-8")
+        return cls(body, gzip.compress(body, compresslevel=6), f'"{_sha256(text)[:32]}"', content_type)
+
+
+class DigestService:
+    """Resident digest builder: rebuilds on an internal schedule and serves the store over HTTP.
+
+    The ``HttpClient`` keep-alive pool, the ``SummaryCache`` connection and the process-wide
+    keyword matchers stay warm between runs. Rendered views are cached in memory per store
+    generation (the index size, which grows with every published run), so repeated requests cost
+    a dict lookup; a rebuild is queued with ``trigger`` and runs on the scheduler thread.
+    """
+
+    def __init__(
+        self,
+        config: DigestConfig,
+        llm_cfg: LLMConfig,
+        client: HttpClient | None = None,
+        interval_seconds: float = 3600.0,
+    ) -> None:
+        self.config = config
+        self.llm_cfg = llm_cfg
+        self.client = client or HttpClient()
+        self.interval_seconds = interval_seconds
+        self.store = PaperStore(config.output_dir / "store")
+        self.summary_cache: SummaryCache | None = None
+        if llm_cfg.enabled and llm_cfg.cache_max_entries > 0:
+            self.summary_cache = SummaryCache(
+                config.output_dir / "cache" / "summaries.sqlite3",
+                max_entries=llm_cfg.cache_max_entries,
+                max_age_days=llm_cfg.cache_max_age_days,
+            )
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._requested: deque[dt.date | None] = deque()
+        self._files: dict[tuple[str, str], _ServedFile] = {}
+        self._files_generation = -1
+        self._thread: threading.Thread | None = None
+        self.status: dict[str, Any] = {
+            "runs": 0,
+            "running": False,
+            "interval_seconds": interval_seconds,
+            "next_run": None,
+            "last_started": None,
+            "last_finished": None,
+            "last_result": None,
+            "last_error": "",
+        }
+
+    def rebuild(self, run_date: dt.date | None = None) -> dict[str, Any]:
+        """Build one digest synchronously with the warm client and caches."""
+        with self._lock:
+            self.status["running"] = True
+            self.status["last_started"] = _utc_timestamp()
+        try:
+            result = build_digest(
+                self.config, self.llm_cfg, run_date=run_date, client=self.client, summary_cache=self.summary_cache
+            )
+        except Exception as exc:
+            with self._lock:
+                self.status.update(running=False, last_finished=_utc_timestamp(), last_error=f"{type(exc).__name__}: {exc}")
+            raise
+        summary = {
+            "date": result["json"].parent.name,
+            "count": result["count"],
+            "source_used": result["source_used"],
+            "latest_updated": result["latest_updated"],
+            "unchanged": result["unchanged"],
+        }
+        with self._lock:
+            self.status["runs"] += 1
+            self.status.update(running=False, last_finished=_utc_timestamp(), last_result=summary, last_error="")
+        return result
+
+    def trigger(self, run_date: dt.date | None = None) -> bool:
+        """Queue a rebuild for the scheduler thread; False if the same day is already queued."""
+        with self._lock:
+            if run_date in self._requested:
+                return False
+            self._requested.append(run_date)
+        self._wake.set()
+        return True
+
+    def start(self, build_now: bool = True) -> DigestService:
+        self._thread = threading.Thread(target=self._run_schedule, args=(build_now,), name="digest-schedule", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.summary_cache is not None:
+            self.summary_cache.close()
+        self.client.close()
+
+    def _run_schedule(self, build_now: bool) -> None:
+        next_run = time.time() if build_now else self._next_scheduled_run()
+        while not self._stop.is_set():
+            with self._lock:
+                self.status["next_run"] = _utc_timestamp(next_run) if next_run is not None else None
+            self._wake.wait(None if next_run is None else max(0.0, next_run - time.time()))
+            with self._lock:
+                self._wake.clear()
+                pending = list(self._requested)
+                self._requested.clear()
+            if next_run is not None and time.time() >= next_run:
+                next_run = self._next_scheduled_run()
+                if None not in pending:
+                    pending.insert(0, None)
+            for run_date in pending:
+                if self._stop.is_set():
+                    return
+                try:
+                    self.rebuild(run_date)
+                except Exception:
+                    pass  # Recorded in `status["last_error"]`; the next scheduled run tries again.
+
+    def _next_scheduled_run(self) -> float | None:
+        return time.time() + self.interval_seconds if self.interval_seconds > 0 else None
+
+    def served_file(self, day: str, name: str) -> _ServedFile | None:
+        """A rendered view of ``day`` (a date or ``latest``) straight from the store, cached in memory."""
+        try:
+            generation = self.store.index_path.stat().st_size
+        except OSError:
+            return None
+        with self._lock:
+            if generation != self._files_generation:
+                self._files = {}
+                self._files_generation = generation
+            cached = self._files.get((day, name))
+        if cached is not None:
+            return cached
+        metadata = self.store.latest_published() if day == "latest" else self.store.load_day(day)
+        if metadata is None:
+            return None
+        rendered = {
+            key: _ServedFile.from_text(text, _SERVED_FILES[key]) for key, text in _digest_artifacts(metadata).items()
+        }
+        with self._lock:
+            if generation == self._files_generation:
+                self._files.update({(day, key): served for key, served in rendered.items()})
+        return rendered.get(name)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {**self.status, "queued": [d.isoformat() if d else "today" for d in self._requested]}
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            quality = params.strip().lower().removeprefix("q=")
+            return not params.strip() or not re.fullmatch(r"0(\.0*)?", quality)
+    return False
+
+
+class _DigestRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: DigestServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._dispatch()
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        self._dispatch()
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        parts = urlsplit(self.path)
+        if parts.path.rstrip("/") != "/rebuild":
+            self._send_json(404, {"error": "not found"})
+            return
+        raw = parse_qs(parts.query).get("date", [""])[0]
+        try:
+            run_date = dt.date.fromisoformat(raw) if raw else None
+        except ValueError:
+            self._send_json(400, {"error": f"invalid date: {raw}"})
+            return
+        queued = self.server.service.trigger(run_date)
+        self._send_json(202, {"queued": queued, "date": raw or "today"})
+
+    def _dispatch(self) -> None:
+        service = self.server.service
+        path = urlsplit(self.path).path.strip("/") or "latest"
+        if path == "status":
+            self._send_json(200, service.snapshot())
+            return
+        if path == "digests":
+            latest = service.store.latest_published()
+            self._send_json(200, {"dates": service.store.dates(), "latest": latest["date"] if latest else None})
+            return
+        day, _, name = path.partition("/")
+        name = name or "index.html"
+        if name not in _SERVED_FILES or (day != "latest" and not re.fullmatch(r"\d{4}-\d{2}-\d{2}", day)):
+            self._send_json(404, {"error": "not found"})
+            return
+        served = service.served_file(day, name)
+        if served is None:
+            self._send_json(404, {"error": f"no digest for {day}"})
+            return
+        # `latest` moves with every published run; dated digests only change on a rerun of that day.
+        self._send_file(served, "no-cache" if day == "latest" else "public, max-age=300")
+
+    def _send_file(self, served: _ServedFile, cache_control: str) -> None:
+        use_gzip = _accepts_gzip(self.headers.get("Accept-Encoding") or "")
+        # Each content coding is its own representation and needs its own strong validator.
+        etag = f'{served.etag[:-1]}-gzip"' if use_gzip else served.etag
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        candidates = {tag.strip().removeprefix("W/") for tag in (self.headers.get("If-None-Match") or "").split(",")}
+        if "*" in candidates or served.etag in candidates or etag in candidates:
+            self._send(304, b"", served.content_type, headers)
+            return
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+        self._send(200, served.gzipped if use_gzip else served.body, served.content_type, headers)
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8", {"Cache-Control": "no-store"})
+
+    def _send(self, status: int, payload: bytes, content_type: str, headers: dict[str, str]) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if status != 304:
+            self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD" and status != 304:
+            self.wfile.write(payload)
+
+
+class DigestServer(ThreadingHTTPServer):
+    """Local HTTP API over a ``DigestService``.
+
+    ``GET /latest/``, ``/YYYY-MM-DD/`` (``index.html``, ``digest.md``, ``digest.json``) with ETag and
+    gzip; ``GET /digests`` and ``/status`` as JSON; ``POST /rebuild[?date=YYYY-MM-DD]`` queues a run.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, service: DigestService, host: str = "127.0.0.1", port: int = 8080) -> None:
+        super().__init__((host, port), _DigestRequestHandler)
+        self.service = service
+
+
+def _config_from_env() -> tuple[DigestConfig, LLMConfig]:
+    prometheus_textfile = os.getenv("DIGEST_PROMETHEUS_TEXTFILE", "").strip()
     whitelist = {
         x.strip().lower() for x in os.getenv("DIGEST_TOPIC_WHITELIST", "").split(",") if x.strip()
     } or set(FINANCE_KEYWORDS)
     blacklist = {
         x.strip().lower() for x in os.getenv("DIGEST_TOPIC_BLACKLIST", "").split(",") if x.strip()
     } or set(SPAM_TERMS)
+    sources = tuple(x.strip() for x in os.getenv("DIGEST_SOURCES", "openalex,arxiv").split(",") if x.strip())
 
     config = DigestConfig(
         max_papers=int(os.getenv("DIGEST_MAX_PAPERS", "12")),
@@ -506,20 +3443,146 @@ def main() -> None:
         topic_whitelist=whitelist,
         topic_blacklist=blacklist,
         min_quality_score=int(os.getenv("DIGEST_MIN_QUALITY_SCORE", "2")),
+        openalex_page_size=int(os.getenv("DIGEST_OPENALEX_PAGE_SIZE", "50")),
+        openalex_max_works=int(os.getenv("DIGEST_OPENALEX_MAX_WORKS", "1000")),
+        near_duplicate_threshold=float(os.getenv("DIGEST_NEAR_DUPLICATE_THRESHOLD", "0.8")),
+        repeat_policy=os.getenv("DIGEST_REPEAT_POLICY", "exclude"),
+        http_cache_ttl_seconds=int(os.getenv("DIGEST_HTTP_CACHE_TTL_SECONDS", "3600")),
+        http_replay=os.getenv("DIGEST_HTTP_REPLAY", "0") == "1",
+        prometheus_textfile=Path(prometheus_textfile) if prometheus_textfile else None,
+        sources=sources or ("openalex", "arxiv"),
+        source_mode=os.getenv("DIGEST_SOURCE_MODE", "merge"),
+        source_deadline_seconds=float(os.getenv("DIGEST_SOURCE_DEADLINE_SECONDS", "120")),
+        day_views=os.getenv("DIGEST_DAY_VIEWS", "1") == "1",
+        rank_pool_size=int(os.getenv("DIGEST_RANK_POOL_SIZE", "200")),
+        deadline_seconds=float(os.getenv("DIGEST_DEADLINE_SECONDS", "0")),
     )
     llm_cfg = LLMConfig(
         api_base=os.getenv("LLM_API_BASE", ""),
         api_key=os.getenv("LLM_API_KEY", ""),
         model=os.getenv("LLM_MODEL", ""),
         timeout_seconds=int(os.getenv("LLM_TIMEOUT_SECONDS", "30")),
+        concurrency=int(os.getenv("LLM_CONCURRENCY", "4")),
+        requests_per_minute=int(os.getenv("LLM_REQUESTS_PER_MINUTE", "0")),
+        tokens_per_minute=int(os.getenv("LLM_TOKENS_PER_MINUTE", "0")),
+        cache_max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")),
+        cache_max_age_days=int(os.getenv("LLM_CACHE_MAX_AGE_DAYS", "90")),
+        batch_size=int(os.getenv("LLM_BATCH_SIZE", "1")),
+        batch_max_tokens=int(os.getenv("LLM_BATCH_MAX_TOKENS", "6000")),
+        batch_retry_invalid=os.getenv("LLM_BATCH_RETRY_INVALID", "1") == "1",
+    )
+    return config, llm_cfg
+
+
+def _client_from_env() -> HttpClient:
+    return HttpClient(
+        max_retries=int(os.getenv("DIGEST_HTTP_RETRIES", "3")),
+        max_per_host=int(os.getenv("DIGEST_HTTP_MAX_PER_HOST", "8")),
     )
 
-    result = build_digest(config, llm_cfg=llm_cfg)
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Finance & Economics Daily Digest")
+    commands = parser.add_subparsers(dest="command")
+    backfill_parser = commands.add_parser("backfill", help="build digests for every day in a date range")
+    backfill_parser.add_argument("start", type=dt.date.fromisoformat, help="first day (YYYY-MM-DD)")
+    backfill_parser.add_argument("end", type=dt.date.fromisoformat, help="last day (YYYY-MM-DD), updates latest")
+    backfill_parser.add_argument("--workers", type=int, default=int(os.getenv("DIGEST_BACKFILL_WORKERS", "4")))
+    backfill_parser.add_argument("--no-resume", action="store_true", help="ignore the backfill checkpoint")
+    search_parser = commands.add_parser("search", help="full-text search over published digests (BM25)")
+    search_parser.add_argument("query", nargs="?", default="")
+    search_parser.add_argument("--from", dest="date_from", default="", help="earliest digest date (YYYY-MM-DD)")
+    search_parser.add_argument("--to", dest="date_to", default="", help="latest digest date (YYYY-MM-DD)")
+    search_parser.add_argument("--source", default="", help="openalex or arxiv")
+    search_parser.add_argument("--limit", type=int, default=10)
+    search_parser.add_argument("--reindex", action="store_true", help="rebuild the index from the paper store")
+    commands.add_parser("migrate-store", help="import existing output/*/digest.json into the consolidated store")
+    views_parser = commands.add_parser("views", help="regenerate per-day digest files from the consolidated store")
+    views_parser.add_argument("dates", nargs="*", help="days to render (YYYY-MM-DD); default all")
+    views_parser.add_argument("--no-latest", action="store_true", help="leave output/latest untouched")
+    serve_parser = commands.add_parser("serve", help="stay resident: rebuild on a schedule and serve digests over HTTP")
+    serve_parser.add_argument("--host", default=os.getenv("DIGEST_SERVE_HOST", "127.0.0.1"))
+    serve_parser.add_argument("--port", type=int, default=int(os.getenv("DIGEST_SERVE_PORT", "8080")))
+    serve_parser.add_argument(
+        "--interval",
+        type=float,
+        default=float(os.getenv("DIGEST_SERVE_INTERVAL_SECONDS", "3600")),
+        help="seconds between scheduled rebuilds; 0 rebuilds only on POST /rebuild",
+    )
+    serve_parser.add_argument("--no-initial-build", action="store_true", help="wait for the first scheduled run")
+    args = parser.parse_args(argv)
+
+    if args.command in ("migrate-store", "views"):
+        output_dir = Path(os.getenv("DIGEST_OUTPUT_DIR", "output"))
+        store = PaperStore(output_dir / "store")
+        if args.command == "migrate-store":
+            imported = store.migrate(output_dir)
+            print(f"Imported {len(imported)} digest(s) into {store.data_path}")
+        else:
+            written = store.write_views(output_dir, args.dates or None, update_latest=not args.no_latest)
+            print(f"Rendered {len(written)} day view(s) from {store.data_path}")
+        return
+
+    if args.command == "search":
+        output_dir = Path(os.getenv("DIGEST_OUTPUT_DIR", "output"))
+        index = SearchIndex(output_dir / "archive" / "fulltext.sqlite3")
+        try:
+            if args.reindex or index.is_empty():
+                print(f"Indexed {index.reindex(output_dir)} digest(s)")
+            started = time.perf_counter()
+            hits = index.search(
+                args.query, limit=args.limit, date_from=args.date_from, date_to=args.date_to, source=args.source
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        finally:
+            index.close()
+        for hit in hits:
+            print(f"{hit['score']:>8.3f}  {hit['date']}  [{hit['source']}] {hit['title']}  {hit['url']}")
+        print(f"{len(hits)} result(s) in {elapsed_ms:.1f} ms")
+        return
+
+    config, llm_cfg = _config_from_env()
+    if args.command == "serve":
+        service = DigestService(config, llm_cfg, client=_client_from_env(), interval_seconds=args.interval)
+        server = DigestServer(service, args.host, args.port)
+        # SIGTERM (service managers, `docker stop`) stops serving like Ctrl-C; shutdown() must run off this thread.
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+        service.start(build_now=not args.no_initial_build)
+        print(f"Serving {config.output_dir} on http://{args.host}:{server.server_address[1]} | interval={args.interval:g}s")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.stop()
+        return
+
+    client = _client_from_env()
+    try:
+        if args.command == "backfill":
+            results = backfill(
+                config,
+                llm_cfg,
+                args.start,
+                args.end,
+                workers=args.workers,
+                client=client,
+                resume=not args.no_resume,
+            )
+            for day in sorted(results):
+                print(f"Backfilled {day}: count={results[day]['count']} | source={results[day]['source_used']}")
+            print(f"Backfill finished: {len(results)} day(s) built between {args.start} and {args.end}")
+            return
+        result = build_digest(config, llm_cfg=llm_cfg, client=client)
+    finally:
+        client.close()
     if result["count"] == 0:
         print("::warning::No papers generated for today.")
     print(
         f"Generated digest: {result['markdown']} | count={result['count']} | "
         f"source={result['source_used']} | latest_updated={result['latest_updated']}"
+        + (" | unchanged" if result["unchanged"] else "")
     )
 
 
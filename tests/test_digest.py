@@ -1,10 +1,28 @@
+import dataclasses
 import datetime as dt
 import json
+import sqlite3
 from pathlib import Path
 
+import pytest
+
 from src.digest import DigestConfig, LLMConfig, Paper, _extract_abstract, _simple_zh_summary, build_digest
 
 
+def _patch_http(monkeypatch, handler):
+    from src import digest as d
+
+    def fake_request(self, method, url, body=None, headers=None, timeout=None):
+        result = handler(method, url, body, headers or {})
+        if isinstance(result, d.HttpResponse):
+            return result
+        if not isinstance(result, bytes):
+            result = json.dumps(result).encode("utf-8")
+        return d.HttpResponse(status=200, headers={}, body=result)
+
+    monkeypatch.setattr(d.HttpClient, "request", fake_request)
+
+
 def test_extract_abstract_rebuilds_word_order():
     indexed = {"InvertedIndex": {"hello": [0], "world": [1], "finance": [2]}}
     assert _extract_abstract(indexed) == "hello world finance"
@@ -71,39 +89,81 @@ def test_keep_latest_when_empty(monkeypatch, tmp_path: Path):
 def test_fetch_openalex_handles_null_primary_location(monkeypatch):
     from src import digest as d
 
-    class DummyResponse:
-        def __enter__(self):
-            return self
-
-        def __exit__(self, exc_type, exc, tb):
-            return False
-
-        def read(self):
-            payload = {
-                "results": [
-                    {
-                        "title": "Test Paper",
-                        "authorships": [{"author": {"display_name": "Alice"}}],
-                        "primary_location": None,
-                        "publication_date": "2026-01-01",
-                        "doi": "10.1000/test",
-                        "id": "https://openalex.org/W1",
-                        "cited_by_count": 5,
-                        "abstract_inverted_index": None,
-                        "concepts": [],
-                    }
-                ]
+    payload = {
+        "results": [
+            {
+                "title": "Test Paper",
+                "authorships": [{"author": {"display_name": "Alice"}}],
+                "primary_location": None,
+                "publication_date": "2026-01-01",
+                "doi": "10.1000/test",
+                "id": "https://openalex.org/W1",
+                "cited_by_count": 5,
+                "abstract_inverted_index": None,
+                "concepts": [],
             }
-            return json.dumps(payload).encode("utf-8")
+        ]
+    }
 
-    monkeypatch.setattr(d, "urlopen", lambda *args, **kwargs: DummyResponse())
-    papers = d.fetch_openalex_papers(dt.date(2026, 1, 1), dt.date(2026, 1, 1))
+    _patch_http(monkeypatch, lambda *_args: payload)
+    papers = list(d.fetch_openalex_papers(dt.date(2026, 1, 1), dt.date(2026, 1, 1)))
 
     assert len(papers) == 1
     assert papers[0].venue == "Unknown"
     assert papers[0].authors == ["Alice"]
 
 
+def _openalex_work(idx: int) -> dict:
+    return {
+        "title": f"Bank credit risk study {idx}",
+        "authorships": [],
+        "primary_location": None,
+        "publication_date": "2026-03-05",
+        "doi": "",
+        "id": f"https://openalex.org/W{idx}",
+        "cited_by_count": 0,
+        "abstract_inverted_index": None,
+        "concepts": [{"display_name": "Finance"}],
+    }
+
+
+def test_fetch_openalex_follows_cursor_lazily(monkeypatch):
+    from urllib.parse import parse_qs, urlparse
+
+    from src import digest as d
+
+    requested: list[dict] = []
+
+    def fake_get(method, url, body, headers):
+        query = parse_qs(urlparse(url).query)
+        requested.append(query)
+        page = {"*": 0, "c1": 1, "c2": 2}[query["cursor"][0]]
+        next_cursor = {0: "c1", 1: "c2", 2: None}[page]
+        size = int(query["per-page"][0])
+        results = [_openalex_work(page * 10 + i) for i in range(size)]
+        return {"meta": {"next_cursor": next_cursor}, "results": results}
+
+    _patch_http(monkeypatch, fake_get)
+
+    papers = list(d.fetch_openalex_papers(dt.date(2026, 3, 5), dt.date(2026, 3, 5), per_page=2, max_works=5))
+    assert [p.openalex_url for p in papers] == [
+        "https://openalex.org/W0",
+        "https://openalex.org/W1",
+        "https://openalex.org/W10",
+        "https://openalex.org/W11",
+        "https://openalex.org/W20",
+    ]
+    assert [q["per-page"][0] for q in requested] == ["2", "2", "1"]
+
+    requested.clear()
+    stream = d.fetch_openalex_papers(dt.date(2026, 3, 5), dt.date(2026, 3, 5), per_page=2)
+    selected = d._dedupe_and_filter(
+        stream, topic_whitelist={"credit", "bank"}, topic_blacklist=set(), min_quality_score=2, limit=3
+    )
+    assert len(selected) == 3
+    assert len(requested) == 2
+
+
 def test_dedupe_and_relevance_filter_removes_noise():
     from src.digest import _dedupe_and_filter
 
@@ -220,3 +280,1259 @@ def test_relevance_filter_respects_custom_whitelist_threshold(monkeypatch, tmp_p
     )
     relaxed_result = build_digest(relaxed_cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
     assert relaxed_result["count"] == 1
+
+
+def test_apply_summaries_runs_concurrently_and_keeps_order(monkeypatch):
+    import threading
+    import time
+
+    from src import digest as d
+
+    barrier = threading.Barrier(4, timeout=5)
+
+    def fake_post(method, url, body, headers):
+        title = json.loads(json.loads(body)["messages"][1]["content"])["title"]
+        barrier.wait()
+        time.sleep(0.05)
+        if title == "P2":
+            raise OSError("boom")
+        return {"choices": [{"message": {"content": f"summary of {title}"}}]}
+
+    _patch_http(monkeypatch, fake_post)
+    papers = [
+        Paper(f"P{i}", [], "V", "2026-03-05", "", f"https://openalex.org/W{i}", 0, "Risk.", "", ["Finance"])
+        for i in range(4)
+    ]
+    cfg = LLMConfig(api_base="http://llm.local/v1", api_key="k", model="m", concurrency=4)
+
+    d._apply_summaries(papers, cfg)
+
+    assert [p.summary_zh for p in papers[:2]] == ["summary of P0", "summary of P1"]
+    assert papers[2].summary_zh.startswith("研究主题：P2")
+    assert papers[3].summary_zh == "summary of P3"
+
+
+def test_rate_limiter_waits_for_token_budget(monkeypatch):
+    from src import digest as d
+
+    clock = {"now": 0.0}
+    sleeps: list[float] = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock["now"] += seconds
+
+    monkeypatch.setattr(d.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(d.time, "sleep", fake_sleep)
+
+    limiter = d._RateLimiter(requests_per_minute=120, tokens_per_minute=600)
+    limiter.acquire(600)
+    assert sleeps == []
+    limiter.acquire(60)
+    assert sleeps and abs(sum(sleeps) - 6.0) < 1e-6
+
+
+def test_summary_cache_skips_repeat_llm_calls(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    calls: list[str] = []
+
+    def fake_post(method, url, body, headers):
+        calls.append(url)
+        return {"choices": [{"message": {"content": "缓存摘要"}}]}
+
+    _patch_http(monkeypatch, fake_post)
+    paper = Paper("Credit risk", [], "V", "2026-03-05", "", "https://openalex.org/W1", 0, "Risk.", "", ["Finance"])
+    monkeypatch.setattr(d, "fetch_openalex_papers", lambda *_args, **_kwargs: [dataclasses.replace(paper)])
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+
+    cfg = DigestConfig(output_dir=tmp_path / "out")
+    llm = LLMConfig(api_base="http://llm.local/v1", api_key="k", model="m")
+    cache_path = cfg.output_dir / "cache" / "summaries.sqlite3"
+    first = build_digest(cfg, llm_cfg=llm, run_date=dt.date(2026, 3, 5))
+    cache_bytes = cache_path.read_bytes()
+    second = build_digest(cfg, llm_cfg=llm, run_date=dt.date(2026, 3, 5))
+
+    assert len(calls) == 1
+    assert first["summary_cache"] == {"hits": 0, "misses": 1}
+    assert second["summary_cache"] == {"hits": 1, "misses": 0}
+    assert json.loads(second["json"].read_text(encoding="utf-8"))["papers"][0]["summary_zh"] == "缓存摘要"
+    # An unchanged rerun must not dirty the committed cache file.
+    assert second["unchanged"] is True
+    assert cache_path.read_bytes() == cache_bytes
+
+    with sqlite3.connect(cache_path) as conn:
+        conn.execute("UPDATE summaries SET last_used = 0")
+    next_day = build_digest(
+        dataclasses.replace(cfg, repeat_policy="off"), llm_cfg=llm, run_date=dt.date(2026, 3, 6)
+    )
+    assert next_day["summary_cache"] == {"hits": 1, "misses": 0} and next_day["unchanged"] is False
+    with sqlite3.connect(cache_path) as conn:
+        assert conn.execute("SELECT last_used FROM summaries").fetchone()[0] > 0
+
+    changed_model = build_digest(cfg, llm_cfg=dataclasses.replace(llm, model="m2"), run_date=dt.date(2026, 3, 5))
+    assert changed_model["summary_cache"] == {"hits": 0, "misses": 1}
+    assert len(calls) == 2
+
+
+def test_summary_cache_evicts_by_size_and_age(tmp_path: Path):
+    from src.digest import SummaryCache
+
+    cache = SummaryCache(tmp_path / "s.sqlite3", max_entries=2, max_age_days=0)
+    for idx in range(3):
+        cache.put(f"k{idx}", f"W{idx}", f"s{idx}")
+    assert cache.evict() == 1
+    assert cache.get("k2") == "s2"
+
+    cache.max_age_days = 1
+    cache._conn.execute("UPDATE summaries SET created_at = 0 WHERE key = 'k2'")
+    assert cache.evict() == 1
+    assert cache.get("k2") is None
+    cache.close()
+
+
+def test_http_cache_revalidates_and_replays(monkeypatch, tmp_path: Path):
+    from urllib.error import URLError
+
+    from src import digest as d
+
+    seen_headers: list[dict] = []
+
+    def fake_get(method, url, body, headers):
+        seen_headers.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return d.HttpResponse(status=304, headers={}, body=b"")
+        return d.HttpResponse(status=200, headers={"etag": '"v1"'}, body=b"payload-v1")
+
+    _patch_http(monkeypatch, fake_get)
+    url = "https://api.openalex.org/works?page=1"
+
+    cache = d.HttpCache(tmp_path / "http", ttl_seconds=3600)
+    assert d._http_get(url, cache=cache) == b"payload-v1"
+    assert d._http_get(url, cache=cache) == b"payload-v1"
+    assert len(seen_headers) == 1
+
+    stale = d.HttpCache(tmp_path / "http", ttl_seconds=0)
+    assert d._http_get(url, cache=stale) == b"payload-v1"
+    assert seen_headers[-1]["If-None-Match"] == '"v1"'
+
+    _patch_http(monkeypatch, lambda *_args: pytest.fail("replay must stay offline"))
+    replay = d.HttpCache(tmp_path / "http", ttl_seconds=0, replay=True)
+    assert d._http_get(url, cache=replay) == b"payload-v1"
+    with pytest.raises(URLError):
+        d._http_get("https://api.openalex.org/works?page=2", cache=replay)
+
+
+def test_http_client_reuses_connection_retries_and_decodes_gzip():
+    import gzip
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from src.digest import HttpClient
+
+    hits: list[tuple[str, int]] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            hits.append((self.path, self.client_address[1]))
+            if len(hits) == 1:
+                body = b"busy"
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+            else:
+                body = gzip.compress(b'{"ok": true}')
+                self.send_response(200)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = HttpClient(backoff_base=0.01, max_retries=2)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/works?x=1"
+        first = client.get(url)
+        second = client.get(url)
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+    assert first.status == 200 and first.attempts == 2
+    assert json.loads(first.body) == {"ok": True}
+    assert json.loads(second.body) == {"ok": True}
+    assert len({port for _path, port in hits}) == 1
+    assert [entry["attempts"] for entry in client.stats] == [2, 1]
+
+
+def test_http_client_follows_redirects_and_uses_proxy_from_env(monkeypatch):
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.error import HTTPError
+
+    from src.digest import HttpClient
+
+    seen: list[tuple[str, str, bytes]] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _handle(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            seen.append((self.command, self.path, body))
+            redirects = {"/old": (301, "/moved"), "/moved": (302, "/new"), "/post": (302, "/new"),
+                         "/keep": (307, "/new"), "/loop": (302, "/loop")}
+            if self.path in redirects:
+                status, location = redirects[self.path]
+                self.send_response(status)
+                self.send_header("Location", location)
+                payload = b""
+            else:
+                self.send_response(200)
+                payload = f"{self.command} {self.path} {body.decode()}".encode()
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = _handle
+
+        def log_message(self, *_args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    for name in ("NO_PROXY", "no_proxy", "HTTP_PROXY", "http_proxy", "HTTPS_PROXY", "https_proxy"):
+        monkeypatch.delenv(name, raising=False)
+    client = HttpClient(backoff_base=0.01, max_retries=0, max_redirects=3)
+    try:
+        assert client.get(f"{base}/old").body == b"GET /new "
+        assert client.request("POST", f"{base}/keep", body=b"x=1").body == b"POST /new x=1"
+        with pytest.raises(HTTPError) as post_redirect:
+            client.request("POST", f"{base}/post", body=b"x=1")
+        assert post_redirect.value.code == 302
+        with pytest.raises(HTTPError):
+            client.get(f"{base}/loop")
+        assert [path for _method, path, _body in seen].count("/loop") == 4
+
+        # Plain HTTP through HTTP_PROXY goes to the proxy with the absolute URL as the target.
+        monkeypatch.setenv("http_proxy", base)
+        assert client.get("http://papers.invalid/new?x=1").body == b"GET http://papers.invalid/new?x=1 "
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_backfill_builds_range_updates_latest_once_and_resumes(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    fetched: list[str] = []
+
+    def fake_openalex(date_from, *_args, **_kwargs):
+        fetched.append(date_from.isoformat())
+        return [
+            Paper(
+                f"Credit risk on {date_from}", [], "V", date_from.isoformat(), "",
+                f"https://openalex.org/W{date_from:%d}", 0, "Bank risk.", "", ["Finance"],
+            )
+        ]
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", fake_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+
+    out = tmp_path / "out"
+    cfg = DigestConfig(output_dir=out)
+    results = d.backfill(cfg, LLMConfig(), dt.date(2026, 3, 7), dt.date(2026, 3, 9), workers=3)
+
+    assert sorted(results) == ["2026-03-07", "2026-03-08", "2026-03-09"]
+    assert [results[day]["latest_updated"] for day in sorted(results)] == [False, False, True]
+    assert all((out / day / "digest.json").exists() for day in results)
+    assert json.loads((out / "latest" / "digest.json").read_text(encoding="utf-8"))["date"] == "2026-03-09"
+    checkpoint = json.loads((out / "backfill_checkpoint.json").read_text(encoding="utf-8"))
+    assert sorted(checkpoint["completed"]) == sorted(results)
+
+    fetched.clear()
+    resumed = d.backfill(cfg, LLMConfig(), dt.date(2026, 3, 7), dt.date(2026, 3, 10), workers=3)
+    assert fetched == ["2026-03-10"]
+    assert list(resumed) == ["2026-03-10"]
+
+
+def test_backfill_checkpoints_successful_days_when_one_day_fails(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    def fake_openalex(date_from, *_args, **_kwargs):
+        return [
+            Paper(
+                f"Credit risk on {date_from}", [], "V", date_from.isoformat(), "",
+                f"https://openalex.org/W{date_from:%d}", 0, "Bank risk.", "", ["Finance"],
+            )
+        ]
+
+    render_markdown = d._render_markdown
+
+    def failing_render(date, *args, **kwargs):
+        if date == "2026-03-08":
+            raise OSError("disk full")
+        return render_markdown(date, *args, **kwargs)
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", fake_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+    monkeypatch.setattr(d, "_render_markdown", failing_render)
+
+    out = tmp_path / "out"
+    cfg = DigestConfig(output_dir=out)
+    with pytest.raises(RuntimeError, match="2026-03-08") as excinfo:
+        d.backfill(cfg, LLMConfig(), dt.date(2026, 3, 7), dt.date(2026, 3, 10), workers=2)
+
+    assert isinstance(excinfo.value.__cause__, OSError)
+    checkpoint = json.loads((out / "backfill_checkpoint.json").read_text(encoding="utf-8"))
+    assert sorted(checkpoint["completed"]) == ["2026-03-07", "2026-03-09", "2026-03-10"]
+
+
+def test_backfill_days_summarize_in_parallel_while_selecting_in_date_order(monkeypatch, tmp_path: Path):
+    import threading
+    import time
+
+    from src import digest as d
+
+    lock = threading.Lock()
+    active: set[str] = set()
+    overlapping_days: set[frozenset[str]] = set()
+
+    def fake_post(method, url, body, headers):
+        day = json.loads(body)["messages"][-1]["content"].split("Credit risk on ")[1][:10]
+        with lock:
+            if active - {day}:
+                overlapping_days.add(frozenset(active | {day}))
+            active.add(day)
+        time.sleep(0.2)
+        with lock:
+            active.discard(day)
+        return {"choices": [{"message": {"content": f"summary {day}"}}]}
+
+    def fake_openalex(date_from, *_args, **_kwargs):
+        return [
+            Paper(
+                f"Credit risk on {date_from} part {i}", [], "V", date_from.isoformat(), "",
+                f"https://openalex.org/W{date_from:%d}{i}", 0, "Bank risk.", "", ["Finance"],
+            )
+            for i in range(2)
+        ]
+
+    _patch_http(monkeypatch, fake_post)
+    monkeypatch.setattr(d, "fetch_openalex_papers", fake_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+
+    out = tmp_path / "out"
+    llm = LLMConfig(api_base="http://llm.local/v1", api_key="k", model="m", concurrency=1)
+    results = d.backfill(DigestConfig(output_dir=out), llm, dt.date(2026, 3, 7), dt.date(2026, 3, 9), workers=3)
+
+    assert overlapping_days, "backfill days summarized one at a time"
+    for day in results:
+        data = json.loads((out / day / "digest.json").read_text(encoding="utf-8"))
+        assert data["count"] == 2 and not data["degraded"]
+        assert data["sources"]["openalex"]["status"] == "ok"
+
+
+def test_backfill_repeats_do_not_depend_on_worker_count(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    def fake_openalex(date_from, *_args, **_kwargs):
+        return [
+            Paper("Persistent credit risk study", [], "V", "2026-03-01", "", "https://openalex.org/WP", 0, "Bank risk.", "", ["Finance"]),
+            Paper(
+                f"Credit risk on {date_from}", [], "V", date_from.isoformat(), "",
+                f"https://openalex.org/W{date_from:%d}", 0, "Bank risk.", "", ["Finance"],
+            ),
+        ]
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", fake_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+
+    def run(workers: int) -> dict[str, tuple[list[str], list[str]]]:
+        out = tmp_path / f"workers-{workers}"
+        d.backfill(DigestConfig(output_dir=out), LLMConfig(), dt.date(2026, 3, 7), dt.date(2026, 3, 9), workers=workers)
+        days = {}
+        for day in ("2026-03-07", "2026-03-08", "2026-03-09"):
+            data = json.loads((out / day / "digest.json").read_text(encoding="utf-8"))
+            days[day] = ([p["openalex_url"] for p in data["papers"]], [r["paper_id"] for r in data["repeats"]])
+        return days
+
+    serial = run(1)
+    assert serial == run(3)
+    assert "https://openalex.org/WP" in serial["2026-03-07"][0]
+    assert all("https://openalex.org/WP" not in serial[day][0] for day in ("2026-03-08", "2026-03-09"))
+    assert all(serial[day][1] for day in ("2026-03-08", "2026-03-09"))
+
+
+def test_keyword_matcher_matches_naive_scores(monkeypatch):
+    import random
+
+    from src import digest as d
+
+    def naive(paper, keywords):
+        text = " ".join([paper.title, paper.abstract, paper.venue, " ".join(paper.topics)]).lower()
+        score = 0
+        for keyword in keywords:
+            if keyword in paper.title.lower():
+                score += 3
+            elif keyword in " ".join(paper.topics).lower():
+                score += 2
+            elif keyword in text:
+                score += 1
+        return score
+
+    rng = random.Random(3)
+    keywords = {"bank", "banking", "ban", "king", "risk", "credit risk", "c++", "(q)", "asset pricing", ""}
+    keywords |= {"".join(rng.choice("abcdeknr ") for _ in range(rng.randint(2, 6))) for _ in range(300)}
+    papers = [
+        Paper(
+            title=" ".join(rng.choice(["Banking", "risk", "C++", "(Q)", "asset", "kinase"]) for _ in range(6)),
+            authors=[],
+            venue=rng.choice(["Bank Review", "Zenodo"]),
+            published_date="",
+            doi_url="",
+            openalex_url="",
+            cited_by_count=0,
+            abstract=" ".join(rng.choice(["credit", "risk", "pricing", "banker", "drank"]) for _ in range(30)),
+            summary_zh="",
+            topics=[rng.choice(["Asset pricing", "Credit risk", "Ranking"])],
+        )
+        for _ in range(40)
+    ]
+
+    for scan_limit in (0, 10_000):
+        monkeypatch.setattr(d.KeywordMatcher, "scan_limit", scan_limit)
+        matcher = d.KeywordMatcher(keywords)
+        assert [d._quality_score(p, matcher) for p in papers] == [naive(p, keywords) for p in papers]
+        assert matcher.matches_any("no hits here") is True
+        assert d.KeywordMatcher({"casino", "free dice"}).matches_any("a free dice link") is True
+        assert d.KeywordMatcher({"casino", "free dice"}).matches_any("bond markets") is False
+
+
+def test_dedupe_drops_near_duplicates_and_shared_identifiers():
+    from src.digest import _dedupe_and_filter
+
+    abstract = (
+        "We study how bank credit supply responds to monetary policy shocks using loan level data "
+        "from European banks and find that weakly capitalised banks cut lending the most."
+    )
+
+    def make(idx, title, doi="", url="", text=abstract, source="openalex"):
+        return Paper(title, [], "V", "2026-03-05", doi, url or f"https://openalex.org/W{idx}", 0, text, "", ["Finance"], source)
+
+    papers = [
+        make(1, "Bank credit supply and monetary policy", doi="https://doi.org/10.1/ABC"),
+        make(2, "Bank Credit Supply and Monetary Policy Shocks (v2)"),
+        make(3, "A different title entirely", doi="https://doi.org/10.1/abc", text="Fiscal risk in markets."),
+        make(4, "Preprint on bond market risk", url="http://arxiv.org/abs/2401.01234v1", text="Bond risk.", source="arxiv"),
+        make(5, "Published bond market risk", doi="https://doi.org/10.48550/arXiv.2401.01234", text="Bond pricing."),
+        make(6, "Household portfolio choice and financial literacy", text="Household finance survey evidence."),
+    ]
+
+    dropped: list[dict] = []
+    kept = _dedupe_and_filter(
+        papers,
+        topic_whitelist={"bank", "credit", "monetary", "bond", "risk", "financial", "household"},
+        topic_blacklist=set(),
+        min_quality_score=2,
+        dropped=dropped,
+    )
+
+    assert [p.openalex_url for p in kept] == [
+        "https://openalex.org/W1",
+        "http://arxiv.org/abs/2401.01234v1",
+        "https://openalex.org/W6",
+    ]
+    reasons = {d["paper_id"]: (d["reason"], d["duplicate_of"]) for d in dropped}
+    assert reasons["https://openalex.org/W2"] == ("near_duplicate", "https://openalex.org/W1")
+    assert reasons["https://openalex.org/W3"] == ("doi", "https://openalex.org/W1")
+    assert reasons["https://openalex.org/W5"] == ("arxiv", "http://arxiv.org/abs/2401.01234v1")
+
+    kept_without_lsh = _dedupe_and_filter(
+        papers[:2], topic_whitelist={"bank"}, topic_blacklist=set(), min_quality_score=1, near_duplicate_threshold=0
+    )
+    assert len(kept_without_lsh) == 2
+
+
+def test_near_duplicate_detection_on_synthetic_corpus():
+    from benchmarks import synthetic
+    from src import digest as d
+
+    papers = [d._openalex_item_to_paper(item) for item in synthetic.openalex_works(2000)]
+    cfg = DigestConfig()
+    kept = d._dedupe_and_filter(papers, cfg.topic_whitelist, cfg.topic_blacklist, cfg.min_quality_score)
+    # Throughput is tracked by the `dedupe_filter` stage of benchmarks/bench_pipeline.py --compare.
+    assert kept and len(kept) < len(papers)
+
+    near = d._minhash(d._shingles("bank credit supply responds to monetary policy shocks in europe"))
+    same = d._minhash(d._shingles("Bank credit supply responds to monetary policy shocks in Europe."))
+    other = d._minhash(d._shingles("household portfolio choice and financial literacy survey evidence"))
+    assert len(near) == d._MINHASH_BINS and near == same
+    assert sum(x == y for x, y in zip(near, other)) / len(near) < 0.2
+
+
+def test_seen_index_excludes_or_marks_papers_from_earlier_days(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    def make(idx, title):
+        return Paper(title, [], "V", "2026-03-05", "", f"https://openalex.org/W{idx}", 0, "Bank risk.", "", ["Finance"])
+
+    batches = {
+        "2026-03-05": [make(1, "Bank risk and credit")],
+        "2026-03-06": [make(1, "Bank risk and credit"), make(2, "Credit markets and bank capital")],
+    }
+    monkeypatch.setattr(d, "fetch_openalex_papers", lambda day, *_a, **_k: [dataclasses.replace(p) for p in batches[day.isoformat()]])
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+
+    out = tmp_path / "out"
+    build_digest(DigestConfig(output_dir=out), llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    rerun = build_digest(DigestConfig(output_dir=out), llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    assert rerun["count"] == 1
+
+    excluded = build_digest(DigestConfig(output_dir=out), llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 6))
+    metadata = json.loads(excluded["json"].read_text(encoding="utf-8"))
+    assert [p["openalex_url"] for p in metadata["papers"]] == ["https://openalex.org/W2"]
+    assert metadata["repeats"][0]["first_seen"] == "2026-03-05"
+
+    marked = build_digest(
+        DigestConfig(output_dir=out, repeat_policy="mark"), llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 6)
+    )
+    assert marked["count"] == 2
+    assert "首次收录：2026-03-05" in marked["markdown"].read_text(encoding="utf-8")
+
+    index = d.SeenPaperIndex(out / "seen_papers.jsonl")
+    assert index.first_seen(make(9, "Credit markets and bank capital")) == "2026-03-06"
+
+
+def test_fetch_arxiv_pages_and_stops_at_older_entries(monkeypatch):
+    from urllib.parse import parse_qs, urlparse
+
+    from src import digest as d
+
+    def feed(dates):
+        entries = "".join(
+            f"<entry><id>http://arxiv.org/abs/2603.{i:05d}v1</id><published>{day}T10:00:00Z</published>"
+            f"<title>Paper {i}</title><summary>Asset pricing.</summary>"
+            f"<author><name>Author {i}</name></author></entry>"
+            for i, day in dates
+        )
+        return f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'.encode("utf-8")
+
+    pages = {
+        0: feed([(1, "2026-03-06"), (2, "2026-03-05"), (3, "2026-03-05")]),
+        3: feed([(4, "2026-03-05"), (5, "2026-03-04"), (6, "2026-03-05")]),
+        6: feed([(7, "2026-03-05")]),
+    }
+    starts: list[int] = []
+
+    def fake_get(method, url, body, headers):
+        start = int(parse_qs(urlparse(url).query)["start"][0])
+        starts.append(start)
+        return pages[start]
+
+    _patch_http(monkeypatch, fake_get)
+    papers = list(d.fetch_arxiv_finance_econ_papers(dt.date(2026, 3, 5), page_size=3, page_delay_seconds=0))
+
+    assert [p.openalex_url for p in papers] == [
+        "http://arxiv.org/abs/2603.00002v1",
+        "http://arxiv.org/abs/2603.00003v1",
+        "http://arxiv.org/abs/2603.00004v1",
+    ]
+    assert papers[0].authors == ["Author 2"]
+    assert starts == [0, 3]
+
+
+def test_build_digest_renders_once_and_publishes_latest_atomically(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    paper = Paper("Bank credit risk", [], "V", "2026-03-05", "", "https://openalex.org/W1", 0, "Risk.", "", ["Finance"])
+    monkeypatch.setattr(d, "fetch_openalex_papers", lambda *_args, **_kwargs: [paper])
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+
+    renders: list[str] = []
+    original = d._render_markdown
+    monkeypatch.setattr(d, "_render_markdown", lambda *args, **kwargs: renders.append("md") or original(*args, **kwargs))
+
+    out = tmp_path / "out"
+    (out / "latest").mkdir(parents=True)
+    (out / "latest" / "digest.md").write_text("old", encoding="utf-8")
+    result = build_digest(DigestConfig(output_dir=out), llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+
+    assert renders == ["md"]
+    for name in ("digest.json", "digest.md", "index.html"):
+        daily, latest = out / "2026-03-05" / name, out / "latest" / name
+        assert daily.read_bytes() == latest.read_bytes()
+    assert result["markdown"].read_text(encoding="utf-8") != "old"
+    assert not [p.name for p in out.rglob("*") if p.name.startswith(".")]
+
+
+def test_archive_updates_incrementally(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    def fake_openalex(day, *_args, **_kwargs):
+        return [
+            Paper(f"Bank risk {day}", [], "V", day.isoformat(), "", f"https://openalex.org/W{day:%m%d}", 0, "Risk.", "", ["Finance"])
+        ]
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", fake_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+
+    out = tmp_path / "out"
+    legacy = out / "2026-02-27"
+    legacy.mkdir(parents=True)
+    (legacy / "digest.json").write_text(
+        json.dumps({"date": "2026-02-27", "count": 0, "source_used": "none", "papers": []}), encoding="utf-8"
+    )
+
+    cfg = DigestConfig(output_dir=out)
+    # The second 03-06 run uses a different config, so it republishes instead of being a no-op rerun.
+    rerun_cfg = dataclasses.replace(cfg, max_papers=5)
+    for day, run_cfg in ((dt.date(2026, 3, 5), cfg), (dt.date(2026, 3, 6), cfg), (dt.date(2026, 3, 6), rerun_cfg)):
+        build_digest(run_cfg, llm_cfg=LLMConfig(), run_date=day)
+
+    archive = d.DigestArchive(out)
+    months = {
+        name: json.loads((out / "archive" / "months" / f"{name}.json").read_text(encoding="utf-8"))["days"]
+        for name in ("2026-02", "2026-03")
+    }
+    assert [p["id"] for p in months["2026-03"]["2026-03-06"]["papers"]] == ["https://openalex.org/W0306"]
+    assert months["2026-02"]["2026-02-27"]["count"] == 0
+    assert not (out / "archive" / "manifest.jsonl").exists()
+    assert d.PaperStore(out / "store").load_day("2026-03-06")["papers"][0]["openalex_url"] == "https://openalex.org/W0306"
+
+    search = json.loads(archive.search_path.read_text(encoding="utf-8"))
+    assert [(m["month"], m["days"], m["papers"]) for m in search["months"]] == [("2026-03", 2, 2), ("2026-02", 1, 0)]
+    march = (out / "archive" / "months" / "2026-03.html").read_text(encoding="utf-8")
+    assert "../../2026-03-06/index.html" in march and "2026-02.html" in march
+    assert "2026-03.html" in (out / "archive" / "months" / "2026-02.html").read_text(encoding="utf-8")
+    assert "months/2026-03.html" in (out / "archive" / "index.html").read_text(encoding="utf-8")
+
+
+def test_search_index_ranks_with_bm25_and_filters(tmp_path: Path):
+    from src.digest import SearchIndex
+
+    def paper(idx, title, summary, source="openalex", abstract=""):
+        return {
+            "title": title, "authors": ["Ada"], "abstract": abstract, "summary_zh": summary,
+            "topics": ["Finance"], "openalex_url": f"https://openalex.org/W{idx}", "doi_url": "", "source": source,
+        }
+
+    index = SearchIndex(tmp_path / "fulltext.sqlite3")
+    index.index_digest(
+        {
+            "date": "2026-01-10",
+            "papers": [
+                paper(1, "Monetary policy transmission to bank lending", "研究货币政策传导机制。", abstract="monetary policy"),
+                paper(2, "Household portfolio choice", "家庭资产配置。"),
+            ],
+        }
+    )
+    index.index_digest({"date": "2026-03-05", "papers": [paper(3, "Monetary shocks and stocks", "股票市场。", "arxiv")]})
+
+    hits = index.search("monetary policy transmission")
+    assert [h["paper_id"] for h in hits] == ["https://openalex.org/W1", "https://openalex.org/W3"]
+    assert [h["paper_id"] for h in index.search("货币政策")] == ["https://openalex.org/W1"]
+    assert [h["date"] for h in index.search("monetary", date_from="2026-02-01")] == ["2026-03-05"]
+    assert [h["source"] for h in index.search("monetary", source="openalex")] == ["openalex"]
+
+    index.index_digest({"date": "2026-01-10", "papers": []})
+    assert [h["paper_id"] for h in index.search("monetary")] == ["https://openalex.org/W3"]
+    index.close()
+
+
+def test_search_index_is_built_by_search_and_then_kept_current(monkeypatch, tmp_path: Path, capsys):
+    from src import digest as d
+
+    def fake_openalex(date_from, *_args, **_kwargs):
+        return [
+            Paper(
+                f"Credit risk on {date_from}", [], "V", date_from.isoformat(), "",
+                f"https://openalex.org/W{date_from:%d}", 0, "Bank risk.", "", ["Finance"],
+            )
+        ]
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", fake_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+    monkeypatch.setenv("DIGEST_OUTPUT_DIR", str(tmp_path / "out"))
+    cfg = DigestConfig(output_dir=tmp_path / "out")
+    index_path = cfg.output_dir / "archive" / "fulltext.sqlite3"
+
+    build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    assert not index_path.exists()
+
+    d.main(["search", "credit"])
+    assert "Indexed 1 digest(s)" in capsys.readouterr().out
+
+    build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 6))
+    index = d.SearchIndex(index_path)
+    try:
+        assert sorted(h["date"] for h in index.search("credit")) == ["2026-03-05", "2026-03-06"]
+    finally:
+        index.close()
+
+
+def test_indexes_rebuild_from_store_without_day_views(monkeypatch, tmp_path: Path, capsys):
+    import shutil
+
+    from src import digest as d
+
+    def fake_openalex(date_from, *_args, **_kwargs):
+        return [
+            Paper(
+                f"Credit risk on {date_from}", [], "V", date_from.isoformat(), "",
+                f"https://openalex.org/W{date_from:%d}", 0, "Bank risk.", "", ["Finance"],
+            )
+        ]
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", fake_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+    monkeypatch.setenv("DIGEST_OUTPUT_DIR", str(tmp_path / "out"))
+    cfg = DigestConfig(output_dir=tmp_path / "out", day_views=False)
+    for day in (5, 6):
+        build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, day))
+    assert not list(cfg.output_dir.glob("*/digest.json"))
+
+    (cfg.output_dir / "seen_papers.jsonl").unlink()
+    seen = d.SeenPaperIndex(cfg.output_dir / "seen_papers.jsonl")
+    assert seen.first_seen(fake_openalex(dt.date(2026, 3, 5))[0]) == "2026-03-05"
+
+    shutil.rmtree(cfg.output_dir / "archive")
+    d.DigestArchive(cfg.output_dir).record(d.PaperStore(cfg.output_dir / "store").load_day("2026-03-06"))
+    months = json.loads((cfg.output_dir / "archive" / "search.json").read_text(encoding="utf-8"))["months"]
+    assert months[0]["days"] == 2 and months[0]["papers"] == 2
+
+    d.main(["search", "credit"])
+    assert "Indexed 2 digest(s)" in capsys.readouterr().out
+
+
+def test_build_digest_writes_stage_metrics_and_prometheus_textfile(monkeypatch, tmp_path: Path):
+    works = [_openalex_work(1), _openalex_work(2), {**_openalex_work(3), "title": "Free dice casino", "concepts": []}]
+    _patch_http(monkeypatch, lambda *_args: {"meta": {"next_cursor": None}, "results": works})
+
+    prom = tmp_path / "textfile" / "digest.prom"
+    cfg = DigestConfig(output_dir=tmp_path / "out", prometheus_textfile=prom)
+    result = build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+
+    metrics = json.loads(result["metrics"].read_text(encoding="utf-8"))
+    assert {"openalex.fetch", "openalex.parse", "filter", "summarize", "render", "write", "index"} <= set(
+        metrics["stages"]
+    )
+    counters = metrics["counters"]
+    assert counters["openalex.requests"] == 1
+    assert counters["openalex.bytes"] > 0
+    assert counters["papers.fetched"] == 3
+    assert counters["papers.selected"] == 2
+    assert counters["papers.irrelevant"] == 1
+    assert 'digest_stage_seconds{stage="render"}' in prom.read_text(encoding="utf-8")
+    assert 'digest_counter{name="papers.selected"} 2' in prom.read_text(encoding="utf-8")
+
+
+def test_build_digest_against_stub_services_with_throttling(monkeypatch, tmp_path: Path):
+    from benchmarks.stub_server import StubConfig, StubServer
+    from src import digest as d
+
+    config = StubConfig(throttle_rate=0.3, retry_after=0, works_per_day=40, seed=3)
+    with StubServer(config) as server:
+        monkeypatch.setattr(d, "OPENALEX_URL", f"{server.base_url}/works")
+        client = d.HttpClient(max_retries=8, backoff_base=0.001)
+        llm = LLMConfig(api_base=f"{server.base_url}/v1", api_key="k", model="stub", concurrency=1)
+        cfg = DigestConfig(output_dir=tmp_path / "out", max_papers=5, openalex_page_size=10)
+        result = build_digest(cfg, llm_cfg=llm, run_date=dt.date(2026, 3, 5), client=client)
+        stats = dict(server.state.stats)
+        client.close()
+
+    payload = json.loads(result["json"].read_text(encoding="utf-8"))
+    papers = payload["papers"]
+    assert result["count"] == 5 and payload["degraded"] == []
+    assert all(p["summary_zh"].startswith("（模拟摘要）") for p in papers)
+    assert stats["llm.200"] == 5
+    assert stats.get("openalex.429", 0) + stats.get("llm.429", 0) > 0
+    metrics = json.loads(result["metrics"].read_text(encoding="utf-8"))
+    assert metrics["counters"]["llm.retries"] > 0 or metrics["counters"].get("openalex.retries", 0) > 0
+
+
+def _source_paper(title: str, source: str) -> Paper:
+    return Paper(
+        title=title,
+        authors=[],
+        venue="arXiv" if source == "arxiv" else "Journal of Finance",
+        published_date="2026-03-05",
+        doi_url="",
+        openalex_url=f"https://example.org/{source}/{title.lower().replace(' ', '-')}",
+        cited_by_count=0,
+        abstract=f"{title} with bank credit risk evidence.",
+        summary_zh="",
+        topics=["Finance"],
+        source=source,
+    )
+
+
+def test_build_digest_merges_sources_concurrently_with_deadlines(monkeypatch, tmp_path: Path):
+    import time
+
+    from src import digest as d
+
+    def slow_openalex(*_args, **_kwargs):
+        time.sleep(0.3)
+        yield _source_paper("Bank credit study one", "openalex")
+        time.sleep(5)
+        yield _source_paper("Bank credit study late", "openalex")
+
+    arxiv = [_source_paper("Asset pricing risk two", "arxiv"), _source_paper("Bank credit study one", "arxiv")]
+    monkeypatch.setattr(d, "fetch_openalex_papers", slow_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: iter(arxiv))
+
+    cfg = DigestConfig(output_dir=tmp_path / "out", source_deadline_seconds=1.0, rank_pool_size=0)
+    result = build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+
+    payload = json.loads(result["json"].read_text(encoding="utf-8"))
+    assert [(p["title"], p["source"]) for p in payload["papers"]] == [
+        ("Bank credit study one", "openalex"),
+        ("Asset pricing risk two", "arxiv"),
+    ]
+    assert payload["duplicates"][0]["reason"] == "title"
+    assert payload["source_used"] == "openalex+arxiv"
+    sources = payload["sources"]
+    assert sources["openalex"]["status"] == "timeout"
+    assert sources["openalex"]["fetched"] == 1 and sources["openalex"]["selected"] == 1
+    assert sources["arxiv"]["status"] == "ok"
+    assert sources["arxiv"]["fetched"] == 2 and sources["arxiv"]["selected"] == 1
+    assert sources["openalex"]["seconds"] >= 0.3
+
+
+def test_build_digest_fallback_mode_uses_first_nonempty_source(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    arxiv = [_source_paper("Asset pricing risk two", "arxiv")]
+    monkeypatch.setattr(d, "fetch_openalex_papers", lambda *_args, **_kwargs: [])
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: arxiv)
+
+    cfg = DigestConfig(output_dir=tmp_path / "out", source_mode="fallback")
+    result = build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+
+    assert result["source_used"] == "arxiv-fallback"
+    assert result["count"] == 1
+    assert result["sources"]["openalex"]["status"] == "empty"
+    assert result["sources"]["arxiv"]["selected"] == 1
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", lambda *_args, **_kwargs: [_source_paper("Bank credit one", "openalex")])
+    result = build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 6))
+    assert result["source_used"] == "openalex"
+    assert result["sources"]["arxiv"]["status"] == "skipped"
+
+
+def test_batched_summaries_validate_items_and_retry_invalid_ones(monkeypatch):
+    from src import digest as d
+
+    requests: list[object] = []
+
+    def fake_post(method, url, body, headers):
+        user = json.loads(json.loads(body)["messages"][1]["content"])
+        requests.append(user)
+        if isinstance(user, dict):
+            return {"choices": [{"message": {"content": f"单独摘要：{user['title']}"}}]}
+        replies = {str(item["index"]): f"批量摘要：{item['title']}" for item in user}
+        if user[0]["title"] == "P0":
+            replies["1"] = "not chinese"
+            del replies["2"]
+        content = "```json\n" + json.dumps(replies, ensure_ascii=False) + "\n```"
+        return {"choices": [{"message": {"content": content}}]}
+
+    _patch_http(monkeypatch, fake_post)
+    papers = [
+        Paper(f"P{i}", [], "V", "2026-03-05", "", f"https://openalex.org/W{i}", 0, "Risk. " * 50, "", ["Finance"])
+        for i in range(7)
+    ]
+    cfg = LLMConfig(api_base="http://llm.local/v1", api_key="k", model="m", batch_size=4, concurrency=1)
+
+    d._apply_summaries(papers, cfg)
+
+    batches = [r for r in requests if isinstance(r, list)]
+    assert [[item["index"] for item in batch] for batch in batches] == [[0, 1, 2, 3], [0, 1, 2]]
+    assert [r["title"] for r in requests if isinstance(r, dict)] == ["P1", "P2"]
+    assert [p.summary_zh for p in papers] == [
+        "批量摘要：P0",
+        "单独摘要：P1",
+        "单独摘要：P2",
+        "批量摘要：P3",
+        "批量摘要：P4",
+        "批量摘要：P5",
+        "批量摘要：P6",
+    ]
+
+
+def test_pack_batches_respects_token_budget():
+    from src import digest as d
+
+    items = [d._batch_item(i, Paper(f"P{i}", [], "V", "", "", "", 0, "x" * 4000, "", [])) for i in range(5)]
+    per_item = d._estimate_tokens(items[0])
+    batches = d._pack_batches(items, max_items=10, max_tokens=per_item * 2 + 200)
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert all(len(item["abstract"]) == 3000 for item in items)
+
+
+def test_openalex_page_is_streamed_and_field_projected(monkeypatch):
+    from urllib.parse import parse_qs, urlparse
+
+    from src import digest as d
+
+    body = (
+        '{"results": [%s, %s], "group_by": [], "meta": {"count": 2, "next_cursor": "c1"}}'
+        % (json.dumps(_openalex_work(1)), json.dumps({**_openalex_work(2), "title": 'Bank "risk" [draft]'}))
+    ).encode("utf-8")
+    papers, header = d._parse_openalex_page(body)
+    assert [p.title for p in papers] == ["Bank credit risk study 1", 'Bank "risk" [draft]']
+    assert header == {"group_by": [], "meta": {"count": 2, "next_cursor": "c1"}}
+    assert d._parse_openalex_page(b' { "meta" : {}, "results" : [ ] } ') == ([], {"meta": {}})
+    assert d._parse_openalex_page(b'{"meta": {}, "results": null}') == ([], {"meta": {}, "results": None})
+    with pytest.raises(ValueError):
+        d._parse_openalex_page(b'{"meta": {}, "results": [{"title": "x"} {"title": "y"}]}')
+
+    selects: list[list[str]] = []
+
+    def fake_get(method, url, body, headers):
+        selects.append(parse_qs(urlparse(url).query)["select"][0].split(","))
+        return {"results": [_openalex_work(3)], "meta": {"next_cursor": None}}
+
+    _patch_http(monkeypatch, fake_get)
+    assert len(list(d.fetch_openalex_papers(dt.date(2026, 3, 5), dt.date(2026, 3, 5)))) == 1
+    assert set(selects[0]) == set(d.OPENALEX_SELECT_FIELDS)
+    assert {"abstract_inverted_index", "authorships", "concepts"} <= set(selects[0])
+
+
+def test_rerun_with_unchanged_inputs_skips_render_and_write(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    paper = Paper("Bank credit risk", [], "V", "2026-03-05", "", "https://openalex.org/W1", 0, "Risk.", "", ["Finance"])
+    monkeypatch.setattr(d, "fetch_openalex_papers", lambda *_args, **_kwargs: [dataclasses.replace(paper)])
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+
+    cfg = DigestConfig(output_dir=tmp_path / "out")
+    first = build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    files = [first["json"], first["markdown"], first["html"], first["metrics"], tmp_path / "out" / "latest" / "digest.json"]
+    before = {path: (path.stat().st_ino, path.stat().st_mtime_ns) for path in files}
+    fingerprint = json.loads(first["json"].read_text(encoding="utf-8"))["fingerprint"]
+
+    monkeypatch.setattr(d, "_render_html", lambda *_args, **_kwargs: pytest.fail("rendered an unchanged digest"))
+    second = build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    assert first["unchanged"] is False and second["unchanged"] is True
+    assert {path: (path.stat().st_ino, path.stat().st_mtime_ns) for path in files} == before
+    monkeypatch.undo()
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", lambda *_args, **_kwargs: [dataclasses.replace(paper)])
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+    changed = build_digest(dataclasses.replace(cfg, min_quality_score=1), llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    assert changed["unchanged"] is False
+    assert json.loads(changed["json"].read_text(encoding="utf-8"))["fingerprint"] != fingerprint
+
+
+def test_paper_store_keeps_latest_generation_and_seeks_by_day_and_paper(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    batches = {
+        "2026-03-05": ["Bank credit one", "Asset pricing two"],
+        "2026-03-06": ["Bank credit one", "Liquidity risk three"],
+    }
+
+    def fake_openalex(day, *_args, **_kwargs):
+        return [
+            Paper(t, [], "V", day.isoformat(), "", f"https://openalex.org/{t.split()[-1]}", 0, "Risk.", "", ["Finance"])
+            for t in batches[day.isoformat()]
+        ]
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", fake_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+    cfg = DigestConfig(output_dir=tmp_path / "out", repeat_policy="off")
+    build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    build_digest(cfg, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 6))
+    result = build_digest(dataclasses.replace(cfg, max_papers=1), llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 6))
+
+    store = d.PaperStore(tmp_path / "out" / "store")
+    assert store.dates() == ["2026-03-05", "2026-03-06"]
+    assert store.index_path.stat().st_size == d._STORE_RECORD.size * (3 + 3 + 2)
+    day = store.load_day("2026-03-06")
+    assert day.pop("note") == ""
+    assert day == json.loads(result["json"].read_text(encoding="utf-8"))
+    assert [p["title"] for p in day["papers"]] == ["Bank credit one"]
+    assert [(hit["run_date"], hit["rank"]) for hit in store.find_paper("https://openalex.org/one")] == [
+        ("2026-03-05", 0),
+        ("2026-03-06", 0),
+    ]
+    assert store.find_paper("https://openalex.org/three") == []
+
+
+def test_paper_store_recovers_from_a_torn_index_record(tmp_path: Path):
+    from src import digest as d
+
+    def day(date, *ids):
+        papers = [{"title": f"Paper {i}", "openalex_url": f"https://openalex.org/{i}"} for i in ids]
+        return {"date": date, "count": len(papers), "latest_updated": True, "papers": papers}
+
+    store = d.PaperStore(tmp_path / "store")
+    store.append_day(day("2026-03-05", "a", "b"))
+    assert store.dates() == ["2026-03-05"]
+    with store.index_path.open("ab") as fh:
+        fh.write(b"\x00" * 7)  # an append interrupted mid-record
+    assert store.dates() == ["2026-03-05"]
+
+    store.append_day(day("2026-03-06", "b"))
+    assert store.index_path.stat().st_size % d._STORE_RECORD.size == 0
+    # The long-lived instance folds in the new records; a fresh one rebuilds the same view.
+    for reader in (store, d.PaperStore(tmp_path / "store")):
+        assert reader.dates() == ["2026-03-05", "2026-03-06"]
+        assert [p["openalex_url"] for p in reader.load_day("2026-03-06")["papers"]] == ["https://openalex.org/b"]
+        assert [hit["run_date"] for hit in reader.find_paper("https://openalex.org/b")] == ["2026-03-05", "2026-03-06"]
+        assert reader.latest_published()["date"] == "2026-03-06"
+
+
+def test_paper_store_migrates_legacy_tree_and_renders_views(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    out = tmp_path / "out"
+    paper = Paper("Bank credit risk", [], "V", "2026-03-05", "", "https://openalex.org/W1", 0, "Risk.", "", ["Finance"])
+    monkeypatch.setattr(d, "fetch_openalex_papers", lambda *_args, **_kwargs: [dataclasses.replace(paper)])
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+    result = build_digest(DigestConfig(output_dir=out), llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    published = {name: (out / "2026-03-05" / name).read_text(encoding="utf-8") for name in ("digest.json", "digest.md", "index.html")}
+
+    # Pretend the tree predates the store, then import it once.
+    (out / "store" / "papers.jsonl").unlink()
+    (out / "store" / "papers.idx").unlink()
+    legacy = out / "2026-03-04"
+    legacy.mkdir()
+    (legacy / "digest.json").write_text(json.dumps({"date": "2026-03-04", "count": 0, "papers": []}), encoding="utf-8")
+    monkeypatch.setenv("DIGEST_OUTPUT_DIR", str(out))
+    d.main(["migrate-store"])
+    d.main(["migrate-store"])
+    store = d.PaperStore(out / "store")
+    assert store.dates() == ["2026-03-04", "2026-03-05"]
+    assert store.load_day("2026-03-05")["papers"] == json.loads(published["digest.json"])["papers"]
+
+    for path in (out / "2026-03-05").iterdir():
+        if path.name != "metrics.json":
+            path.unlink()
+    d.main(["views", "2026-03-05"])
+    assert {name: (out / "2026-03-05" / name).read_text(encoding="utf-8") for name in published} == published
+    assert result["unchanged"] is False
+
+    views_off = DigestConfig(output_dir=tmp_path / "compact", day_views=False)
+    compact = build_digest(views_off, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    assert not compact["json"].exists() and not (tmp_path / "compact" / "latest").exists()
+    assert d.PaperStore(tmp_path / "compact" / "store").load_day("2026-03-05")["count"] == 1
+    assert build_digest(views_off, llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))["unchanged"] is True
+
+
+def test_build_digest_ranks_pool_by_relevance_instead_of_fetch_order(monkeypatch, tmp_path: Path):
+    from src import digest as d
+
+    def paper(idx: int, title: str, abstract: str, venue: str = "V") -> Paper:
+        return Paper(title, [], venue, "2026-03-05", "", f"https://openalex.org/W{idx}", 0, abstract, "", ["Finance"])
+
+    candidates = [
+        paper(1, "A survey of seminar logistics", "We describe seminar scheduling at a finance department."),
+        paper(2, "Household survey weighting", "Sampling weights for a finance survey of households."),
+        paper(
+            3,
+            "Bank credit risk and monetary policy transmission",
+            "Monetary policy shocks change bank credit supply, loan pricing and credit risk in the banking sector.",
+            venue="Journal of Finance",
+        ),
+        paper(4, "Stock market volatility and asset pricing", "Volatility risk is priced in the stock market cross section."),
+    ]
+    monkeypatch.setattr(d, "fetch_openalex_papers", lambda *_args, **_kwargs: [dataclasses.replace(p) for p in candidates])
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+
+    out = tmp_path / "out"
+    build_digest(DigestConfig(output_dir=out, max_papers=2), llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    saved = json.loads((out / "2026-03-05" / "digest.json").read_text(encoding="utf-8"))["papers"]
+    metrics = json.loads((out / "2026-03-05" / "metrics.json").read_text(encoding="utf-8"))
+
+    assert [p["openalex_url"] for p in saved] == ["https://openalex.org/W3", "https://openalex.org/W4"]
+    assert saved[0]["relevance"] > saved[1]["relevance"] > 0
+    assert metrics["counters"]["papers.ranked_out"] == 2
+    assert "rank" in metrics["stages"]
+
+    unranked = tmp_path / "unranked"
+    build_digest(DigestConfig(output_dir=unranked, max_papers=2, rank_pool_size=0), llm_cfg=LLMConfig(), run_date=dt.date(2026, 3, 5))
+    saved = json.loads((unranked / "2026-03-05" / "digest.json").read_text(encoding="utf-8"))["papers"]
+    assert [p["openalex_url"] for p in saved] == ["https://openalex.org/W1", "https://openalex.org/W2"]
+
+
+def test_rank_pool_fed_incrementally_matches_one_shot_ranking():
+    from benchmarks import synthetic
+    from src import digest as d
+
+    cfg = DigestConfig()
+    ranker = d.RelevanceRanker(cfg.topic_whitelist | d.FINANCE_KEYWORDS, cfg.topic_whitelist)
+    papers = [d._openalex_item_to_paper(item) for item in synthetic.openalex_works(300)]
+
+    pool = ranker.pool()
+    assert list(map(pool.add, papers)) == papers and len(pool) == len(papers)
+    incremental = [p.openalex_url for p in pool.top_k(cfg.max_papers)]
+    one_shot = [p.openalex_url for p in ranker.top_k(papers, cfg.max_papers)]
+
+    assert incremental == one_shot and len(one_shot) == cfg.max_papers
+    assert max(ranker.scores(papers)) > 0
+    assert ranker.pool().top_k(cfg.max_papers) == []
+
+
+def test_digest_service_rebuilds_on_trigger_and_serves_with_etag_and_gzip(monkeypatch, tmp_path: Path):
+    import gzip
+    import http.client
+    import threading
+    import time
+
+    from src import digest as d
+
+    clients = []
+    titles = iter(["Bank credit risk", "Bank liquidity risk"])
+
+    def fake_openalex(*_args, client=None, **_kwargs):
+        clients.append(client)
+        return [Paper(next(titles), [], "V", "2026-03-05", "", "https://openalex.org/W1", 0, "Risk.", "", ["Finance"])]
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", fake_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+    cfg = DigestConfig(output_dir=tmp_path / "out", repeat_policy="off")
+    service = d.DigestService(cfg, LLMConfig(), interval_seconds=0)
+    server = d.DigestServer(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    service.start(build_now=False)
+
+    def wait_for_runs(runs: int) -> None:
+        deadline = time.monotonic() + 10
+        while service.snapshot()["runs"] < runs or service.snapshot()["running"]:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    def request(method: str, path: str, headers: dict[str, str] | None = None) -> tuple[int, dict[str, str], bytes]:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        try:
+            conn.request(method, path, headers=headers or {})
+            response = conn.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            conn.close()
+
+    try:
+        assert request("GET", "/latest/digest.json")[0] == 404
+        assert request("POST", "/rebuild?date=2026-03-05")[0] == 202
+        wait_for_runs(1)
+
+        status, headers, body = request("GET", "/latest/digest.json", {"Accept-Encoding": "gzip"})
+        assert status == 200 and headers["Content-Encoding"] == "gzip" and headers["Cache-Control"] == "no-cache"
+        assert json.loads(gzip.decompress(body))["papers"][0]["title"] == "Bank credit risk"
+        status, plain_headers, body = request("GET", "/2026-03-05/digest.json")
+        assert "Content-Encoding" not in plain_headers and plain_headers["ETag"] != headers["ETag"]
+        assert body == (cfg.output_dir / "2026-03-05" / "digest.json").read_bytes()
+        assert request("GET", "/2026-03-05/", {"If-None-Match": plain_headers["ETag"]})[0] == 200
+        assert request("GET", "/2026-03-05/digest.json", {"If-None-Match": plain_headers["ETag"]})[0] == 304
+        assert request("GET", "/2026-03-05/digest.json", {"If-None-Match": headers["ETag"]})[0] == 200
+        assert request("GET", "/latest/digest.json", {"If-None-Match": headers["ETag"], "Accept-Encoding": "gzip"})[0] == 304
+        assert json.loads(request("GET", "/digests")[2]) == {"dates": ["2026-03-05"], "latest": "2026-03-05"}
+        assert request("POST", "/rebuild?date=yesterday")[0] == 400
+
+        assert request("POST", "/rebuild?date=2026-03-05")[0] == 202
+        wait_for_runs(2)
+        status, _headers, body = request("GET", "/2026-03-05/digest.json", {"If-None-Match": plain_headers["ETag"]})
+        assert status == 200 and json.loads(body)["papers"][0]["title"] == "Bank liquidity risk"
+        assert service.snapshot()["last_result"]["date"] == "2026-03-05"
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+    assert len(clients) == 2 and clients[0] is clients[1] is service.client
+
+
+def test_run_deadline_cancels_slow_fetch_and_degrades_summaries(monkeypatch, tmp_path: Path):
+    import threading
+    import time
+    from urllib.error import HTTPError, URLError
+
+    from benchmarks.stub_server import StubConfig, StubServer
+    from src import digest as d
+
+    release = threading.Event()
+
+    def stalled_openalex(*_args, **_kwargs):
+        yield _source_paper("Bank credit study one", "openalex")
+        yield _source_paper("Asset pricing risk two", "openalex")
+        release.wait(10)  # an upstream that stops answering mid-run
+        yield _source_paper("Bank credit study late", "openalex")
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", stalled_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+    monkeypatch.setattr(d, "_LLM_DEADLINE_MARGIN_SECONDS", 0.5)
+    with StubServer(StubConfig(llm_latency="5000")) as server:
+        client = d.HttpClient()
+        with pytest.raises(URLError) as excinfo:
+            client.bounded(time.monotonic() + 0.3).request("POST", f"{server.base_url}/v1/chat/completions", body=b"{}")
+        # The attempt timed out at the deadline instead of waiting out the 5 s response.
+        assert not isinstance(excinfo.value, HTTPError) and isinstance(excinfo.value.reason, TimeoutError)
+
+        llm = LLMConfig(api_base=f"{server.base_url}/v1", api_key="k", model="stub", concurrency=2)
+        cfg = DigestConfig(output_dir=tmp_path / "out", deadline_seconds=3.0, rank_pool_size=0)
+        result = build_digest(cfg, llm_cfg=llm, run_date=dt.date(2026, 3, 5), client=client)
+        release.set()
+        client.close()
+
+    payload = json.loads(result["json"].read_text(encoding="utf-8"))
+    assert payload["sources"]["openalex"]["status"] == "timeout"
+    assert [p["title"] for p in payload["papers"]] == ["Bank credit study one", "Asset pricing risk two"]
+    assert all(p["summary_zh"] == _simple_zh_summary(p["title"], p["abstract"], p["topics"]) for p in payload["papers"])
+    assert [(entry["title"], entry["reason"]) for entry in payload["degraded"]] == [
+        ("Bank credit study one", "deadline"),
+        ("Asset pricing risk two", "deadline"),
+    ]
+    metrics = json.loads(result["metrics"].read_text(encoding="utf-8"))
+    assert metrics["counters"]["summaries.degraded.deadline"] == 2
+
+
+def test_summaries_overlap_fetching_and_sources_stop_at_max_papers(monkeypatch, tmp_path: Path):
+    import itertools
+    import threading
+    import time
+
+    from src import digest as d
+
+    events: list[str] = []
+    lock = threading.Lock()
+
+    def endless_openalex(*_args, **_kwargs):
+        for i in itertools.count():
+            time.sleep(0.05)
+            with lock:
+                events.append(f"fetch {i}")
+            yield _source_paper(f"Bank credit study {i}", "openalex")
+
+    def fake_post(method, url, body, headers):
+        title = json.loads(json.loads(body)["messages"][1]["content"])["title"]
+        with lock:
+            events.append(f"summarize {title}")
+        return {"choices": [{"message": {"content": f"中文摘要：{title}"}}]}
+
+    monkeypatch.setattr(d, "fetch_openalex_papers", endless_openalex)
+    monkeypatch.setattr(d, "fetch_arxiv_finance_econ_papers", lambda *_args, **_kwargs: [])
+    _patch_http(monkeypatch, fake_post)
+    llm = LLMConfig(api_base="http://llm.local/v1", api_key="k", model="m", concurrency=1, cache_max_entries=0)
+    cfg = DigestConfig(output_dir=tmp_path / "out", max_papers=4, rank_pool_size=0)
+    result = build_digest(cfg, llm_cfg=llm, run_date=dt.date(2026, 3, 5))
+
+    payload = json.loads(result["json"].read_text(encoding="utf-8"))
+    assert [p["summary_zh"] for p in payload["papers"]] == [f"中文摘要：Bank credit study {i}" for i in range(4)]
+    # The first summary is requested while the source is still fetching, not after it finished.
+    assert events.index("summarize Bank credit study 0") < events.index("fetch 3")
+    time.sleep(0.2)
+    assert payload["sources"]["openalex"]["status"] == "stopped"
+    assert sum(e.startswith("fetch") for e in events) < 10
+    stages = json.loads(result["metrics"].read_text(encoding="utf-8"))["stages"]
+    assert "filter+summarize" in stages and "summarize" not in stages